@@ -1,12 +1,12 @@
 # -*- coding: utf-8 -*-
 # cli/loaders.py
 
-import yaml
 from pathlib import Path
 from typing import Dict, Any, Iterator, Tuple, Optional
 
 from Prism.entities import CompilationSources,CompilationTask
 from Prism.exceptions import PrismError
+from Prism.stores import FileSystemAssetStore
 
 from config import Config
 
@@ -16,6 +16,13 @@ class LoaderError(PrismError):
 class ProjectLoader:
     def __init__(self, config: Config):
         self._config = config
+        # 文件的发现与解析 (YAML 或 JSON) 交给 Prism 的文件系统存储
+        self._store = FileSystemAssetStore({
+            'templates': config.templates_path,
+            'dataschemas': config.dataschemas_path,
+            'blocks': config.blocks_path,
+            'recipes': config.recipes_path,
+        })
         self._templates_cache: Optional[Dict[str, str]] = None
         self._dataschemas_cache: Optional[Dict[str, Dict[str, Any]]] = None
         self._blocks_cache: Optional[Dict[str, Dict[str, Any]]] = None
@@ -34,12 +41,15 @@ class ProjectLoader:
 
     def load_recipe(self, recipe_name: str) -> CompilationTask:
         print(f"🚀 Loading recipe: '{recipe_name}'...")
-        recipe_filename = f"{recipe_name}.recipe.yaml"
-        recipe_file_path = self._config.recipes_path / recipe_filename
-        if not recipe_file_path.is_file():
-            raise LoaderError(f"Recipe file not found: {recipe_file_path}")
+        existing = self._store.paths('recipes', recipe_name)
+        if not existing:
+            raise LoaderError(f"Recipe file not found: {self._config.recipes_path / f'{recipe_name}.recipe.yaml'}")
+        if len(existing) > 1:
+            raise LoaderError(f"Recipe '{recipe_name}' is defined in more than one file: {', '.join(p.name for p in existing)}")
+        recipe_file_path = existing[0]
+        recipe_filename = recipe_file_path.name
         try:
-            recipe_data = yaml.safe_load(recipe_file_path.read_text(encoding='utf-8'))
+            recipe_data = self._store.read_file('recipes', recipe_file_path)
             if not isinstance(recipe_data, dict):
                  raise LoaderError(f"Recipe file '{recipe_filename}' is empty or invalid.")
         except Exception as e:
@@ -52,47 +62,34 @@ class ProjectLoader:
 
     def _get_templates(self) -> Dict[str, str]:
         if self._templates_cache is None:
-            self._templates_cache = self._load_from_disk(
-                self._config.templates_path, "*.jinja", "templates", self._read_text_file
-            )
+            self._templates_cache = self._load_from_disk(self._config.templates_path, "templates")
         return self._templates_cache
 
     def _get_dataschemas(self) -> Dict[str, Dict[str, Any]]:
         if self._dataschemas_cache is None:
-            self._dataschemas_cache = self._load_from_disk(
-                self._config.dataschemas_path, "*.dataschema.y*ml", "dataschemas", self._read_yaml_file
-            )
+            self._dataschemas_cache = self._load_from_disk(self._config.dataschemas_path, "dataschemas")
         return self._dataschemas_cache
 
     def _get_blocks(self) -> Dict[str, Dict[str, Any]]:
         if self._blocks_cache is None:
-            self._blocks_cache = self._load_from_disk(
-                self._config.blocks_path, "*.block.y*ml", "blocks", self._read_yaml_file
-            )
+            self._blocks_cache = self._load_from_disk(self._config.blocks_path, "blocks")
         return self._blocks_cache
 
-    def _load_from_disk(self, dir_path: Path, glob_pattern: str, resource_name: str, reader_func) -> Dict:
+    def _load_from_disk(self, dir_path: Path, resource_name: str) -> Dict:
         print(f"  - Loading {resource_name} from disk: {dir_path}")
         if not dir_path.is_dir():
             print(f"    - Directory '{dir_path}' not found, skipping.")
             return {}
 
         loaded_data = {}
-        for file_path in dir_path.glob(glob_pattern):
-            resource_id = file_path.name.split('.')[0]
+        for file_path in self._store.files(resource_name):
+            resource_id = self._store.asset_id(file_path)
             try:
-                content = reader_func(file_path)
-                if content:
-                    loaded_data[resource_id] = content
+                content = self._store.read_file(resource_name, file_path)
             except Exception as e:
                 raise LoaderError(f"Failed to process {resource_name} file '{file_path}': {e}") from e
+            if content:
+                if resource_id in loaded_data:
+                    raise LoaderError(f"Duplicate {resource_name} ID '{resource_id}' in file '{file_path}'")
+                loaded_data[resource_id] = content
         return loaded_data
-
-    @staticmethod
-    def _read_yaml_file(path: Path) -> Optional[Dict[str, Any]]:
-        return yaml.safe_load(path.read_text(encoding='utf-8'))
-
-    @staticmethod
-    def _read_text_file(path: Path) -> str:
-        return path.read_text(encoding='utf-8')
-
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+# benchmarks/_synthetic.py
+"""Builds synthetic Prism projects of arbitrary size for the benchmark scripts."""
+
+from pathlib import Path
+from typing import Any, Dict, List, Sequence
+
+import yaml
+
+from Prism.entities import CompilationSources, CompilationTask
+
+def make_sources(n_blocks: int, with_contracts: bool = False) -> CompilationSources:
+    """Create `n_blocks` blocks, each with two variants, one template per variant and one dataschema per block."""
+    templates: Dict[str, str] = {}
+    dataschemas: Dict[str, Dict[str, Any]] = {}
+    blocks: Dict[str, Dict[str, Any]] = {}
+
+    for i in range(n_blocks):
+        block_id = f"block-{i}"
+        schema_id = f"schema-{i}"
+        variants: List[Dict[str, Any]] = []
+        for v in ("short", "long"):
+            template_id = f"tpl-{i}-{v}"
+            templates[template_id] = (
+                f"You are helper #{i} speaking in a {{{{ tone }}}} tone.\n"
+                f"{{% for n in range(3) %}}Step {{{{ n }}}} of the {v} variant.\n{{% endfor %}}"
+                f"Input: {{{{ input_{i} }}}}\n"
+            )
+            variant: Dict[str, Any] = {"id": v, "template_id": template_id, "defaults": {"tone": v}}
+            if with_contracts:
+                variant["contract_id"] = schema_id
+            else:
+                variant["defaults"][f"input_{i}"] = "static input"
+            variants.append(variant)
+
+        dataschemas[schema_id] = {
+            "meta": {"id": schema_id, "name": f"Schema {i}"},
+            "data": {
+                "type": "object",
+                "properties": {f"input_{i}": {"type": "string"}},
+                "required": [f"input_{i}"],
+            },
+        }
+        blocks[block_id] = {
+            "meta": {"id": block_id, "name": f"Block {i}"},
+            "block_type": "Task",
+            "defaults": {"tone": "neutral"},
+            "variants": variants,
+        }
+
+    return CompilationSources(templates=templates, dataschemas=dataschemas, blocks=blocks)
+
+def make_task(index: int, n_blocks: int, blocks_per_recipe: int = 4) -> CompilationTask:
+    """Create a recipe that imports `blocks_per_recipe` consecutive blocks as tasks."""
+    tasks = [
+        {"block_id": f"block-{(index + k) % n_blocks}", "variant_id": "short" if k % 2 else "long"}
+        for k in range(blocks_per_recipe)
+    ]
+    recipe_id = f"recipe-{index}"
+    return CompilationTask(
+        recipe_name=recipe_id,
+        sources={
+            "meta": {"id": recipe_id, "name": f"Recipe {index}"},
+            "imports": {"tasks": tasks},
+            "composition": {"sequence": [{"literal": "### TASKS\n"}, {"block_ref": "tasks"}]},
+        },
+    )
+
+def write_project(root: Path, sources: CompilationSources, tasks: Sequence[CompilationTask]) -> Path:
+    """Write sources and recipes to disk using the standard project layout."""
+    for subdir in ("blocks", "dataschemas", "recipes", "templates"):
+        (root / subdir).mkdir(parents=True, exist_ok=True)
+    for template_id, content in sources.templates.items():
+        (root / "templates" / f"{template_id}.jinja").write_text(content, encoding="utf-8")
+    for schema_id, data in sources.dataschemas.items():
+        (root / "dataschemas" / f"{schema_id}.dataschema.yaml").write_text(yaml.safe_dump(data), encoding="utf-8")
+    for block_id, data in sources.blocks.items():
+        (root / "blocks" / f"{block_id}.block.yaml").write_text(yaml.safe_dump(data), encoding="utf-8")
+    for task in tasks:
+        (root / "recipes" / f"{task.recipe_name}.recipe.yaml").write_text(yaml.safe_dump(task.sources), encoding="utf-8")
+    return root
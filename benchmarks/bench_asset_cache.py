@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+# benchmarks/bench_asset_cache.py
+"""
+ProjectLoader load time for a whole project: no cache (pure-Python and LibYAML
+parsers), a cold parsed-asset cache and a warm one, where no file is parsed.
+
+Run from the repository root:
+    PYTHONPATH=src python benchmarks/bench_asset_cache.py
+"""
+
+import contextlib
+import io
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import yaml
+
+from Prism.stores import filesystem as filesystem_store
+from CLI.actions.asset_cache import ParsedAssetCache
+from CLI.actions.loader import ProjectLoader
+
+from _synthetic import make_sources, make_task, write_project
+
+BLOCKS = 1000
+RECIPES = 200
+
+def _load(root: Path, cache_file: Path = None) -> float:
+    asset_cache = ParsedAssetCache(cache_file) if cache_file is not None else None
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        loader = ProjectLoader(root, asset_cache=asset_cache)
+        loader.load_compilation_sources()
+        loader.load_recipes(loader.list_recipes())
+    return time.perf_counter() - start
+
+def main() -> None:
+    sources = make_sources(BLOCKS, with_contracts=True)
+    tasks = [make_task(i, BLOCKS) for i in range(RECIPES)]
+    with tempfile.TemporaryDirectory() as tmp:
+        root = write_project(Path(tmp) / "project", sources, tasks)
+        # 模拟已存在一段时间的文件, 避免刚写入的文件落在 racy 窗口内
+        past = time.time_ns() - 60 * 10**9
+        for path in root.rglob("*"):
+            if path.is_file():
+                os.utime(path, ns=(past, past))
+        cache_file = Path(tmp) / "parsed_assets.json"
+
+        print(
+            f"{len(sources.blocks)} blocks, {len(sources.templates)} templates, "
+            f"{len(sources.dataschemas)} dataschemas, {RECIPES} recipes"
+        )
+        default_loader = filesystem_store._YAML_LOADER
+        filesystem_store._YAML_LOADER = yaml.SafeLoader
+        print(f"{'no cache, SafeLoader':>24}: {_load(root) * 1000:8.1f} ms")
+        filesystem_store._YAML_LOADER = default_loader
+        print(f"{'no cache, ' + default_loader.__name__:>24}: {_load(root) * 1000:8.1f} ms")
+        print(f"{'cold cache':>24}: {_load(root, cache_file) * 1000:8.1f} ms")
+        print(f"{'warm cache':>24}: {_load(root, cache_file) * 1000:8.1f} ms")
+
+if __name__ == "__main__":
+    main()
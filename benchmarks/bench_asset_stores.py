@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+# benchmarks/bench_asset_stores.py
+"""
+Point lookups and affected-recipe queries against the asset stores of a large
+project. The filesystem store has no index and must read every block and
+recipe to build the dependency graph; the SQLite store answers from its
+B-tree indexes.
+
+Run from the repository root:
+    PYTHONPATH=src python benchmarks/bench_asset_stores.py
+"""
+
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+from Prism.stores import FileSystemAssetStore, SQLiteAssetStore, ZipAssetStore
+
+from _synthetic import make_sources, make_task, write_project
+
+BLOCKS = 3000
+RECIPES = 1000
+LOOKUPS = 200
+
+def _time(func: Callable[[], object], repeat: int = 1) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+def main() -> None:
+    sources = make_sources(BLOCKS, with_contracts=True)
+    tasks = [make_task(i, BLOCKS) for i in range(RECIPES)]
+    with tempfile.TemporaryDirectory() as tmp:
+        root = write_project(Path(tmp) / "project", sources, tasks)
+        fs = FileSystemAssetStore.for_project(root)
+        start = time.perf_counter()
+        db = SQLiteAssetStore.from_store(Path(tmp) / "assets.db", fs)
+        import_time = time.perf_counter() - start
+        ZipAssetStore.write(Path(tmp) / "assets.zip", fs)
+        archive = ZipAssetStore(Path(tmp) / "assets.zip")
+
+        print(
+            f"{len(sources.blocks)} blocks, {len(sources.templates)} templates, "
+            f"{len(sources.dataschemas)} dataschemas, {RECIPES} recipes "
+            f"(SQLite import {import_time:.1f} s)"
+        )
+        changed = [('template', "tpl-17-short")]
+        expected = db.affected_recipes(changed)
+        print(f"{'store':>10} {'get block µs':>13} {'affected ms':>12}")
+        for name, store in (("filesystem", fs), ("zip", archive), ("sqlite", db)):
+            lookup = _time(lambda: [store.get('blocks', f"block-{i * 7 % BLOCKS}") for i in range(LOOKUPS)]) / LOOKUPS
+            repeat = 1 if name != "sqlite" else 100
+            affected = _time(lambda: store.affected_recipes(changed), repeat)
+            assert store.affected_recipes(changed) == expected
+            print(f"{name:>10} {lookup * 1e6:>13.1f} {affected * 1000:>12.2f}")
+        archive.close()
+        db.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+# benchmarks/bench_async.py
+"""
+Tail latency of an asyncio service compiling recipes under concurrent load.
+
+"blocking" calls `CompilationSession.compile` straight from the coroutine, as a
+service does today; "async" awaits `CompilationSession.compile_async`. Each wave
+fires CONCURRENCY requests over DISTINCT_RECIPES recipes, so duplicates are
+coalesced by single-flight. Latency is measured from request arrival. A ticker measures how long the event loop stalls.
+
+Run from the repository root:
+    PYTHONPATH=src python benchmarks/bench_async.py
+"""
+
+import asyncio
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from Prism.session import CompilationSession
+
+from _synthetic import make_sources, make_task
+
+BLOCKS = 200
+CONCURRENCY = 32
+DISTINCT_RECIPES = 8
+TICK = 0.005
+
+async def _ticker(stop: asyncio.Event, lags: list) -> None:
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(TICK)
+        lags.append(time.perf_counter() - start - TICK)
+
+async def _run(mode: str) -> None:
+    sources = make_sources(BLOCKS, with_contracts=True)
+    session = CompilationSession(sources, lazy=True, executor=ThreadPoolExecutor(max_workers=4))
+    tasks = [make_task(i % DISTINCT_RECIPES, BLOCKS) for i in range(CONCURRENCY)]
+
+    async def request(task, arrival: float) -> float:
+        if mode == "blocking":
+            session.compile(task)
+        else:
+            await session.compile_async(task)
+        return (time.perf_counter() - arrival) * 1000
+
+    stop, lags = asyncio.Event(), []
+    ticker = asyncio.create_task(_ticker(stop, lags))
+    await asyncio.sleep(TICK * 2)
+    arrival = time.perf_counter()
+    latencies = sorted(await asyncio.gather(*(request(task, arrival) for task in tasks)))
+    stop.set()
+    await ticker
+
+    p50 = statistics.median(latencies)
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(f"{mode:>9} {p50:>10.1f} {p99:>10.1f} {max(lags) * 1000:>16.1f}")
+
+def main() -> None:
+    print(f"{'mode':>9} {'p50 ms':>10} {'p99 ms':>10} {'max loop lag ms':>16}")
+    for mode in ("blocking", "async"):
+        asyncio.run(_run(mode))
+
+if __name__ == "__main__":
+    main()
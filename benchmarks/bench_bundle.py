@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+# benchmarks/bench_bundle.py
+"""
+Boot time to get one recipe ready for compilation: loading the raw project tree
+with `ProjectLoader` vs opening a bundle and reading only that recipe's closure.
+
+Run from the repository root:
+    PYTHONPATH=src python benchmarks/bench_bundle.py
+"""
+
+import contextlib
+import io
+import tempfile
+import time
+from pathlib import Path
+
+from CLI.actions.loader import ProjectLoader
+from Prism.bundle import ProjectBundle, write_bundle
+
+from _synthetic import make_sources, make_task, write_project
+
+PROJECT_SIZES = (250, 1000)
+RECIPES = 100
+
+def main() -> None:
+    print(f"{'blocks':>8} {'project tree ms':>16} {'bundle ms':>10} {'bundle size KiB':>16}")
+    for size in PROJECT_SIZES:
+        sources = make_sources(size, with_contracts=True)
+        tasks = [make_task(i, size) for i in range(RECIPES)]
+        with tempfile.TemporaryDirectory() as tmp:
+            root = write_project(Path(tmp) / "project", sources, tasks)
+            bundle_path = write_bundle(Path(tmp) / "project.prism", sources, tasks)
+
+            with contextlib.redirect_stdout(io.StringIO()):
+                start = time.perf_counter()
+                loader = ProjectLoader(root)
+                loader.load_compilation_sources()
+                loader.load_recipe("recipe-7")
+                tree = time.perf_counter() - start
+
+            start = time.perf_counter()
+            with ProjectBundle.open(bundle_path) as bundle:
+                bundle.sources_for(["recipe-7"])
+                bundle.load_recipe("recipe-7")
+            bundled = time.perf_counter() - start
+
+            print(f"{size:>8} {tree * 1000:>16.1f} {bundled * 1000:>10.2f} {bundle_path.stat().st_size / 1024:>16.0f}")
+
+if __name__ == "__main__":
+    main()
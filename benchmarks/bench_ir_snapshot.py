@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+# benchmarks/bench_ir_snapshot.py
+"""
+Startup cost of obtaining the IR of many recipes: recompiling from YAML sources
+vs loading JSON or binary IR snapshots.
+
+Run from the repository root:
+    PYTHONPATH=src python benchmarks/bench_ir_snapshot.py
+"""
+
+import time
+
+import yaml
+
+from Prism.entities import CompilationSources, CompilationTask
+from Prism.session import CompilationSession
+from Prism.snapshot import dump_ir, dump_ir_binary, load_ir
+
+from _synthetic import make_sources, make_task
+
+BLOCKS = 300
+RECIPES = 300
+
+def main() -> None:
+    sources = make_sources(BLOCKS, with_contracts=True)
+    tasks = [make_task(i, BLOCKS) for i in range(RECIPES)]
+
+    # 模拟部署时的原始项目: 每个资源一份 YAML 文本
+    block_texts = {k: yaml.safe_dump(v) for k, v in sources.blocks.items()}
+    schema_texts = {k: yaml.safe_dump(v) for k, v in sources.dataschemas.items()}
+    recipe_texts = {t.recipe_name: yaml.safe_dump(t.sources) for t in tasks}
+
+    start = time.perf_counter()
+    parsed = CompilationSources(
+        templates=sources.templates,
+        dataschemas={k: yaml.safe_load(v) for k, v in schema_texts.items()},
+        blocks={k: yaml.safe_load(v) for k, v in block_texts.items()},
+    )
+    session = CompilationSession(parsed, lazy=True)
+    irs = [
+        session.compile_ir(CompilationTask(recipe_name=name, sources=yaml.safe_load(text)))
+        for name, text in recipe_texts.items()
+    ]
+    from_sources = time.perf_counter() - start
+
+    json_snapshots = [dump_ir(ir) for ir in irs]
+    binary_snapshots = [dump_ir_binary(ir) for ir in irs]
+
+    start = time.perf_counter()
+    for data in json_snapshots:
+        load_ir(data)
+    from_json = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for data in binary_snapshots:
+        load_ir(data)
+    from_binary = time.perf_counter() - start
+
+    print(f"{RECIPES} recipes over {BLOCKS} blocks")
+    print(f"{'recompile from YAML':>22}: {from_sources * 1000:9.1f} ms")
+    print(f"{'load JSON snapshots':>22}: {from_json * 1000:9.1f} ms  ({from_sources / from_json:.1f}x)")
+    print(f"{'load binary snapshots':>22}: {from_binary * 1000:9.1f} ms  ({from_sources / from_binary:.1f}x)")
+
+if __name__ == "__main__":
+    main()
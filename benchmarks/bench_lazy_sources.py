@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+# benchmarks/bench_lazy_sources.py
+"""
+Compiling one recipe from a project whose template directory also holds many
+large context documents: eager `load_compilation_sources` vs `load_lazy_sources`.
+Reports wall time and peak traced memory.
+
+Run from the repository root:
+    PYTHONPATH=src python benchmarks/bench_lazy_sources.py
+"""
+
+import contextlib
+import io
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from CLI.actions.loader import ProjectLoader
+from Prism.session import CompilationSession
+
+from _synthetic import make_sources, make_task, write_project
+
+BLOCKS = 500
+RECIPES = 50
+CONTEXT_DOCUMENTS = 200
+CONTEXT_DOCUMENT_BYTES = 256 * 1024
+
+def _compile_one(root: Path, lazy_sources: bool) -> None:
+    with contextlib.redirect_stdout(io.StringIO()):
+        loader = ProjectLoader(root)
+        sources = loader.load_lazy_sources() if lazy_sources else loader.load_compilation_sources()
+        task = loader.load_recipe("recipe-3")
+        CompilationSession(sources, lazy=True).compile(task)
+
+def main() -> None:
+    sources = make_sources(BLOCKS, with_contracts=True)
+    tasks = [make_task(i, BLOCKS) for i in range(RECIPES)]
+    with tempfile.TemporaryDirectory() as tmp:
+        root = write_project(Path(tmp) / "project", sources, tasks)
+        document = ("Lorem ipsum dolor sit amet. " * (CONTEXT_DOCUMENT_BYTES // 28)) + "\n"
+        for i in range(CONTEXT_DOCUMENTS):
+            (root / "templates" / f"context-doc-{i}.jinja").write_text(document, encoding="utf-8")
+
+        print(
+            f"{len(sources.blocks)} blocks, {len(sources.templates) + CONTEXT_DOCUMENTS} templates "
+            f"({CONTEXT_DOCUMENTS} x {CONTEXT_DOCUMENT_BYTES // 1024} KiB unused), compiling 1 recipe"
+        )
+        print(f"{'sources':>8} {'time ms':>9} {'peak MiB':>9}")
+        for lazy_sources in (False, True):
+            start = time.perf_counter()
+            _compile_one(root, lazy_sources)
+            elapsed = time.perf_counter() - start
+
+            tracemalloc.start()
+            _compile_one(root, lazy_sources)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"{'lazy' if lazy_sources else 'eager':>8} {elapsed * 1000:>9.1f} {peak / 2**20:>9.1f}")
+
+if __name__ == "__main__":
+    main()
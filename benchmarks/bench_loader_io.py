@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+# benchmarks/bench_loader_io.py
+"""
+ProjectLoader load time over thousands of small files for several `io_workers`
+settings. A fixed per-read delay can be added to approximate a network-mounted
+volume, where each read waits on a round trip rather than on the CPU.
+
+Run from the repository root:
+    PYTHONPATH=src python benchmarks/bench_loader_io.py
+"""
+
+import contextlib
+import io
+import pathlib
+import tempfile
+import time
+from pathlib import Path
+
+from CLI.actions.loader import ProjectLoader
+
+from _synthetic import make_sources, make_task, write_project
+
+BLOCKS = 1000
+RECIPES = 500
+IO_WORKERS = (1, 4, 16, 32)
+# 每次读文件附加的延迟 (秒): 0 为本地磁盘, 0.002 近似网络存储的一次往返
+READ_LATENCIES = (0.0, 0.002)
+ROUNDS = 3
+
+@contextlib.contextmanager
+def _read_latency(seconds: float):
+    original = pathlib.Path.read_text
+
+    def slow_read_text(self, *args, **kwargs):
+        time.sleep(seconds)
+        return original(self, *args, **kwargs)
+
+    if seconds:
+        pathlib.Path.read_text = slow_read_text  # type: ignore[method-assign]
+    try:
+        yield
+    finally:
+        pathlib.Path.read_text = original  # type: ignore[method-assign]
+
+def _load(root: Path, io_workers: int) -> float:
+    best = float('inf')
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            loader = ProjectLoader(root, io_workers=io_workers)
+            loader.load_compilation_sources()
+            loader.load_recipes(loader.list_recipes())
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main() -> None:
+    sources = make_sources(BLOCKS, with_contracts=True)
+    tasks = [make_task(i, BLOCKS) for i in range(RECIPES)]
+    files = len(sources.templates) + len(sources.dataschemas) + len(sources.blocks) + len(tasks)
+    with tempfile.TemporaryDirectory() as tmp:
+        root = write_project(Path(tmp) / "project", sources, tasks)
+        print(f"{files} files, best of {ROUNDS} rounds")
+        print(f"{'read latency':>12} " + " ".join(f"{f'{n} worker(s)':>13}" for n in IO_WORKERS))
+        for latency in READ_LATENCIES:
+            with _read_latency(latency):
+                timings = [_load(root, n) for n in IO_WORKERS]
+            print(f"{latency * 1000:>9.0f} ms " + " ".join(f"{t * 1000:>10.0f} ms" for t in timings))
+
+if __name__ == "__main__":
+    main()
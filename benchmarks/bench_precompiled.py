@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+# benchmarks/bench_precompiled.py
+"""
+Service startup with many prompts: a fresh process builds a PromptRenderer for
+every prompt from its Jinja source (`template_content`, as written to
+'outputs/*.prompt.jinja') vs from the precompiled modules written by
+`write_template_modules`, which are imported as bytecode without any template
+parsing. Each mode runs in new subprocesses; the best of a few runs is shown.
+
+Run from the repository root:
+    PYTHONPATH=src python benchmarks/bench_precompiled.py
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from Prism.precompiled import write_template_modules
+from Prism.session import CompilationSession
+
+from _synthetic import make_sources, make_task
+
+PROMPTS = 2000
+RUNS = 3
+
+# 子进程中执行的启动代码; 导入 Prism 包本身的耗时与两种方式无关, 单独计时
+_LOAD_SOURCE = """
+import json, sys, time
+from pathlib import Path
+start = time.perf_counter()
+from Prism.renderer import PromptRenderer
+imported = time.perf_counter()
+directory = Path(sys.argv[1])
+renderers = {
+    path.name[:-len(".prompt.jinja")]: PromptRenderer(path.read_text(encoding="utf-8"), name=path.name)
+    for path in directory.glob("*.prompt.jinja")
+}
+loaded = time.perf_counter()
+print(json.dumps({"import": imported - start, "load": loaded - imported, "prompts": len(renderers), "sample": renderers["recipe-7"].render({})}))
+"""
+
+_LOAD_PRECOMPILED = """
+import json, sys, time
+start = time.perf_counter()
+from Prism.precompiled import PrecompiledPrompts
+imported = time.perf_counter()
+prompts = PrecompiledPrompts(sys.argv[1])
+renderers = {name: prompts.renderer(name) for name in prompts.names()}
+loaded = time.perf_counter()
+print(json.dumps({"import": imported - start, "load": loaded - imported, "prompts": len(renderers), "sample": renderers["recipe-7"].render({})}))
+"""
+
+def _startup(code: str, directory: Path) -> dict:
+    """Best of RUNS fresh processes, by the time spent loading prompts."""
+    best = None
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        output = subprocess.run(
+            [sys.executable, "-c", code, str(directory)],
+            check=True, capture_output=True, text=True, env=os.environ.copy()
+        ).stdout
+        result = json.loads(output)
+        result["process"] = time.perf_counter() - start
+        if best is None or result["load"] < best["load"]:
+            best = result
+    return best
+
+def main() -> None:
+    sources = make_sources(50)
+    session = CompilationSession(sources)
+    artifacts = {f"recipe-{i}": session.compile(make_task(i, 50)) for i in range(PROMPTS)}
+    chars = sum(len(a.template_content) for a in artifacts.values())
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source_dir = Path(tmp) / "outputs"
+        source_dir.mkdir()
+        for name, prompt_artifacts in artifacts.items():
+            (source_dir / f"{name}.prompt.jinja").write_text(prompt_artifacts.template_content, encoding="utf-8")
+        start = time.perf_counter()
+        write_template_modules(Path(tmp) / "modules", artifacts)
+        build = time.perf_counter() - start
+
+        print(f"{PROMPTS} prompts, {chars / PROMPTS:,.0f} chars on average; precompiling took {build:.2f}s")
+        print(f"{'mode':>12} {'import Prism (s)':>17} {'load prompts (s)':>17} {'process (s)':>12}")
+        source = _startup(_LOAD_SOURCE, source_dir)
+        precompiled = _startup(_LOAD_PRECOMPILED, Path(tmp) / "modules")
+        assert source["prompts"] == precompiled["prompts"] == PROMPTS
+        assert source["sample"] == precompiled["sample"]
+        for label, result in (("source", source), ("precompiled", precompiled)):
+            print(f"{label:>12} {result['import']:>17.3f} {result['load']:>17.3f} {result['process']:>12.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+# benchmarks/bench_render_pipeline.py
+"""
+End-to-end throughput of rendering a JSONL dataset to a JSONL file: the usual
+hand-written loop (load the whole file, `from_string` per record) vs
+RenderPipeline inline and on a process pool, with contract validation.
+Scaling with workers depends on the number of CPUs of the machine.
+
+Run from the repository root:
+    PYTHONPATH=src python benchmarks/bench_render_pipeline.py
+"""
+
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import jinja2
+
+from Prism.pipeline import RenderPipeline, read_records, write_results
+from Prism.session import CompilationSession
+
+from _synthetic import make_sources, make_task
+
+RECORDS = 30000
+
+def _hand_written_loop(template_content: str, input_path: Path, output_path: Path) -> None:
+    records = [json.loads(line) for line in input_path.read_text(encoding="utf-8").splitlines()]
+    with open(output_path, "w", encoding="utf-8") as f:
+        for index, record in enumerate(records):
+            prompt = jinja2.Environment().from_string(template_content).render(record)
+            f.write(json.dumps({"index": index, "prompt": prompt}, ensure_ascii=False) + "\n")
+
+def main() -> None:
+    sources = make_sources(10, with_contracts=True)
+    artifacts = CompilationSession(sources).compile(make_task(3, 10))
+    fields = sorted(artifacts.contracts or {})
+    with tempfile.TemporaryDirectory() as tmp:
+        input_path = Path(tmp) / "records.jsonl"
+        output_path = Path(tmp) / "prompts.jsonl"
+        with open(input_path, "w", encoding="utf-8") as f:
+            for i in range(RECORDS):
+                record = {f"input_{name.split('-')[1]}": f"record {i} for {name}" for name in fields}
+                f.write(json.dumps(record) + "\n")
+
+        print(f"{RECORDS} records, {len(fields)} contracts, {os.cpu_count()} CPU(s)")
+        print(f"{'mode':>28} {'records/s':>11}")
+        start = time.perf_counter()
+        _hand_written_loop(artifacts.template_content, input_path, output_path)
+        print(f"{'hand-written loop':>28} {RECORDS / (time.perf_counter() - start):>11,.0f}")
+        expected = output_path.read_text(encoding="utf-8")
+
+        workers = os.cpu_count() or 1
+        for label, kwargs in (
+            ("pipeline, inline", {"workers": 1}),
+            (f"pipeline, {workers} worker(s)", {"workers": workers}),
+            (f"pipeline, {workers} unordered", {"workers": workers, "ordered": False}),
+        ):
+            pipeline = RenderPipeline(artifacts, name="recipe-3", **kwargs)
+            start = time.perf_counter()
+            write_results(output_path, pipeline.run(read_records(input_path)))
+            elapsed = time.perf_counter() - start
+            assert pipeline.stats.rendered == RECORDS
+            if kwargs.get("ordered", True):
+                assert output_path.read_text(encoding="utf-8") == expected
+            print(f"{label:>28} {RECORDS / elapsed:>11,.0f}")
+
+if __name__ == "__main__":
+    main()
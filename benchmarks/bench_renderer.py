@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+# benchmarks/bench_renderer.py
+"""
+Renders per second for a compiled prompt: a fresh Jinja environment and
+`from_string` per request (what consumers of `template_content` do today) vs
+PromptRenderer without validation, with contract validation on both
+validator backends, and with the generated Pydantic model.
+
+Run from the repository root:
+    PYTHONPATH=src python benchmarks/bench_renderer.py
+"""
+
+import time
+from typing import Callable, List
+
+import jinja2
+
+from Prism.renderer import PromptRenderer
+from Prism.session import CompilationSession
+
+from _synthetic import make_sources, make_task
+
+RECORDS = 20000
+
+def _rate(func: Callable[[], List[str]]) -> float:
+    start = time.perf_counter()
+    outputs = func()
+    elapsed = time.perf_counter() - start
+    assert len(outputs) == RECORDS
+    return RECORDS / elapsed
+
+def main() -> None:
+    sources = make_sources(10, with_contracts=True)
+    artifacts = CompilationSession(sources).compile(make_task(3, 10, blocks_per_recipe=1))
+    (variable,) = PromptRenderer.from_artifacts(artifacts).variables
+    records = [{variable: f"ticket text number {i}"} for i in range(RECORDS)]
+
+    def per_request() -> List[str]:
+        return [jinja2.Environment().from_string(artifacts.template_content).render(r) for r in records]
+
+    expected = per_request()
+    print(f"{RECORDS} records, prompt of {len(artifacts.template_content)} chars")
+    print(f"{'mode':>34} {'renders/s':>11}")
+    print(f"{'from_string per request':>34} {_rate(per_request):>11,.0f}")
+    for label, kwargs in (
+        ("PromptRenderer", {}),
+        ("PromptRenderer + contracts", {"validate": "contracts"}),
+        ("PromptRenderer + contracts (fast)", {"validate": "contracts", "backend": "fastjsonschema"}),
+        ("PromptRenderer + model", {"validate": "model"}),
+    ):
+        renderer = PromptRenderer.from_artifacts(artifacts, name="recipe-3", **kwargs)
+        assert renderer.render_many(records) == expected
+        print(f"{label:>34} {_rate(lambda: renderer.render_many(records)):>11,.0f}")
+
+if __name__ == "__main__":
+    main()
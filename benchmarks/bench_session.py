@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+# benchmarks/bench_session.py
+"""
+Per-recipe compile cost: `compile_recipe_to_artifacts` vs a reused `CompilationSession`,
+eager and lazy.
+
+Run from the repository root:
+    PYTHONPATH=src python benchmarks/bench_session.py
+"""
+
+import contextlib
+import io
+import time
+
+from Prism.core import compile_recipe_to_artifacts
+from Prism.session import CompilationSession
+
+from _synthetic import make_sources, make_task
+
+PROJECT_SIZES = (25, 100)
+RECIPES = 10
+
+def _per_recipe_ms(fn, tasks) -> float:
+    start = time.perf_counter()
+    for task in tasks:
+        fn(task)
+    return (time.perf_counter() - start) * 1000 / len(tasks)
+
+def main() -> None:
+    print(
+        f"{'blocks':>8} {'one-shot ms/recipe':>20} {'session ms/recipe':>19} {'session build ms':>18}"
+        f" {'lazy ms/recipe':>16} {'lazy build ms':>15}"
+    )
+    for size in PROJECT_SIZES:
+        sources = make_sources(size)
+        tasks = [make_task(i, size) for i in range(RECIPES)]
+        with contextlib.redirect_stdout(io.StringIO()):
+            one_shot = _per_recipe_ms(lambda t: compile_recipe_to_artifacts(t, sources), tasks)
+
+            start = time.perf_counter()
+            session = CompilationSession(sources)
+            build = (time.perf_counter() - start) * 1000
+            reused = _per_recipe_ms(session.compile, tasks)
+
+            start = time.perf_counter()
+            lazy_session = CompilationSession(sources, lazy=True)
+            lazy_build = (time.perf_counter() - start) * 1000
+            lazy = _per_recipe_ms(lazy_session.compile, tasks)
+        print(f"{size:>8} {one_shot:>20.2f} {reused:>19.2f} {build:>18.2f} {lazy:>16.2f} {lazy_build:>15.2f}")
+
+if __name__ == "__main__":
+    main()
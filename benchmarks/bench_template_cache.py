@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+# benchmarks/bench_template_cache.py
+"""
+Cost of the Jinja back end (`JinjaAggregator.aggregate`) when many recipes share
+a small set of popular blocks: parsing every block template on every compile
+(cache cleared before each recipe), the in-process template cache, and a fresh
+process that starts with only the on-disk bytecode cache.
+
+Run from the repository root:
+    PYTHONPATH=src python benchmarks/bench_template_cache.py
+"""
+
+import tempfile
+import time
+from pathlib import Path
+
+from Prism.analysis import analyze_template
+from Prism.generators import JinjaAggregator
+from Prism.session import CompilationSession
+
+from _synthetic import make_sources, make_task
+
+BLOCKS = 100
+RECIPES = 1000
+
+def main() -> None:
+    sources = make_sources(BLOCKS, with_contracts=True)
+    session = CompilationSession(sources)
+    irs = [session.compile_ir(make_task(i, BLOCKS)) for i in range(RECIPES)]
+    blocks = sum(len(ir.render_sequence) for ir in irs)
+
+    print(f"{RECIPES} recipes, {blocks} render items over {BLOCKS} blocks ({len(sources.templates)} templates)")
+    with tempfile.TemporaryDirectory() as tmp:
+        bytecode_dir = Path(tmp) / "jinja"
+
+        cache = JinjaAggregator.configure()
+        start = time.perf_counter()
+        for ir in irs:
+            cache.clear()
+            analyze_template.cache_clear()
+            expected = JinjaAggregator.aggregate(ir)
+        uncached = time.perf_counter() - start
+
+        # 先用一个进程填充字节码缓存, 再模拟一个新进程: 内存缓存为空, 磁盘上已有字节码
+        JinjaAggregator.configure(bytecode_cache_dir=bytecode_dir)
+        outputs = [JinjaAggregator.aggregate(ir) for ir in irs]
+        cache = JinjaAggregator.configure(bytecode_cache_dir=bytecode_dir)
+        start = time.perf_counter()
+        for ir in irs:
+            JinjaAggregator.aggregate(ir)
+        bytecode = time.perf_counter() - start
+
+        start = time.perf_counter()
+        warm_outputs = [JinjaAggregator.aggregate(ir) for ir in irs]
+        warm = time.perf_counter() - start
+        assert outputs == warm_outputs and warm_outputs[-1] == expected
+
+    print(f"{'mode':>22} {'total ms':>9} {'per recipe µs':>14}")
+    for name, elapsed in (("parse every compile", uncached), ("bytecode cache (cold)", bytecode), ("template cache (warm)", warm)):
+        print(f"{name:>22} {elapsed * 1000:>9.1f} {elapsed / RECIPES * 1e6:>14.1f}")
+    print(f"warm cache: {uncached / warm:.1f}x faster, {cache.stats.hits} hit(s), {cache.stats.misses} miss(es)")
+
+if __name__ == "__main__":
+    main()
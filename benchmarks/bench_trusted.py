@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+# benchmarks/bench_trusted.py
+"""
+Model-building overhead on the compile hot path: building the resolver and
+compiling recipes to IR with full validation vs trusted construction
+(`model_construct`, no jsonschema or Pydantic validation).
+
+Run from the repository root:
+    PYTHONPATH=src python benchmarks/bench_trusted.py
+"""
+
+import time
+
+from Prism.session import CompilationSession
+
+from _synthetic import make_sources, make_task
+
+BLOCKS = 1000
+RECIPES = 500
+
+def main() -> None:
+    sources = make_sources(BLOCKS, with_contracts=True)
+    tasks = [make_task(i, BLOCKS) for i in range(RECIPES)]
+
+    print(f"{BLOCKS} blocks, {RECIPES} recipes")
+    print(f"{'mode':>10} {'resolver ms':>12} {'compile_ir ms':>14}")
+    timings = {}
+    for trusted in (False, True):
+        start = time.perf_counter()
+        session = CompilationSession(sources, trusted=trusted)
+        built = time.perf_counter() - start
+
+        start = time.perf_counter()
+        irs = [session.compile_ir(task) for task in tasks]
+        compiled = time.perf_counter() - start
+
+        timings[trusted] = (built, compiled, irs)
+        print(f"{'trusted' if trusted else 'validated':>10} {built * 1000:>12.1f} {compiled * 1000:>14.1f}")
+
+    assert [ir.model_dump() for ir in timings[False][2]] == [ir.model_dump() for ir in timings[True][2]]
+    total = {mode: t[0] + t[1] for mode, t in timings.items()}
+    print(f"trusted mode: {total[False] / total[True]:.1f}x faster, identical IR")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+# benchmarks/bench_validation.py
+"""
+Schema validation throughput for block, dataschema and recipe files: the previous
+per-call path (check the meta-schema, build a validator, sort every error) against
+the cached compiled validators with the jsonschema and fastjsonschema backends.
+
+Run from the repository root:
+    PYTHONPATH=src python benchmarks/bench_validation.py
+"""
+
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+import jsonschema
+
+from Prism.schemas import validate_block_file, validate_dataschema_file, validate_recipe_file
+from Prism.schemas.schema_loader import SchemaLoader
+
+from _synthetic import make_sources, make_task
+
+BLOCKS = 1000
+RECIPES = 1000
+ROUNDS = 3
+
+def _legacy_validate(schema: Dict[str, Any], raw_data: Dict[str, Any]) -> None:
+    jsonschema.Draft202012Validator.check_schema(schema)
+    validator = jsonschema.Draft202012Validator(schema)
+    errors = sorted(validator.iter_errors(raw_data), key=lambda e: e.path)
+    assert not errors
+
+def _assets() -> List[Tuple[str, Dict[str, Any]]]:
+    sources = make_sources(BLOCKS, with_contracts=True)
+    assets = [('block', data) for data in sources.blocks.values()]
+    assets += [('dataschema', data) for data in sources.dataschemas.values()]
+    assets += [('recipe', make_task(i, BLOCKS).sources) for i in range(RECIPES)]
+    return assets
+
+def _timed(run: Callable[[], None]) -> float:
+    best = float('inf')
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main() -> None:
+    assets = _assets()
+    schemas = {
+        'block': SchemaLoader.get_block_schema(),
+        'dataschema': SchemaLoader.get_dataschema_schema(),
+        'recipe': SchemaLoader.get_recipe_schema(),
+    }
+    validators = {'block': validate_block_file, 'dataschema': validate_dataschema_file, 'recipe': validate_recipe_file}
+
+    def legacy() -> None:
+        for kind, data in assets:
+            _legacy_validate(schemas[kind], data)
+
+    def cached() -> None:
+        for kind, data in assets:
+            validators[kind](kind, data)
+
+    print(f"{len(assets)} assets, best of {ROUNDS} rounds")
+    baseline = _timed(legacy)
+    print(f"{'per-call (previous)':>24}: {baseline * 1000:8.1f} ms")
+    for backend in ('jsonschema', 'fastjsonschema'):
+        try:
+            SchemaLoader.set_validator_backend(backend)
+        except Exception as e:
+            print(f"{'cached ' + backend:>24}: skipped ({e})")
+            continue
+        elapsed = _timed(cached)
+        print(f"{'cached ' + backend:>24}: {elapsed * 1000:8.1f} ms  ({baseline / elapsed:.1f}x)")
+    SchemaLoader.set_validator_backend('jsonschema')
+
+if __name__ == "__main__":
+    main()
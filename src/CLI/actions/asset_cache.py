@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+# CLI/asset_cache.py
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Set, Tuple
+
+# 缓存文件的格式版本, 结构变化时递增, 旧文件直接丢弃
+# 使用 JSON 而不是 pickle: 缓存文件位于项目目录中, 可能随仓库一起分发, 读取时不能执行任何代码
+_CACHE_FORMAT_VERSION = 1
+CACHE_FILENAME = "parsed_assets.json"
+
+# 文件状态键: (mtime_ns, size, inode)
+StatKey = Tuple[int, int, int]
+
+# 文件在写入缓存前这段时间内被修改过, 则它的 mtime 不足以区分前后两次修改
+# (文件系统时间戳精度有限, 同一时间片内的第二次修改不会改变 mtime), 命中时需要比对内容哈希
+_RACY_WINDOW_NS = 2_000_000_000
+
+@dataclass
+class _Entry:
+    stat: StatKey
+    digest: str
+    recorded_ns: int
+    content: Any
+
+    def is_racy(self) -> bool:
+        return self.stat[0] >= self.recorded_ns - _RACY_WINDOW_NS
+
+    def to_json(self) -> list:
+        return [*self.stat, self.digest, self.recorded_ns, self.content]
+
+    @classmethod
+    def from_json(cls, data: Any) -> "_Entry":
+        mtime_ns, size, inode, digest, recorded_ns, content = data
+        return cls(stat=(int(mtime_ns), int(size), int(inode)), digest=str(digest), recorded_ns=int(recorded_ns), content=content)
+
+def _is_plain_json(value: Any) -> bool:
+    """True if `value` survives a JSON round trip unchanged (YAML can also produce dates, sets, bytes and non-string keys)."""
+    if value is None or isinstance(value, (str, bool, int, float)):
+        return True
+    if isinstance(value, list):
+        return all(_is_plain_json(item) for item in value)
+    if isinstance(value, dict):
+        return all(isinstance(key, str) and _is_plain_json(item) for key, item in value.items())
+    return False
+
+@dataclass
+class AssetCacheStats:
+    hits: int = 0
+    # 文件状态变化但内容未变 (例如 touch 或 git checkout), 复用解析结果
+    rehashed: int = 0
+    misses: int = 0
+
+class ParsedAssetCache:
+    """
+    On-disk cache of parsed asset files, shared across CLI invocations.
+
+    An entry is reused without reading the file when its (mtime, size, inode) is
+    unchanged. When the stat data differs, or is too close to the time the entry
+    was recorded to be trusted, the file is read and its content hash decides
+    whether the previous parse result is still valid. Only real content changes
+    are parsed again. `load` may be called from several threads at once.
+    The cache file is plain JSON; parse results that JSON cannot represent
+    exactly are not persisted and are parsed again on the next run.
+    """
+    def __init__(self, cache_file: Path) -> None:
+        self.cache_file = cache_file
+        self.stats = AssetCacheStats()
+        self._entries: Dict[str, _Entry] = self._read()
+        # 内容无法用 JSON 精确表示的条目只在本进程内有效, 不写入磁盘
+        self._transient: Set[str] = set()
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def load(self, path: Path, parser: Callable[[str], Any]) -> Any:
+        """Return the parsed content of `path`, calling `parser` on its text only if needed."""
+        key = str(path.resolve())
+        stat = os.stat(path)
+        stat_key: StatKey = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+        entry = self._entries.get(key)
+        if entry is not None and entry.stat == stat_key and not entry.is_racy():
+            with self._lock:
+                self.stats.hits += 1
+            return entry.content
+
+        # 读取与解析在锁外进行, 多个文件可以并行处理
+        data = path.read_bytes()
+        digest = hashlib.sha256(data).hexdigest()
+        reused = entry is not None and entry.digest == digest
+        content = entry.content if reused else parser(data.decode('utf-8'))  # type: ignore[union-attr]
+        with self._lock:
+            if reused:
+                self.stats.rehashed += 1
+            else:
+                self.stats.misses += 1
+            self._entries[key] = _Entry(stat=stat_key, digest=digest, recorded_ns=time.time_ns(), content=content)
+            if not reused:
+                if _is_plain_json(content):
+                    self._transient.discard(key)
+                else:
+                    self._transient.add(key)
+            self._dirty = True
+        return content
+
+    def flush(self) -> None:
+        """Write the cache back to disk if anything changed, dropping entries of deleted files."""
+        with self._lock:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self._dirty:
+            return
+        entries = {key: entry for key, entry in self._entries.items() if os.path.exists(key)}
+        payload = {
+            "version": _CACHE_FORMAT_VERSION,
+            "entries": {key: entry.to_json() for key, entry in entries.items() if key not in self._transient}
+        }
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=self.cache_file.parent, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding='utf-8') as f:
+                    json.dump(payload, f, ensure_ascii=False, separators=(",", ":"))
+                os.replace(tmp_name, self.cache_file)
+            except BaseException:
+                Path(tmp_name).unlink(missing_ok=True)
+                raise
+        except OSError:
+            # 缓存只是加速手段, 写入失败不影响本次运行
+            return
+        self._entries = entries
+        self._dirty = False
+
+    def _read(self) -> Dict[str, _Entry]:
+        try:
+            with open(self.cache_file, encoding='utf-8') as f:
+                payload = json.load(f)
+        except (OSError, ValueError):
+            # 不存在, 损坏或被截断的缓存文件视为空缓存
+            return {}
+        if not isinstance(payload, dict) or payload.get("version") != _CACHE_FORMAT_VERSION:
+            return {}
+        entries = payload.get("entries")
+        if not isinstance(entries, dict):
+            return {}
+        try:
+            return {str(key): _Entry.from_json(data) for key, data in entries.items()}
+        except (TypeError, ValueError):
+            return {}
+
+    @classmethod
+    def in_directory(cls, directory: Path) -> "ParsedAssetCache":
+        return cls(directory / CACHE_FILENAME)
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+# CLI/converter.py
+
+import json
+import yaml
+from pathlib import Path
+from typing import Any, List, Tuple
+
+from CLI.exception import ConvertError, LoaderError
+from CLI.actions.loader import ProjectLoader
+
+# 资源类型 -> 文件名中的类型后缀, 例如 'persona.block.json'
+_KIND_SUFFIXES = {'dataschemas': 'dataschema', 'blocks': 'block', 'recipes': 'recipe'}
+
+FORMATS = ('yaml', 'json')
+
+class ProjectConverter:
+    """Rewrites the block, dataschema and recipe files of a project between YAML and JSON."""
+    def __init__(self, loader: ProjectLoader) -> None:
+        self.loader = loader
+
+    def convert(self, target: str) -> List[Tuple[Path, Path]]:
+        """
+        Convert every asset file not already in `target` format and return the
+        (old path, new path) pairs. All files are parsed and checked before the
+        first one is written, so a broken file leaves the project untouched.
+        YAML comments are not preserved.
+        """
+        if target not in FORMATS:
+            raise ConvertError(target, f"Unknown format, expected one of {', '.join(FORMATS)}")
+
+        # 1. 读取并检查全部待转换文件
+        planned: List[Tuple[Path, Path, Any]] = []
+        for kind, suffix in _KIND_SUFFIXES.items():
+            for file_path in self.loader.asset_files(kind):
+                if self._format_of(file_path) == target:
+                    continue
+                try:
+                    content = self.loader.read_asset(kind, file_path)
+                except LoaderError as e:
+                    raise ConvertError(str(file_path), e.message) from e
+                if not content:
+                    continue
+                new_path = file_path.parent / f"{file_path.name.split('.')[0]}.{suffix}.{target}"
+                if new_path.exists():
+                    raise ConvertError(str(file_path), f"Target file '{new_path.name}' already exists")
+                planned.append((file_path, new_path, content))
+
+        # 2. 写出新文件后再删除原文件
+        converted: List[Tuple[Path, Path]] = []
+        for file_path, new_path, content in planned:
+            try:
+                new_path.write_text(self._dump(content, target), encoding='utf-8')
+                file_path.unlink()
+            except OSError as e:
+                raise ConvertError(str(file_path), str(e)) from e
+            converted.append((file_path, new_path))
+        return converted
+
+    @staticmethod
+    def _format_of(file_path: Path) -> str:
+        return 'json' if file_path.suffix == '.json' else 'yaml'
+
+    @staticmethod
+    def _dump(content: Any, target: str) -> str:
+        if target == 'json':
+            return json.dumps(content, ensure_ascii=False, indent=2) + "\n"
+        return yaml.safe_dump(content, allow_unicode=True, sort_keys=False)
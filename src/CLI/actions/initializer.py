@@ -7,6 +7,7 @@ from CLI.exception import ProjectilitializationError
 
 class ProjectInitializer:
     DIRECTORIES_TO_CREATE = ['blocks', 'dataschemas', 'recipes', 'templates','outputs']
+    CACHE_DIRECTORY = '.prism_cache'
 
     def __init__(self, project_path:Path) -> None:
         self.project_path = project_path
@@ -22,9 +23,9 @@ class ProjectInitializer:
             self.project_path.mkdir(parents=True, exist_ok=False)
             for subdir in self.DIRECTORIES_TO_CREATE:
                 (self.project_path / subdir).mkdir()
+            gitignore_content = f"outputs/\n{self.CACHE_DIRECTORY}/\n"
+            (self.project_path / '.gitignore').write_text(gitignore_content)
         except OSError as e:
             raise ProjectilitializationError(str(self.project_path), str(e)) from e
-        # gitignore_content = "outputs/\n.prism_cache/\n"
-        # (self.project_path / '.gitignore').write_text(gitignore_content)
         print(f"✅ Project '{project_name}' initialized successfully")
         return self.project_path
\ No newline at end of file
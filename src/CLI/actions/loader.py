@@ -1,25 +1,56 @@
 # -*- coding: utf-8 -*-
 # CLI/loaders.py
 
-import yaml
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
-from typing import Dict, Any, Optional, Callable, Dict
+from typing import Dict, Any, Iterator, List, Optional, Callable, Dict, Sequence, Tuple, TypeVar
 from dataclasses import dataclass
 
 from CLI.exception import LoaderError
 from CLI.actions.initializer import ProjectInitializer
+from CLI.actions.asset_cache import ParsedAssetCache
 
 from Prism.entities import CompilationSources,CompilationTask
+from Prism.lazy import LazyMapping
+from Prism.stores import FileSystemAssetStore
+
+# 默认的读文件线程数, 与 ThreadPoolExecutor 的默认值一致; 读文件以等待 I/O 为主, 线程数可以多于 CPU 核数
+DEFAULT_IO_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+
+_MAX_BATCH_SIZE = 16
+
+_T = TypeVar('_T')
+_R = TypeVar('_R')
 
 class ProjectLoader:
-    def __init__(self, project_path: Path) -> None:
+    # 资源类型 -> 文件名模式, 类型名称与 SourceChanges 的字段保持一致
+    ASSET_PATTERNS = FileSystemAssetStore.ASSET_PATTERNS
+
+    def __init__(
+        self,
+        project_path: Path,
+        asset_cache: Optional[ParsedAssetCache] = None,
+        io_workers: int = DEFAULT_IO_WORKERS
+    ) -> None:
         self.project_path = project_path
+        # 跨次运行复用的解析结果缓存, 为 None 时每次都重新解析
+        self.asset_cache = asset_cache
+        # 并发读取并解析文件的线程数, 1 表示逐个读取
+        self.io_workers = max(1, io_workers)
 
         self.blocks_path = self.project_path / 'blocks'
         self.dataschemas_path = self.project_path / 'dataschemas'
         self.recipes_path = self.project_path / 'recipes'
         self.templates_path = self.project_path / 'templates'
 
+        # 文件的发现与解析由 Prism 的文件系统存储完成, 这里负责并发读取, 错误报告和缓存
+        self.store = FileSystemAssetStore(
+            self.asset_directories(),
+            reader=asset_cache.load if asset_cache is not None else None
+        )
+
         self._templates_cache: Optional[Dict[str, str]] = None
         self._dataschemas_cache: Optional[Dict[str, Dict[str, Any]]] = None
         self._blocks_cache: Optional[Dict[str, Dict[str, Any]]] = None
@@ -31,83 +62,204 @@ class ProjectLoader:
             dataschemas=self._get_dataschemas(),
             blocks=self._get_blocks()
         )
+        self.flush_cache()
         print("✅ Shared assets loaded successfully.")
         return sources
 
+    def load_lazy_sources(self) -> CompilationSources:
+        """
+        Index the asset files without reading them. Each file is read and parsed the
+        first time its ID is looked up, so memory and startup scale with what a
+        compilation actually resolves. Pair it with a lazy CompilationSession.
+        """
+        mappings: Dict[str, LazyMapping] = {}
+        for kind in ('templates', 'dataschemas', 'blocks'):
+            paths: Dict[str, Path] = {}
+            for file_path in self.asset_files(kind):
+                resource_id = self.store.asset_id(file_path)
+                if resource_id in paths:
+                    raise LoaderError(kind, str(file_path), f"ID '{resource_id}' is already defined by another file")
+                paths[resource_id] = file_path
+            mappings[kind] = LazyMapping({
+                resource_id: partial(self._read_lazy_asset, kind, file_path)
+                for resource_id, file_path in paths.items()
+            })
+        return CompilationSources(**mappings)
+
+    def _read_lazy_asset(self, kind: str, file_path: Path) -> Any:
+        content = self.read_asset(kind, file_path)
+        # 与 load_compilation_sources 不同, 空文件在索引阶段无法排除, 在这里报告
+        if not content:
+            raise LoaderError(kind, str(file_path), "File is empty")
+        return content
+
     def load_recipe(self, recipe_name: str) -> CompilationTask:
         print(f"🚀 Loading recipe: '{recipe_name}'...")
-        recipe_filename = f"{recipe_name}.recipe.yaml"
-        recipe_file_path = self.recipes_path / recipe_filename
+        task = self._read_recipe(recipe_name)
+        self.flush_cache()
+        print(f"✅ Recipe '{recipe_name}' loaded successfully.")
+        return task
+
+    def list_recipes(self, pattern: str = "*") -> List[str]:
+        """Return the sorted names of all recipes whose name matches the glob `pattern`."""
+        if not self.recipes_path.is_dir():
+            return []
+        return self.store.recipe_names(pattern)
 
-        if not recipe_file_path.is_file():
-            raise LoaderError("recipe", str(recipe_file_path), "File not found")
+    def load_recipes(self, recipe_names: List[str]) -> List[CompilationTask]:
+        print(f"🚀 Loading {len(recipe_names)} recipe(s)...")
+        tasks = []
+        for task, error in self._map_in_order(self._read_recipe, recipe_names):
+            if error is not None:
+                raise error
+            tasks.append(task)
+        self.flush_cache()
+        print(f"✅ {len(tasks)} recipe(s) loaded successfully.")
+        return tasks
+
+    def _read_recipe(self, recipe_name: str) -> CompilationTask:
+        existing = self.store.paths('recipes', recipe_name)
+        if not existing:
+            raise LoaderError("recipe", str(self.recipes_path / f"{recipe_name}.recipe.yaml"), "File not found")
+        if len(existing) > 1:
+            raise LoaderError("recipe", str(existing[0]), f"Recipe '{recipe_name}' is defined in more than one file: {', '.join(p.name for p in existing)}")
+        recipe_file_path = existing[0]
 
         try:
-            recipe_data = self._read_yaml_file(recipe_file_path)
+            recipe_data = self.store.read_file('recipes', recipe_file_path)
             if not isinstance(recipe_data, dict):
                 raise LoaderError("recipe", str(recipe_file_path), "File is empty or has invalid format")
         except Exception as e:
             raise LoaderError("recipe", str(recipe_file_path), f"Failed to load or parse file: {e}") from e
         
-        print(f"✅ Recipe '{recipe_name}' loaded successfully.")
         return CompilationTask(
             recipe_name=recipe_name, 
             sources=recipe_data)
 
+    def asset_directories(self) -> Dict[str, Path]:
+        return {
+            'templates': self.templates_path,
+            'dataschemas': self.dataschemas_path,
+            'blocks': self.blocks_path,
+            'recipes': self.recipes_path,
+        }
+
+    def asset_files(self, kind: str) -> List[Path]:
+        """Sorted paths of every file of the given kind, in any supported format."""
+        return self.store.files(kind)
+
+    def classify(self, file_path: Path) -> Optional[Tuple[str, str]]:
+        """Return (kind, resource_id) for a file inside the project, or None if it is not an asset."""
+        return self.store.classify(file_path)
+
+    def read_asset(self, kind: str, file_path: Path) -> Any:
+        """Read and parse a single asset file of the given kind."""
+        try:
+            return self.store.read_file(kind, file_path)
+        except Exception as e:
+            raise LoaderError(kind, str(file_path), f"Failed to process file: {e}") from e
+
+    def scan_assets(self) -> Tuple[Dict[str, Dict[str, Any]], List[LoaderError]]:
+        """
+        Read every asset file of every kind. Unlike `load_compilation_sources`, a file
+        that cannot be read or parsed is collected in the returned error list instead
+        of aborting the load, so that all broken files can be reported at once.
+        """
+        assets: Dict[str, Dict[str, Any]] = {kind: {} for kind in self.ASSET_PATTERNS}
+        errors: List[LoaderError] = []
+        for kind in self.asset_directories():
+            file_paths = self.asset_files(kind)
+            read = partial(self.read_asset, kind)
+            for file_path, (content, error) in zip(file_paths, self._map_in_order(read, file_paths)):
+                resource_id = self.store.asset_id(file_path)
+                if error is not None:
+                    errors.append(error)  # type: ignore[arg-type]
+                    continue
+                if kind == 'recipes' and content is not None and not isinstance(content, dict):
+                    errors.append(LoaderError(kind, str(file_path), "File has invalid format"))
+                elif content and resource_id in assets[kind]:
+                    errors.append(LoaderError(kind, str(file_path), f"ID '{resource_id}' is already defined by another file"))
+                elif content:
+                    assets[kind][resource_id] = content
+        self.flush_cache()
+        return assets, errors
+
     def _get_templates(self) -> Dict[str, str]:
         if self._templates_cache is None:
             self._templates_cache = self._load_from_disk(
-                dir_path=self.templates_path,
-                glob_pattern="*.jinja",
-                resource_name="templates",
-                reader_func=self._read_text_file
+                kind="templates",
+                reader_func=partial(self.store.read_file, "templates")
             )
         return self._templates_cache
 
     def _get_dataschemas(self) -> Dict[str, Dict[str, Any]]:
         if self._dataschemas_cache is None:
             self._dataschemas_cache = self._load_from_disk(
-                dir_path=self.dataschemas_path,
-                glob_pattern="*.dataschema.y*ml", # 支持 .yml 和 .yaml
-                resource_name="dataschemas",
-                reader_func=self._read_yaml_file
+                kind="dataschemas",
+                reader_func=partial(self.store.read_file, "dataschemas")
             )
         return self._dataschemas_cache
 
     def _get_blocks(self) -> Dict[str, Dict[str, Any]]:
         if self._blocks_cache is None:
             self._blocks_cache = self._load_from_disk(
-                dir_path=self.blocks_path,
-                glob_pattern="*.block.y*ml", # 支持 .yml 和 .yaml
-                resource_name="blocks",
-                reader_func=self._read_yaml_file
+                kind="blocks",
+                reader_func=partial(self.store.read_file, "blocks")
             )
         return self._blocks_cache
 
-    def _load_from_disk(self, dir_path: Path, glob_pattern: str, resource_name: str, reader_func: Callable) -> Dict:
+    def _load_from_disk(self, kind: str, reader_func: Callable) -> Dict:
+        dir_path = self.asset_directories()[kind]
+        resource_name = kind
         print(f"  - Loading {resource_name} from: {dir_path}")
         if not dir_path.is_dir():
             print(f"    - Warning: Directory not found, skipping.")
             return {}
 
         loaded_data = {}
-        for file_path in dir_path.glob(glob_pattern):
-            # resource_id 通常是文件名去掉第一个点之后的部分
-            resource_id = file_path.name.split('.')[0]
-            try:
-                content = reader_func(file_path)
-                if content: # 确保文件不是空的
-                    loaded_data[resource_id] = content
-            except Exception as e:
-                raise LoaderError(resource_name, str(file_path), f"Failed to process file: {e}") from e
+        file_paths = self.asset_files(kind)
+        for file_path, (content, error) in zip(file_paths, self._map_in_order(reader_func, file_paths)):
+            resource_id = self.store.asset_id(file_path)
+            # 并发读取时仍按文件名顺序报告第一个出错的文件, 与逐个读取的行为一致
+            if error is not None:
+                raise LoaderError(resource_name, str(file_path), f"Failed to process file: {error}") from error
+            if content: # 确保文件不是空的
+                if resource_id in loaded_data:
+                    raise LoaderError(resource_name, str(file_path), f"ID '{resource_id}' is already defined by another file")
+                loaded_data[resource_id] = content
         
         print(f"    - Found and loaded {len(loaded_data)} {resource_name}.")
         return loaded_data
 
-    @staticmethod
-    def _read_yaml_file(path: Path) -> Optional[Dict[str, Any]]:
-        return yaml.safe_load(path.read_text(encoding='utf-8'))
+    def _map_in_order(self, func: Callable[[_T], _R], items: Sequence[_T]) -> Iterator[Tuple[Optional[_R], Optional[Exception]]]:
+        """
+        Apply `func` to every item on the I/O thread pool, yielding (result, error) in
+        the order of `items`. Reading and parsing of different files overlap. When the
+        caller stops early, e.g. on the first error, unstarted reads are cancelled.
+        """
+        def call(item: _T) -> Tuple[Optional[_R], Optional[Exception]]:
+            try:
+                return func(item), None
+            except Exception as e:
+                return None, e
+
+        if self.io_workers == 1 or len(items) < 2:
+            for item in items:
+                yield call(item)
+            return
+
+        # 按小批次派发, 摊薄每个文件一次 future 的调度开销
+        workers = min(self.io_workers, len(items))
+        size = max(1, min(_MAX_BATCH_SIZE, len(items) // (workers * 4)))
+        batches = [items[i:i + size] for i in range(0, len(items), size)]
+        pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="prism-loader")
+        try:
+            for results in pool.map(lambda batch: [call(item) for item in batch], batches):
+                yield from results
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
 
-    @staticmethod
-    def _read_text_file(path: Path) -> str:
-        return path.read_text(encoding='utf-8')
+    def flush_cache(self) -> None:
+        """Persist the parsed-asset cache; needed after reading through `load_lazy_sources`."""
+        if self.asset_cache is not None:
+            self.asset_cache.flush()
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+# CLI/watcher.py
+
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from CLI.exception import CLIError
+from CLI.actions.loader import ProjectLoader
+
+from Prism.entities import SourceChanges
+
+# 文件状态: (mtime_ns, size), 任一变化即视为文件被修改
+FileStat = Tuple[int, int]
+
+class ProjectWatcher:
+    """Detects changed asset files by polling stat data of the project directories."""
+    def __init__(self, loader: ProjectLoader) -> None:
+        self.loader = loader
+        self._snapshot: Dict[Path, FileStat] = self._scan()
+
+    def _scan(self) -> Dict[Path, FileStat]:
+        snapshot: Dict[Path, FileStat] = {}
+        for dir_path in self.loader.asset_directories().values():
+            try:
+                entries = list(os.scandir(dir_path))
+            except OSError:
+                continue
+            for entry in entries:
+                try:
+                    if not entry.is_file():
+                        continue
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                file_path = Path(entry.path)
+                if self.loader.classify(file_path) is not None:
+                    snapshot[file_path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def poll(self) -> Tuple[SourceChanges, List[CLIError]]:
+        """
+        Compare the directories against the previous scan and read every changed file.
+        Files that fail to load are reported in the returned error list and skipped
+        until they change again.
+        """
+        current = self._scan()
+        changed = [path for path, stat in current.items() if self._snapshot.get(path) != stat]
+        removed = [path for path in self._snapshot if path not in current]
+        self._snapshot = current
+
+        updates: Dict[str, Dict[str, Any]] = {'templates': {}, 'dataschemas': {}, 'blocks': {}, 'recipes': {}}
+        errors: List[CLIError] = []
+
+        for file_path in removed:
+            kind, resource_id = self.loader.classify(file_path)  # type: ignore[misc]
+            updates[kind][resource_id] = None
+        for file_path in sorted(changed):
+            kind, resource_id = self.loader.classify(file_path)  # type: ignore[misc]
+            try:
+                content = self.loader.read_asset(kind, file_path)
+            except CLIError as e:
+                errors.append(e)
+                continue
+            # 与 ProjectLoader 一致: 空文件视为不存在
+            updates[kind][resource_id] = content if content else None
+
+        return SourceChanges(**updates), errors
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+# CLI/writer.py
+
+from pathlib import Path
+from typing import List, Mapping
+
+from CLI.exception import WriterError
+
+from Prism.entities import CompilationArtifacts
+from Prism.models.ir import IRModel
+from Prism.precompiled import write_template_modules
+from Prism.snapshot import dump_ir, dump_ir_binary
+
+class ArtifactWriter:
+    TEMPLATE_FILENAME = "{recipe_name}.prompt.jinja"
+    MODEL_FILENAME = "{recipe_name}.data_model.py"
+    IR_FILENAME = "{recipe_name}.ir.json"
+    IR_BINARY_FILENAME = "{recipe_name}.ir.bin"
+    MODULES_DIRECTORY = "modules"
+
+    def __init__(self, project_path: Path) -> None:
+        self.project_path = project_path
+        self.outputs_path = self.project_path / 'outputs'
+
+    def write(self, recipe_name: str, artifacts: CompilationArtifacts) -> List[Path]:
+        written: List[Path] = []
+        try:
+            self.outputs_path.mkdir(parents=True, exist_ok=True)
+
+            template_path = self.outputs_path / self.TEMPLATE_FILENAME.format(recipe_name=recipe_name)
+            template_path.write_text(artifacts.template_content, encoding='utf-8')
+            written.append(template_path)
+
+            if artifacts.model_code:
+                model_path = self.outputs_path / self.MODEL_FILENAME.format(recipe_name=recipe_name)
+                model_path.write_text(artifacts.model_code, encoding='utf-8')
+                written.append(model_path)
+        except OSError as e:
+            raise WriterError(recipe_name, str(self.outputs_path), str(e)) from e
+        return written
+
+    def write_ir(self, recipe_name: str, ir: IRModel, binary: bool = False) -> Path:
+        filename = self.IR_BINARY_FILENAME if binary else self.IR_FILENAME
+        ir_path = self.outputs_path / filename.format(recipe_name=recipe_name)
+        try:
+            self.outputs_path.mkdir(parents=True, exist_ok=True)
+            if binary:
+                ir_path.write_bytes(dump_ir_binary(ir))
+            else:
+                ir_path.write_text(dump_ir(ir), encoding='utf-8')
+        except OSError as e:
+            raise WriterError(recipe_name, str(self.outputs_path), str(e)) from e
+        return ir_path
+
+    def write_modules(self, artifacts: Mapping[str, CompilationArtifacts]) -> List[Path]:
+        """Precompiled Jinja modules for the given recipes, in 'outputs/modules/' (see Prism.precompiled)."""
+        modules_path = self.outputs_path / self.MODULES_DIRECTORY
+        try:
+            return write_template_modules(modules_path, artifacts)
+        except OSError as e:
+            raise WriterError(", ".join(artifacts), str(modules_path), str(e)) from e
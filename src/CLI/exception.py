@@ -32,4 +32,14 @@ class ScaffoldError(CLIError):
 class LoaderError(CLIError):
     def __init__(self, file_type: str, file_name: str, reason: str):
         message = f"Failed to load {file_type} '{file_name}'. Reason: {reason}"
-        super().__init__(message, context={"file_type": file_type, "file_name": file_name, "reason": reason})
\ No newline at end of file
+        super().__init__(message, context={"file_type": file_type, "file_name": file_name, "reason": reason})
+
+class WriterError(CLIError):
+    def __init__(self, recipe_name: str, output_path: str, reason: str):
+        message = f"Failed to write artifacts of recipe '{recipe_name}' to '{output_path}'. Reason: {reason}"
+        super().__init__(message, context={"recipe_name": recipe_name, "output_path": output_path, "reason": reason})
+
+class ConvertError(CLIError):
+    def __init__(self, file_name: str, reason: str):
+        message = f"Failed to convert '{file_name}'. Reason: {reason}"
+        super().__init__(message, context={"file_name": file_name, "reason": reason})
@@ -1,8 +1,13 @@
 # -*- coding: utf-8 -*-
 # CLI/main.py
 
+import contextlib
+import json
+import sys
+import time
 import typer
 from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
 from typing_extensions import Annotated
 
 from rich.console import Console
@@ -11,14 +16,29 @@ from rich.panel import Panel
 from CLI.actions.initializer import ProjectInitializer
 from CLI.actions.scaffolder import Scaffolder
 from CLI.actions.loader import ProjectLoader
+from CLI.actions.asset_cache import ParsedAssetCache
+from CLI.actions.writer import ArtifactWriter
+from CLI.actions.watcher import ProjectWatcher
+from CLI.actions.converter import ProjectConverter, FORMATS
 from CLI.utils.finder import ProjectFinder
 
 from CLI.exception import CLIError, LoaderError
 
-from Prism.core import compile_recipe_to_artifacts
+from Prism.session import CompilationSession
+from Prism.batch import compile_many
+from Prism.live import LiveProject
+from Prism.graph import DependencyGraph
+from Prism.bundle import write_bundle
+from Prism.entities import CompilationResult, CompilationSources, CompilationTask
+from Prism.pipeline import RenderPipeline, RenderResult, read_records, write_results
+from Prism.validation import validate_project
+from Prism.cache import ArtifactCache
+from Prism.generators import JinjaAggregator
+from Prism.compiler import OptimizationResult, PassManager, optimize_ir, summarize_reports
+from Prism.stats import TOKENIZERS, PromptAnalyzer, RecipeStats
 from Prism.exceptions import PrismError
 
-from Prism.rich_handler import handle_exception 
+from Prism.rich_handler import handle_exception, compile_progress, report_validation, report_passes, report_stats
 
 # --- CLI App Initialization ---
 app = typer.Typer(
@@ -59,11 +79,30 @@ def init(
 
 @app.command()
 def compile(
-    recipe_name: Annotated[str, typer.Argument(help="The name of the recipe to compile (without extension).")]
+    recipe_name: Annotated[Optional[str], typer.Argument(help="The name of the recipe to compile (without extension).")] = None,
+    all_recipes: Annotated[bool, typer.Option("--all", help="Compile every recipe in the project.")] = False,
+    pattern: Annotated[Optional[str], typer.Option("--glob", help="Compile every recipe whose name matches this glob pattern.")] = None,
+    workers: Annotated[Optional[int], typer.Option("--workers", "-j", help="Number of worker processes for batch compilation. Defaults to the CPU count.")] = None,
+    no_cache: Annotated[bool, typer.Option("--no-cache", help="Do not read or write the artifact, parsed-asset and template bytecode caches in '.prism_cache/'.")] = False,
+    precompile: Annotated[bool, typer.Option("--precompile", help="With --all / --glob, also write the prompts as precompiled Jinja modules to 'outputs/modules/'.")] = False,
+    enable_passes: Annotated[Optional[List[str]], typer.Option("--enable-pass", help="Also run this IR pass (repeatable). See 'prism optimize'.")] = None,
+    disable_passes: Annotated[Optional[List[str]], typer.Option("--disable-pass", help="Do not run this IR pass (repeatable).")] = None
 ):
     """
     Compiles a recipe into its final prompt template and data model.
+    With --all or --glob, compiles many recipes in parallel and writes the results to 'outputs/'.
     """
+    passes = _pass_manager(enable_passes, disable_passes)
+    if all_recipes or pattern:
+        _compile_batch(pattern or "*", workers, use_cache=not no_cache, precompile=precompile, passes=passes)
+        return
+    if recipe_name is None:
+        console.print("[bold red]Error:[/bold red] Provide a recipe name, or use --all / --glob.")
+        raise typer.Exit(code=1)
+    if precompile:
+        console.print("[bold red]Error:[/bold red] --precompile is only supported with --all / --glob.")
+        raise typer.Exit(code=1)
+
     try:
         console.print(f"🚀 [bold]Starting compilation for recipe: [cyan]{recipe_name}[/cyan][/bold]")
         
@@ -71,13 +110,16 @@ def compile(
         project_root = ProjectFinder.find_root()
         console.print(f"✅ Found project root at: [green]{project_root}[/green]")
         
-        # 2. 初始化 Loader 并加载所有资源
-        loader = ProjectLoader(project_root)
-        sources = loader.load_compilation_sources()
+        # 2. 初始化 Loader, 只建立资源索引, 编译时按需读取
+        loader = _make_loader(project_root, use_cache=not no_cache)
+        sources = loader.load_lazy_sources()
         task = loader.load_recipe(recipe_name)
         
-        # 3. 调用核心库进行编译
-        artifacts = compile_recipe_to_artifacts(task, sources)
+        # 3. 调用核心库进行编译 (未变化的 recipe 直接命中缓存)
+        cache = _open_cache(project_root) if not no_cache else None
+        session = CompilationSession(sources, lazy=True, cache=cache, passes=passes)
+        artifacts = session.compile(task)
+        loader.flush_cache()
         
         # 4. 美化输出结果
         console.print("\n✨ [bold green]Compilation Successful![/bold green] ✨")
@@ -99,6 +141,430 @@ def compile(
         handle_cli_error(e)
         raise typer.Exit(code=1)
 
+# ProjectLoader 的资源类型 -> DependencyGraph 的节点类型
+_GRAPH_NODE_KINDS = {'templates': 'template', 'dataschemas': 'dataschema', 'blocks': 'block', 'recipes': 'recipe'}
+
+def _open_cache(project_root: Path) -> ArtifactCache:
+    """The artifact cache in '.prism_cache/'; also keeps compiled Jinja bytecode there for recipes that miss it."""
+    cache_dir = project_root / ProjectInitializer.CACHE_DIRECTORY
+    JinjaAggregator.configure(bytecode_cache_dir=cache_dir / 'jinja')
+    return ArtifactCache.in_directory(cache_dir / 'artifacts')
+
+def _make_loader(project_root: Path, use_cache: bool = True) -> ProjectLoader:
+    """A loader that reuses parse results of unchanged files from '.prism_cache/' across runs."""
+    asset_cache = ParsedAssetCache.in_directory(project_root / ProjectInitializer.CACHE_DIRECTORY) if use_cache else None
+    return ProjectLoader(project_root, asset_cache=asset_cache)
+
+def _pass_manager(enable: Optional[List[str]], disable: Optional[List[str]]) -> PassManager:
+    try:
+        return PassManager.with_options(enable=enable or (), disable=disable or ())
+    except ValueError as e:
+        console.print(f"[bold red]Error:[/bold red] {e}")
+        raise typer.Exit(code=1)
+
+def _compile_batch(
+    pattern: str,
+    workers: Optional[int],
+    use_cache: bool = True,
+    precompile: bool = False,
+    passes: Optional[PassManager] = None
+):
+    try:
+        project_root = ProjectFinder.find_root()
+        console.print(f"✅ Found project root at: [green]{project_root}[/green]")
+
+        loader = _make_loader(project_root, use_cache=use_cache)
+        recipe_names = loader.list_recipes(pattern)
+        if not recipe_names:
+            console.print(f"[yellow]No recipes match '{pattern}'.[/yellow]")
+            return
+        sources = loader.load_compilation_sources()
+        tasks = loader.load_recipes(recipe_names)
+
+        cache = _open_cache(project_root) if use_cache else None
+        with compile_progress(len(tasks)) as advance:
+            results = compile_many(tasks, sources, workers=workers, lazy=True, on_result=advance, cache=cache, passes=passes)
+
+        writer = ArtifactWriter(project_root)
+        failures = [result for result in results if not result.ok]
+        for result in results:
+            if result.ok and result.artifacts is not None:
+                writer.write(result.recipe_name, result.artifacts)
+        modules = []
+        if precompile:
+            modules = writer.write_modules({
+                result.recipe_name: result.artifacts
+                for result in results if result.ok and result.artifacts is not None
+            })
+    except Exception as e:
+        handle_cli_error(e)
+        raise typer.Exit(code=1)
+
+    for result in failures:
+        console.print(f"❌ [bold red]{result.recipe_name}[/bold red]")
+        handle_cli_error(result.error)
+
+    succeeded = len(results) - len(failures)
+    console.print(
+        f"\n✨ [bold]Compiled {succeeded}/{len(results)} recipe(s)[/bold] "
+        f"into [green]{writer.outputs_path}[/green]"
+    )
+    if modules:
+        console.print(f"   Precompiled {len(modules)} module(s) into [green]{modules[0].parent}[/green]")
+    if cache is not None:
+        console.print(f"   Cache: {cache.stats.hits} hit(s), {cache.stats.misses} miss(es)")
+    if failures:
+        raise typer.Exit(code=1)
+
+@app.command()
+def snapshot(
+    pattern: Annotated[str, typer.Argument(help="Glob pattern of the recipes to snapshot.")] = "*",
+    binary: Annotated[bool, typer.Option("--binary", help="Write the binary encoding (*.ir.bin) instead of JSON (*.ir.json).")] = False,
+    optimize: Annotated[bool, typer.Option("--optimize", help="Fold static blocks into literals before writing; the compiled prompts are the same.")] = False
+):
+    """
+    Compiles recipes to versioned IR snapshots in 'outputs/', skipping the back-end generators.
+    """
+    try:
+        project_root = ProjectFinder.find_root()
+        loader = _make_loader(project_root)
+        recipe_names = loader.list_recipes(pattern)
+        if not recipe_names:
+            console.print(f"[yellow]No recipes match '{pattern}'.[/yellow]")
+            return
+        sources = loader.load_lazy_sources()
+        tasks = loader.load_recipes(recipe_names)
+        session = CompilationSession(sources, lazy=True)
+        writer = ArtifactWriter(project_root)
+    except Exception as e:
+        handle_cli_error(e)
+        raise typer.Exit(code=1)
+
+    failures = 0
+    for task in tasks:
+        try:
+            ir = session.compile_ir(task)
+            if optimize:
+                ir = optimize_ir(ir)
+            ir_path = writer.write_ir(task.recipe_name, ir, binary=binary)
+            console.print(f"  ✅ {task.recipe_name} -> [green]{ir_path.name}[/green]")
+        except Exception as e:
+            failures += 1
+            console.print(f"  ❌ [bold red]{task.recipe_name}[/bold red]")
+            handle_cli_error(e)
+    loader.flush_cache()
+    if failures:
+        raise typer.Exit(code=1)
+
+@app.command()
+def optimize(
+    pattern: Annotated[str, typer.Argument(help="Glob pattern of the recipes to measure.")] = "*",
+    enable_passes: Annotated[Optional[List[str]], typer.Option("--enable-pass", help="Also run this IR pass (repeatable).")] = None,
+    disable_passes: Annotated[Optional[List[str]], typer.Option("--disable-pass", help="Do not run this IR pass (repeatable).")] = None
+):
+    """
+    Runs the IR passes over recipes and reports what each one buys: time, segments, bytes and contract fields.
+    Nothing is written. Passes, in order: dedupe_blocks, fold_constants*, coalesce_literals*,
+    prune_contract_fields, normalize_whitespace (* enabled by default).
+    Recipes that fail to compile are reported and left out of the totals; the exit code is then 1.
+    """
+    passes = _pass_manager(enable_passes, disable_passes)
+    try:
+        project_root = ProjectFinder.find_root()
+        loader = _make_loader(project_root)
+        recipe_names = loader.list_recipes(pattern)
+        if not recipe_names:
+            console.print(f"[yellow]No recipes match '{pattern}'.[/yellow]")
+            return
+        sources = loader.load_lazy_sources()
+        tasks = loader.load_recipes(recipe_names)
+        session = CompilationSession(sources, lazy=True)
+    except Exception as e:
+        handle_cli_error(e)
+        raise typer.Exit(code=1)
+
+    results: List[OptimizationResult] = []
+    failures = 0
+    for task in tasks:
+        try:
+            results.append(passes.run(session.compile_ir(task), report=True))
+        except Exception as e:
+            failures += 1
+            console.print(f"❌ [bold red]{task.recipe_name}[/bold red]")
+            handle_cli_error(e)
+    loader.flush_cache()
+
+    if results:
+        report_passes(summarize_reports(results), recipes=len(results))
+    if failures:
+        raise typer.Exit(code=1)
+
+@app.command()
+def render(
+    recipe_name: Annotated[str, typer.Argument(help="The name of the recipe whose prompt is rendered.")],
+    input_path: Annotated[Path, typer.Option("--input", "-i", help="JSONL or CSV file with one input record per line. CSV cells are converted to the types the contracts declare; empty cells count as missing.")],
+    output_path: Annotated[Path, typer.Option("--output", "-o", help="JSONL or CSV file the rendered prompts are written to.")],
+    workers: Annotated[Optional[int], typer.Option("--workers", "-j", help="Number of worker processes. Defaults to the CPU count.")] = None,
+    unordered: Annotated[bool, typer.Option("--unordered", help="Write each result as soon as it is ready instead of in input order.")] = False,
+    no_validate: Annotated[bool, typer.Option("--no-validate", help="Do not validate records against the recipe's data contracts.")] = False,
+    fail_fast: Annotated[bool, typer.Option("--fail-fast", help="Stop at the first record that fails validation or rendering.")] = False,
+    no_cache: Annotated[bool, typer.Option("--no-cache", help="Do not read or write the artifact, parsed-asset and template bytecode caches in '.prism_cache/'.")] = False
+):
+    """
+    Renders a recipe's prompt for every record of a JSONL or CSV dataset.
+    Records are streamed through a process pool; failed records are written with an 'error' field.
+    """
+    try:
+        project_root = ProjectFinder.find_root()
+        loader = _make_loader(project_root, use_cache=not no_cache)
+        sources = loader.load_lazy_sources()
+        task = loader.load_recipe(recipe_name)
+        cache = _open_cache(project_root) if not no_cache else None
+        artifacts = CompilationSession(sources, lazy=True, cache=cache).compile(task)
+        loader.flush_cache()
+
+        pipeline = RenderPipeline(artifacts, name=recipe_name, validate=not no_validate, workers=workers, ordered=not unordered)
+        results: Iterable[RenderResult] = pipeline.run(read_records(input_path, contracts=artifacts.contracts))
+        if fail_fast:
+            results = _until_first_failure(results)
+        write_results(output_path, results)
+    except Exception as e:
+        handle_cli_error(e)
+        raise typer.Exit(code=1)
+
+    stats = pipeline.stats
+    console.print(
+        f"✨ Rendered {stats.rendered}/{stats.records} record(s) into [green]{output_path}[/green] "
+        f"in {stats.elapsed:.2f} s ({stats.rate:,.0f} records/s)"
+    )
+    if stats.failed:
+        console.print(f"[bold red]{stats.failed} record(s) failed; see their 'error' field.[/bold red]")
+        raise typer.Exit(code=1)
+
+@app.command()
+def stats(
+    pattern: Annotated[str, typer.Argument(help="Glob pattern of the recipes to measure.")] = "*",
+    max_chars: Annotated[Optional[int], typer.Option("--max-chars", help="Fail if a recipe's static portion is longer than this many characters.")] = None,
+    max_tokens: Annotated[Optional[int], typer.Option("--max-tokens", help="Fail if a recipe's static portion has more tokens than this.")] = None,
+    tokenizer: Annotated[str, typer.Option("--tokenizer", help=f"Token counter: {', '.join(TOKENIZERS)}. 'tiktoken' needs the optional tiktoken package.")] = 'approx',
+    show_blocks: Annotated[bool, typer.Option("--blocks", help="Also show the size of every block.")] = False,
+    json_output: Annotated[bool, typer.Option("--json", help="Print one JSON object per recipe instead of a table.")] = False
+):
+    """
+    Reports the static size (characters and tokens) of compiled prompts and their runtime variables without length limits.
+    Exits with code 1 if a recipe fails to compile or exceeds --max-chars / --max-tokens, e.g. to fail a CI build.
+    """
+    try:
+        analyzer = PromptAnalyzer(tokenizer)
+        project_root = ProjectFinder.find_root()
+        loader = _make_loader(project_root)
+        # --json 时 stdout 只输出结果, 加载信息写到 stderr
+        with contextlib.redirect_stdout(sys.stderr) if json_output else contextlib.nullcontext():
+            recipe_names = loader.list_recipes(pattern)
+            if not recipe_names:
+                console.print(f"[yellow]No recipes match '{pattern}'.[/yellow]")
+                return
+            sources = loader.load_lazy_sources()
+            tasks = loader.load_recipes(recipe_names)
+        session = CompilationSession(sources, lazy=True)
+    except Exception as e:
+        handle_cli_error(e)
+        raise typer.Exit(code=1)
+
+    results: List[RecipeStats] = []
+    failures = 0
+    for task in tasks:
+        try:
+            results.append(analyzer.analyze(session.compile_ir(task), recipe_name=task.recipe_name))
+        except Exception as e:
+            failures += 1
+            with contextlib.redirect_stdout(sys.stderr):
+                console.print(f"❌ [bold red]{task.recipe_name}[/bold red]")
+                handle_cli_error(e)
+    loader.flush_cache()
+
+    over_budget = {
+        recipe.recipe_name: reasons
+        for recipe in results
+        if (reasons := recipe.over_budget(max_chars=max_chars, max_tokens=max_tokens))
+    }
+    if json_output:
+        for recipe in results:
+            print(json.dumps({**recipe.to_dict(), "over_budget": over_budget.get(recipe.recipe_name, [])}, ensure_ascii=False))
+    else:
+        report_stats(results, over_budget, show_blocks=show_blocks)
+    if failures or over_budget:
+        raise typer.Exit(code=1)
+
+def _until_first_failure(results: Iterable[RenderResult]) -> Iterator[RenderResult]:
+    for result in results:
+        yield result
+        if not result.ok:
+            return
+
+@app.command()
+def validate(
+    workers: Annotated[Optional[int], typer.Option("--workers", "-j", help="Number of worker processes. Defaults to the CPU count.")] = None
+):
+    """
+    Checks every asset of the project and reports all problems at once, without compiling.
+    """
+    try:
+        project_root = ProjectFinder.find_root()
+        loader = _make_loader(project_root)
+        assets, load_errors = loader.scan_assets()
+        sources = CompilationSources(
+            templates=assets['templates'],
+            dataschemas=assets['dataschemas'],
+            blocks=assets['blocks']
+        )
+        tasks = [CompilationTask(recipe_name=name, sources=data) for name, data in sorted(assets['recipes'].items())]
+        report = validate_project(sources, tasks, workers=workers)
+    except Exception as e:
+        handle_cli_error(e)
+        raise typer.Exit(code=1)
+
+    for error in load_errors:
+        handle_cli_error(error)
+    report_validation(report)
+    if load_errors or not report.ok:
+        raise typer.Exit(code=1)
+
+@app.command()
+def convert(
+    target: Annotated[str, typer.Argument(help="Target format of the block, dataschema and recipe files: 'json' or 'yaml'.")]
+):
+    """
+    Rewrites the project's block, dataschema and recipe files into JSON or YAML.
+    JSON parses much faster; YAML is easier to edit by hand. YAML comments are not preserved.
+    """
+    if target not in FORMATS:
+        console.print(f"[bold red]Error:[/bold red] Unknown format '{target}'. Use one of: {', '.join(FORMATS)}.")
+        raise typer.Exit(code=1)
+    try:
+        project_root = ProjectFinder.find_root()
+        converted = ProjectConverter(ProjectLoader(project_root)).convert(target)
+    except Exception as e:
+        handle_cli_error(e)
+        raise typer.Exit(code=1)
+
+    for old_path, new_path in converted:
+        console.print(f"  🔄 {old_path.relative_to(project_root)} -> [green]{new_path.name}[/green]")
+    console.print(f"✨ [bold]Converted {len(converted)} file(s) to {target.upper()}.[/bold]")
+
+@app.command()
+def bundle(
+    output: Annotated[Optional[Path], typer.Option("--output", "-o", help="Bundle file to write. Defaults to 'outputs/<project>.prism'.")] = None,
+    with_artifacts: Annotated[bool, typer.Option("--with-artifacts", help="Also compile every recipe and store its artifacts in the bundle.")] = False,
+    workers: Annotated[Optional[int], typer.Option("--workers", "-j", help="Number of worker processes used with --with-artifacts.")] = None
+):
+    """
+    Packs the validated project (assets, recipes, dependency index and optionally artifacts) into one file.
+    """
+    try:
+        project_root = ProjectFinder.find_root()
+        loader = _make_loader(project_root)
+        sources = loader.load_compilation_sources()
+        tasks = loader.load_recipes(loader.list_recipes())
+
+        artifacts = None
+        if with_artifacts:
+            with compile_progress(len(tasks)) as advance:
+                results = compile_many(tasks, sources, workers=workers, on_result=advance, cache=_open_cache(project_root))
+            for result in results:
+                if not result.ok:
+                    console.print(f"❌ [bold red]{result.recipe_name}[/bold red]")
+                    raise result.error  # type: ignore[misc]
+            artifacts = {result.recipe_name: result.artifacts for result in results}
+
+        bundle_path = output or project_root / 'outputs' / f"{project_root.name}.prism"
+        write_bundle(bundle_path, sources, tasks, artifacts)
+        console.print(f"📦 [bold green]Bundle written to[/bold green] [green]{bundle_path}[/green]")
+    except Exception as e:
+        handle_cli_error(e)
+        raise typer.Exit(code=1)
+
+@app.command()
+def watch(
+    interval: Annotated[float, typer.Option("--interval", help="Seconds between two scans of the project directories.")] = 0.5,
+    no_cache: Annotated[bool, typer.Option("--no-cache", help="Do not read or write the artifact, parsed-asset and template bytecode caches in '.prism_cache/'.")] = False
+):
+    """
+    Watches the project and recompiles only the recipes affected by each change into 'outputs/'.
+    """
+    try:
+        project_root = ProjectFinder.find_root()
+        console.print(f"✅ Found project root at: [green]{project_root}[/green]")
+
+        loader = _make_loader(project_root, use_cache=not no_cache)
+        sources = loader.load_compilation_sources()
+        tasks = loader.load_recipes(loader.list_recipes())
+        writer = ArtifactWriter(project_root)
+
+        project = LiveProject(sources, tasks, cache=_open_cache(project_root) if not no_cache else None)
+        watcher = ProjectWatcher(loader)
+        start = time.perf_counter()
+        _report_watch_results(project.compile_all(), writer, time.perf_counter() - start)
+    except Exception as e:
+        handle_cli_error(e)
+        raise typer.Exit(code=1)
+
+    console.print(f"👀 [bold]Watching[/bold] [green]{project_root}[/green] for changes. Press Ctrl+C to stop.")
+    try:
+        while True:
+            time.sleep(interval)
+            changes, errors = watcher.poll()
+            for error in errors:
+                handle_cli_error(error)
+            if not changes:
+                continue
+            start = time.perf_counter()
+            results = project.apply(changes)
+            _report_watch_results(results, writer, time.perf_counter() - start)
+    except KeyboardInterrupt:
+        console.print("\n👋 Stopped watching.")
+
+def _report_watch_results(results: Dict[str, CompilationResult], writer: ArtifactWriter, elapsed: float):
+    for recipe_name, result in results.items():
+        if result.ok and result.artifacts is not None:
+            try:
+                writer.write(recipe_name, result.artifacts)
+                console.print(f"  ✅ {recipe_name}")
+                continue
+            except CLIError as e:
+                result = CompilationResult(recipe_name=recipe_name, error=e)
+        console.print(f"  ❌ [bold red]{recipe_name}[/bold red]")
+        handle_cli_error(result.error)
+    console.print(f"🔁 Recompiled {len(results)} recipe(s) in {elapsed * 1000:.1f} ms")
+
+@app.command()
+def affected(
+    paths: Annotated[List[Path], typer.Argument(help="Changed asset files, e.g. from 'git diff --name-only'.")]
+):
+    """
+    Prints the names of the recipes affected by changes to the given files, one per line.
+    """
+    try:
+        project_root = ProjectFinder.find_root()
+        loader = _make_loader(project_root)
+        with contextlib.redirect_stdout(sys.stderr):
+            sources = loader.load_compilation_sources()
+            tasks = loader.load_recipes(loader.list_recipes())
+        graph = DependencyGraph.build(sources, {task.recipe_name: task.sources for task in tasks})
+
+        changed = []
+        for path in paths:
+            classified = loader.classify(path.resolve())
+            if classified is not None:
+                kind, resource_id = classified
+                changed.append((_GRAPH_NODE_KINDS[kind], resource_id))
+    except Exception as e:
+        handle_cli_error(e)
+        raise typer.Exit(code=1)
+
+    for recipe_name in sorted(graph.affected_recipes(changed)):
+        print(recipe_name)
+
 # --- "new" Subcommand Group ---
 
 new_app = typer.Typer(name="new", help="Create new Prism files from templates.")
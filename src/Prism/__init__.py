@@ -1,17 +1,86 @@
 # Prism/__init__.py
 
-from .core import compile_recipe_to_artifacts
-from .entities import CompilationSources, CompilationArtifacts
-from .exceptions import PrismError, MetaSchemaFileError, InternalSchemaError, AssetValidationError, ResolutionError ,GenerationError
+from .core import compile_recipe_to_artifacts, compile_recipe_to_artifacts_async, compile_ir_to_artifacts
+from .session import CompilationSession
+from .batch import compile_many
+from .live import LiveProject
+from .graph import DependencyGraph
+from .snapshot import dump_ir, dump_ir_binary, load_ir
+from .compiler.optimizer import optimize_ir
+from .compiler.pass_manager import PassManager, PassReport, register_pass
+from .stats import PromptAnalyzer, RecipeStats, BlockStats, approximate_tokens
+from .bundle import write_bundle, ProjectBundle
+from .validation import validate_project, ValidationReport, ValidationIssue
+from .lazy import LazyMapping
+from .renderer import PromptRenderer
+from .pipeline import RenderPipeline, RenderResult, RenderStats, read_records, write_results
+from .precompiled import PrecompiledPrompts, write_template_modules
+from .analysis import analyze_template, template_variables, TemplateInfo
+from .stores import AssetStore, MemoryAssetStore, FileSystemAssetStore, ZipAssetStore, SQLiteAssetStore
+from .cache import ArtifactCache, MemoryArtifactCache, DiskArtifactCache, CacheStats
+from .entities import CompilationSources, CompilationArtifacts, CompilationTask, CompilationResult, SourceChanges
+from .exceptions import PrismError, MetaSchemaFileError, InternalSchemaError, AssetValidationError, ResolutionError ,GenerationError, SnapshotError, BundleError, TemplateValidationError, StoreError, RenderError, DatasetError
 
 __all__ = [
     "compile_recipe_to_artifacts",
+    "compile_recipe_to_artifacts_async",
+    "compile_ir_to_artifacts",
+    "CompilationSession",
+    "compile_many",
+    "LiveProject",
+    "DependencyGraph",
+    "dump_ir",
+    "dump_ir_binary",
+    "load_ir",
+    "optimize_ir",
+    "PassManager",
+    "PassReport",
+    "register_pass",
+    "PromptAnalyzer",
+    "RecipeStats",
+    "BlockStats",
+    "approximate_tokens",
+    "write_bundle",
+    "ProjectBundle",
+    "validate_project",
+    "ValidationReport",
+    "ValidationIssue",
+    "LazyMapping",
+    "PromptRenderer",
+    "RenderPipeline",
+    "RenderResult",
+    "RenderStats",
+    "read_records",
+    "write_results",
+    "PrecompiledPrompts",
+    "write_template_modules",
+    "analyze_template",
+    "template_variables",
+    "TemplateInfo",
+    "AssetStore",
+    "MemoryAssetStore",
+    "FileSystemAssetStore",
+    "ZipAssetStore",
+    "SQLiteAssetStore",
+    "ArtifactCache",
+    "MemoryArtifactCache",
+    "DiskArtifactCache",
+    "CacheStats",
     "CompilationSources",
     "CompilationArtifacts",
+    "CompilationTask",
+    "CompilationResult",
+    "SourceChanges",
     "PrismError",
     "MetaSchemaFileError",
     "InternalSchemaError",
     "AssetValidationError",
     "GenerationError",
-    "ResolutionError"
+    "ResolutionError",
+    "SnapshotError",
+    "BundleError",
+    "TemplateValidationError",
+    "StoreError",
+    "RenderError",
+    "DatasetError"
 ]
\ No newline at end of file
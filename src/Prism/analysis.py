@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+# prism/analysis.py
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import FrozenSet, Iterable, Set
+
+from jinja2 import Environment, meta, nodes
+
+# 只做语法解析, 不渲染; 语法设置与 JinjaAggregator 的渲染环境相同
+_ANALYSIS_ENV = Environment()
+
+# 不读取任何变量, 但每次渲染结果可能不同的全局函数和过滤器
+_NON_DETERMINISTIC_GLOBALS = frozenset({'lipsum'})
+_NON_DETERMINISTIC_FILTERS = frozenset({'random'})
+
+@dataclass(frozen=True)
+class TemplateInfo:
+    """What a template reads from its render context, found from its AST without rendering it."""
+    # 模板使用但未在模板内部定义的变量, 即必须由 defaults 或运行时数据提供的变量
+    variables: FrozenSet[str]
+    # 给定相同的上下文, 输出是否总是相同
+    deterministic: bool
+
+    @property
+    def is_static(self) -> bool:
+        """True if the template renders to the same text every time, so it only needs rendering once."""
+        return not self.variables and self.deterministic
+
+    def missing(self, provided: Iterable[str]) -> Set[str]:
+        """The variables of the template that are not in `provided`."""
+        return set(self.variables.difference(provided))
+
+@lru_cache(maxsize=4096)
+def analyze_template(source: str) -> TemplateInfo:
+    """
+    Parse a Jinja template once and report the variables it uses. Results are
+    cached per template source. Raises jinja2.TemplateSyntaxError for invalid
+    templates.
+    """
+    ast = _ANALYSIS_ENV.parse(source)
+    deterministic = not any(
+        node.name in _NON_DETERMINISTIC_GLOBALS for node in ast.find_all(nodes.Name)
+    ) and not any(
+        node.name in _NON_DETERMINISTIC_FILTERS for node in ast.find_all(nodes.Filter)
+    )
+    return TemplateInfo(
+        variables=frozenset(meta.find_undeclared_variables(ast)),
+        deterministic=deterministic
+    )
+
+def template_variables(source: str) -> FrozenSet[str]:
+    """The variables a template reads from its render context."""
+    return analyze_template(source).variables
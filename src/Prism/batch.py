@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+# prism/batch.py
+
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, List, Optional, Sequence
+
+from .cache import ArtifactCache, AssetFingerprinter
+from .compiler.pass_manager import PassManager
+from .entities import CompilationSources, CompilationTask, CompilationResult
+from .session import CompilationSession
+
+# 每个工作进程持有一个 session, 由 initializer 在进程启动时构建一次
+_worker_session: Optional[CompilationSession] = None
+
+def _init_worker(sources: CompilationSources, lazy: bool, trusted: bool, passes: Optional[PassManager]) -> None:
+    global _worker_session
+    _worker_session = CompilationSession(sources, lazy=lazy, trusted=trusted, passes=passes)
+
+def _compile_with_session(session: CompilationSession, task: CompilationTask) -> CompilationResult:
+    try:
+        return CompilationResult(recipe_name=task.recipe_name, artifacts=session.compile(task))
+    except Exception as e:
+        return CompilationResult(recipe_name=task.recipe_name, error=e)
+
+def _compile_in_worker(task: CompilationTask) -> CompilationResult:
+    if _worker_session is None:
+        raise RuntimeError("Worker process was started without a compilation session")
+    return _compile_with_session(_worker_session, task)
+
+def compile_many(
+    tasks: Sequence[CompilationTask],
+    sources: CompilationSources,
+    workers: Optional[int] = None,
+    lazy: bool = False,
+    on_result: Optional[Callable[[CompilationResult], None]] = None,
+    cache: Optional[ArtifactCache] = None,
+    trusted: bool = False,
+    passes: Optional[PassManager] = None
+) -> List[CompilationResult]:
+    """
+    Compile many recipes against the same sources, in parallel across processes.
+
+    The sources are shipped to each worker once, through the pool initializer, and
+    every worker builds its own CompilationSession from them. Failures do not stop
+    the batch: each recipe gets a CompilationResult carrying either its artifacts or
+    the error it raised. Results are returned in the order of `tasks`; `on_result`
+    is called as each one completes, e.g. to drive a progress display.
+
+    With a `cache`, lookups and stores happen in the calling process and only
+    the recipes that miss are dispatched to workers. `trusted` and `passes` are
+    passed on to every worker's CompilationSession.
+    """
+    results: List[Optional[CompilationResult]] = [None] * len(tasks)
+
+    def finish(index: int, result: CompilationResult) -> None:
+        results[index] = result
+        if cache is not None and result.ok and result.artifacts is not None:
+            cache.put(fingerprints[index], result.artifacts)
+        if on_result:
+            on_result(result)
+
+    # 1. 先查缓存, 命中的 recipe 不再派发
+    fingerprints: List[str] = []
+    pending: List[int] = list(range(len(tasks)))
+    if cache is not None:
+        fingerprinter = AssetFingerprinter(sources, options=(passes or PassManager()).key, trusted=trusted)
+        fingerprints = [fingerprinter.fingerprint(task) for task in tasks]
+        pending = []
+        for index, task in enumerate(tasks):
+            artifacts = cache.get(fingerprints[index])
+            if artifacts is None:
+                pending.append(index)
+            else:
+                results[index] = CompilationResult(recipe_name=task.recipe_name, artifacts=artifacts)
+                if on_result:
+                    on_result(results[index])
+    if not pending:
+        return results  # type: ignore[return-value]
+
+    # 2. 编译未命中的 recipe
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(pending)))
+
+    if workers == 1:
+        session = CompilationSession(sources, lazy=lazy, trusted=trusted, passes=passes)
+        for index in pending:
+            finish(index, _compile_with_session(session, tasks[index]))
+        return results  # type: ignore[return-value]
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(sources, lazy, trusted, passes)) as pool:
+        futures = {pool.submit(_compile_in_worker, tasks[index]): index for index in pending}
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                # 例如工作进程崩溃或结果无法反序列化
+                result = CompilationResult(recipe_name=tasks[index].recipe_name, error=e)
+            finish(index, result)
+    return results  # type: ignore[return-value]
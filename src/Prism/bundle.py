@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+# prism/bundle.py
+
+import json
+import mmap
+import os
+import struct
+import tempfile
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from .core import _build_resolver_from_sources
+from .entities import CompilationArtifacts, CompilationSources, CompilationTask
+from .exceptions import BundleError
+from .graph import DependencyGraph
+from .schemas.schema_validator import validate_recipe_file
+
+# 文件布局:
+#   MAGIC (8 字节) | 版本 (uint32) | 索引长度 (uint64) | 索引 (JSON) | 数据区
+# 索引把每个段的键 ('block/<id>', 'recipe/<name>', 'deps/<name>', 'graph' ...) 映射到数据区内的 [偏移, 长度],
+# 每个段都是一份紧凑的 JSON, 读取时按需解码
+BUNDLE_VERSION = 2
+
+_MAGIC = b"PRISMBDL"
+_HEADER = struct.Struct("<8sIQ")
+
+_KIND_KEYS = {'templates': 'template', 'dataschemas': 'dataschema', 'blocks': 'block'}
+
+def write_bundle(
+    path: Path,
+    sources: CompilationSources,
+    recipes: Iterable[CompilationTask],
+    artifacts: Optional[Mapping[str, CompilationArtifacts]] = None
+) -> Path:
+    """
+    Validate the project and pack its pre-parsed assets, recipes, dependency graph
+    and, optionally, compiled artifacts into a single bundle file.
+    """
+    path = Path(path)
+    tasks = list(recipes)
+
+    # 1. 打包前完成全部校验, 加载 bundle 时不需要再校验
+    _build_resolver_from_sources(sources)
+    for task in tasks:
+        validate_recipe_file(task.recipe_name, task.sources)
+    graph = DependencyGraph.build(sources, {task.recipe_name: task.sources for task in tasks})
+
+    # 2. 依次写出各个段, 记录偏移表
+    segments: List[Tuple[str, bytes]] = []
+    for kind, key in _KIND_KEYS.items():
+        for asset_id, content in getattr(sources, kind).items():
+            segments.append((f"{key}/{asset_id}", _encode(content)))
+    for task in tasks:
+        segments.append((f"recipe/{task.recipe_name}", _encode(task.sources)))
+        # 预先展开每个 recipe 的依赖闭包, 加载单个 recipe 时无需解码整张依赖图
+        closure: Dict[str, List[str]] = {key: [] for key in _KIND_KEYS.values()}
+        for kind, asset_id in sorted(graph.dependencies(('recipe', task.recipe_name))):
+            if kind in closure:
+                closure[kind].append(asset_id)
+        segments.append((f"deps/{task.recipe_name}", _encode(closure)))
+    for recipe_name, recipe_artifacts in (artifacts or {}).items():
+        segments.append((f"artifacts/{recipe_name}", _encode(asdict(recipe_artifacts))))
+    segments.append(("graph", _encode(graph.to_dict())))
+
+    entries: Dict[str, List[int]] = {}
+    offset = 0
+    for key, data in segments:
+        entries[key] = [offset, len(data)]
+        offset += len(data)
+    index = _encode({"entries": entries})
+
+    # 3. 原子写入
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    except OSError as e:
+        raise BundleError(bundle_path=str(path), reason=str(e)) from e
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, BUNDLE_VERSION, len(index)))
+            f.write(index)
+            for _, data in segments:
+                f.write(data)
+        os.replace(tmp_name, path)
+    except OSError as e:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise BundleError(bundle_path=str(path), reason=str(e)) from e
+    return path
+
+def _encode(data: Any) -> bytes:
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+class ProjectBundle:
+    """
+    Read-only view of a bundle file. Opening it only reads the header and offset
+    table; every asset, recipe or artifact is decoded from the memory map the first
+    time it is requested, so startup cost scales with what is used.
+    """
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        try:
+            with open(self.path, "rb") as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            raise BundleError(bundle_path=str(self.path), reason=str(e)) from e
+
+        try:
+            magic, version, index_length = _HEADER.unpack_from(self._mmap, 0)
+        except struct.error as e:
+            self.close()
+            raise BundleError(bundle_path=str(self.path), reason="File is too short to be a bundle") from e
+        if magic != _MAGIC:
+            self.close()
+            raise BundleError(bundle_path=str(self.path), reason="Not a Prism bundle")
+        if version != BUNDLE_VERSION:
+            self.close()
+            raise BundleError(
+                bundle_path=str(self.path),
+                reason=f"Bundle version {version} is not supported (expected {BUNDLE_VERSION})"
+            )
+
+        data_start = _HEADER.size + index_length
+        try:
+            self._entries: Dict[str, List[int]] = json.loads(self._mmap[_HEADER.size:data_start])["entries"]
+        except (ValueError, KeyError, TypeError) as e:
+            self.close()
+            raise BundleError(bundle_path=str(self.path), reason=f"Corrupt bundle index: {e}") from e
+        self._data_start = data_start
+        self._decoded: Dict[str, Any] = {}
+        self._graph: Optional[DependencyGraph] = None
+
+    @classmethod
+    def open(cls, path: Path) -> "ProjectBundle":
+        return cls(path)
+
+    def close(self) -> None:
+        self._mmap.close()
+
+    def __enter__(self) -> "ProjectBundle":
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
+
+    # --- 索引查询, 不解码任何数据 ---
+
+    def ids(self, kind: str) -> List[str]:
+        """IDs stored for a segment kind: 'template', 'dataschema', 'block', 'recipe' or 'artifacts'."""
+        prefix = f"{kind}/"
+        return sorted(key[len(prefix):] for key in self._entries if key.startswith(prefix))
+
+    def recipe_names(self) -> List[str]:
+        return self.ids("recipe")
+
+    def has_artifacts(self, recipe_name: str) -> bool:
+        return f"artifacts/{recipe_name}" in self._entries
+
+    # --- 按需加载 ---
+
+    def load(self, kind: str, asset_id: str) -> Any:
+        key = f"{kind}/{asset_id}"
+        if key not in self._decoded:
+            self._decoded[key] = self._read(key)
+        return self._decoded[key]
+
+    def load_recipe(self, recipe_name: str) -> CompilationTask:
+        return CompilationTask(recipe_name=recipe_name, sources=self.load("recipe", recipe_name))
+
+    def load_artifacts(self, recipe_name: str) -> Optional[CompilationArtifacts]:
+        if not self.has_artifacts(recipe_name):
+            return None
+        return CompilationArtifacts(**self.load("artifacts", recipe_name))
+
+    @property
+    def graph(self) -> DependencyGraph:
+        if self._graph is None:
+            self._graph = DependencyGraph.from_dict(self._read("graph"))
+        return self._graph
+
+    def sources_for(self, recipe_names: Iterable[str]) -> CompilationSources:
+        """The sources restricted to what the given recipes transitively reach."""
+        needed: Dict[str, set] = {key: set() for key in _KIND_KEYS.values()}
+        for recipe_name in recipe_names:
+            for key, asset_ids in self.load("deps", recipe_name).items():
+                needed[key].update(asset_ids)
+        return CompilationSources(**{
+            kind: {
+                asset_id: self.load(key, asset_id)
+                for asset_id in needed[key] if f"{key}/{asset_id}" in self._entries
+            }
+            for kind, key in _KIND_KEYS.items()
+        })
+
+    def _read(self, key: str) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            raise BundleError(bundle_path=str(self.path), reason=f"No entry '{key}' in bundle")
+        try:
+            offset, length = entry
+            start = self._data_start + offset
+            return json.loads(self._mmap[start:start + length])
+        except (ValueError, KeyError, TypeError) as e:
+            raise BundleError(bundle_path=str(self.path), reason=f"Corrupt entry '{key}': {e}") from e
@@ -0,0 +1,237 @@
+# -*- coding: utf-8 -*-
+# prism/cache.py
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from .dependencies import collect_recipe_dependencies, find_variant
+from .entities import CompilationArtifacts, CompilationSources, CompilationTask
+
+# 修改指纹的组成方式或产物的结构时需要递增, 以免命中旧的缓存
+FINGERPRINT_VERSION = "4"
+_DISK_FORMAT_VERSION = 1
+
+_MISSING = "<missing>"
+
+def content_hash(data: Any) -> str:
+    """Stable sha256 of a template string or of raw YAML/JSON data."""
+    if isinstance(data, str):
+        payload = data
+    else:
+        payload = json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class AssetFingerprinter:
+    """
+    Computes recipe fingerprints from the content hashes of the recipe and of every
+    block, variant, template and dataschema it transitively reaches.
+    Per-asset hashes are memoized, so a fingerprint costs O(recipe size).
+    `options` describes compiler settings that change the artifacts, e.g. the
+    selected IR passes, and is part of every fingerprint. So is `trusted`:
+    artifacts compiled without validation are never served to untrusted sessions.
+    """
+    def __init__(self, sources: CompilationSources, options: str = "", trusted: bool = False):
+        self._sources = sources
+        self._options = options
+        self._trusted = trusted
+        self._hashes: Dict[Tuple[str, ...], str] = {}
+        # compile_async 在 executor 线程中计算指纹, apply_changes 在事件循环线程中调用 invalidate
+        self._lock = threading.Lock()
+        # 每次 invalidate 递增; 计算期间发生过 invalidate 的哈希可能基于旧内容, 不记录
+        self._generation = 0
+
+    def invalidate(self, kind: str, asset_id: str) -> None:
+        """
+        Forget the memoized hashes of an asset whose source changed. `kind` is
+        'templates', 'dataschemas' or 'blocks'. Call it after updating the source;
+        fingerprints may be computed concurrently from other threads.
+        """
+        with self._lock:
+            self._generation += 1
+            for key in [key for key in self._hashes if key[:2] == (kind, asset_id)]:
+                del self._hashes[key]
+
+    def fingerprint(self, task: CompilationTask) -> str:
+        deps = collect_recipe_dependencies(task.sources, self._sources.blocks)
+        parts = [
+            f"prism:{FINGERPRINT_VERSION}",
+            f"options:{self._options}",
+            f"trusted:{self._trusted}",
+            f"recipe:{task.recipe_name}:{content_hash(task.sources)}",
+        ]
+        parts += [f"block:{block_id}:{self._block_hash(block_id)}" for block_id in sorted(deps.blocks)]
+        parts += [
+            f"variant:{block_id}:{variant_id}:{self._variant_hash(block_id, variant_id)}"
+            for block_id, variant_id in sorted(deps.variants)
+        ]
+        parts += [f"template:{tid}:{self._asset_hash('templates', tid)}" for tid in sorted(deps.templates)]
+        parts += [f"dataschema:{sid}:{self._asset_hash('dataschemas', sid)}" for sid in sorted(deps.dataschemas)]
+        return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+    def _memo(self, key: Tuple[str, ...], compute) -> str:
+        value = self._hashes.get(key)
+        if value is None:
+            # 哈希在锁外计算; 两个线程同时计算同一资源时结果相同
+            generation = self._generation
+            value = compute()
+            with self._lock:
+                if generation == self._generation:
+                    self._hashes[key] = value
+        return value
+
+    def _asset_hash(self, kind: str, asset_id: str) -> str:
+        def compute() -> str:
+            assets = getattr(self._sources, kind)
+            return content_hash(assets[asset_id]) if asset_id in assets else _MISSING
+        return self._memo((kind, asset_id), compute)
+
+    def _block_hash(self, block_id: str) -> str:
+        # 只对 block 自身的字段取哈希, 各个 variant 单独计算, 修改未使用的 variant 不会使缓存失效
+        def compute() -> str:
+            block_data = self._sources.blocks.get(block_id)
+            if block_data is None:
+                return _MISSING
+            if not isinstance(block_data, dict):
+                return content_hash(block_data)
+            return content_hash({key: value for key, value in block_data.items() if key != "variants"})
+        return self._memo(("blocks", block_id), compute)
+
+    def _variant_hash(self, block_id: str, variant_id: str) -> str:
+        def compute() -> str:
+            block_data = self._sources.blocks.get(block_id)
+            variant = find_variant(block_data, variant_id) if block_data is not None else None
+            return content_hash(variant) if variant is not None else _MISSING
+        return self._memo(("blocks", block_id, variant_id), compute)
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+class MemoryArtifactCache:
+    """Bounded, thread-safe LRU tier for long-running processes."""
+    def __init__(self, max_entries: int = 1024):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.stats = CacheStats()
+        self._entries: "OrderedDict[str, CompilationArtifacts]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, fingerprint: str) -> Optional[CompilationArtifacts]:
+        with self._lock:
+            artifacts = self._entries.get(fingerprint)
+            if artifacts is None:
+                self.stats.misses += 1
+                return None
+            self._entries.move_to_end(fingerprint)
+            self.stats.hits += 1
+            return artifacts
+
+    def put(self, fingerprint: str, artifacts: CompilationArtifacts) -> None:
+        with self._lock:
+            self._entries[fingerprint] = artifacts
+            self._entries.move_to_end(fingerprint)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+class DiskArtifactCache:
+    """On-disk tier, one JSON file per fingerprint, shared between processes and CLI invocations."""
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self.stats = CacheStats()
+
+    def _path(self, fingerprint: str) -> Path:
+        return self.directory / fingerprint[:2] / f"{fingerprint}.json"
+
+    def get(self, fingerprint: str) -> Optional[CompilationArtifacts]:
+        try:
+            payload = json.loads(self._path(fingerprint).read_text(encoding="utf-8"))
+            if payload.get("format") != _DISK_FORMAT_VERSION:
+                raise ValueError("stale cache format")
+            artifacts = CompilationArtifacts(**payload["artifacts"])
+        except (OSError, ValueError, KeyError, TypeError):
+            # 不存在、损坏或格式过期的条目都视为未命中
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        return artifacts
+
+    def put(self, fingerprint: str, artifacts: CompilationArtifacts) -> None:
+        path = self._path(fingerprint)
+        payload = {"format": _DISK_FORMAT_VERSION, "artifacts": asdict(artifacts)}
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # 先写临时文件再原子替换, 并发的进程不会读到半个文件
+            fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        except OSError:
+            # 缓存写入失败不应影响编译结果
+            return
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(payload, f, ensure_ascii=False)
+            os.replace(tmp_name, path)
+        except OSError:
+            Path(tmp_name).unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        for path in self.directory.glob("*/*.json"):
+            path.unlink(missing_ok=True)
+
+class ArtifactCache:
+    """
+    Two-tier artifact cache: a bounded in-memory LRU in front of an optional on-disk tier.
+    Disk hits are promoted into memory; `stats` aggregates both tiers.
+    """
+    def __init__(self, memory: Optional[MemoryArtifactCache] = None, disk: Optional[DiskArtifactCache] = None):
+        self.memory = memory if memory is not None else MemoryArtifactCache()
+        self.disk = disk
+
+    @classmethod
+    def in_directory(cls, directory: Path, max_memory_entries: int = 1024) -> "ArtifactCache":
+        return cls(memory=MemoryArtifactCache(max_memory_entries), disk=DiskArtifactCache(directory))
+
+    @property
+    def stats(self) -> CacheStats:
+        disk_hits = self.disk.stats.hits if self.disk else 0
+        misses = self.disk.stats.misses if self.disk else self.memory.stats.misses
+        return CacheStats(
+            hits=self.memory.stats.hits + disk_hits,
+            misses=misses,
+            evictions=self.memory.stats.evictions
+        )
+
+    def get(self, fingerprint: str) -> Optional[CompilationArtifacts]:
+        artifacts = self.memory.get(fingerprint)
+        if artifacts is not None or self.disk is None:
+            return artifacts
+        artifacts = self.disk.get(fingerprint)
+        if artifacts is not None:
+            self.memory.put(fingerprint, artifacts)
+        return artifacts
+
+    def put(self, fingerprint: str, artifacts: CompilationArtifacts) -> None:
+        self.memory.put(fingerprint, artifacts)
+        if self.disk is not None:
+            self.disk.put(fingerprint, artifacts)
+
+    def clear(self) -> None:
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
@@ -2,8 +2,31 @@
 
 from .defaults_merger import DefaultsMerger
 from .recipe_compiler import RecipeCompiler
+from .optimizer import (
+    dedupe_blocks,
+    fold_constants,
+    coalesce_literals,
+    prune_contract_fields,
+    normalize_whitespace,
+    optimize_ir
+)
+from .pass_manager import PASSES, DEFAULT_PASSES, PassManager, PassReport, IRSize, OptimizationResult, register_pass, summarize_reports
 
 __all__ = [
     "DefaultsMerger",
-    "RecipeCompiler"
+    "RecipeCompiler",
+    "dedupe_blocks",
+    "fold_constants",
+    "coalesce_literals",
+    "prune_contract_fields",
+    "normalize_whitespace",
+    "optimize_ir",
+    "PASSES",
+    "DEFAULT_PASSES",
+    "PassManager",
+    "PassReport",
+    "IRSize",
+    "OptimizationResult",
+    "register_pass",
+    "summarize_reports"
 ]
\ No newline at end of file
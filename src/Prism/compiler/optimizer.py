@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+# compiler/optimizer.py
+
+import json
+import re
+from typing import Dict, List, Optional, Set, Tuple
+
+import jinja2
+
+from ..analysis import analyze_template
+from ..generators.jinja_aggregator import JinjaAggregator
+from ..models.dataschema import DataschemaModel
+from ..models.ir import IRModel, ResolvedBlock, LiteralContent, RenderSequenceItem
+
+_TRAILING_SPACES = re.compile(r"[ \t]+(?=\n)")
+_BLANK_LINES = re.compile(r"\n{3,}")
+
+def fold_constants(ir: IRModel) -> IRModel:
+    """
+    Replace every ResolvedBlock whose output is known at compile time with a
+    LiteralContent holding that output. A block is folded when its template is
+    deterministic and every variable it reads has a default, i.e. it reads no
+    runtime variable. JinjaAggregator produces exactly the same text for the
+    folded IR as for the original one.
+    """
+    sequence: List[RenderSequenceItem] = []
+    for item in ir.render_sequence:
+        folded = _fold_block(item) if isinstance(item, ResolvedBlock) else None
+        sequence.append(item if folded is None else folded)
+    return ir.model_copy(update={"render_sequence": sequence})
+
+def coalesce_literals(ir: IRModel) -> IRModel:
+    """Merge adjacent LiteralContent items into one and drop empty ones."""
+    sequence: List[RenderSequenceItem] = []
+    # 连续的字面量先收集起来, 遇到 Block 或结尾时一次拼接
+    pending: List[LiteralContent] = []
+
+    def flush() -> None:
+        if len(pending) == 1:
+            sequence.append(pending[0])
+        elif pending:
+            sequence.append(LiteralContent(content="".join(item.content for item in pending)))
+        pending.clear()
+
+    for item in ir.render_sequence:
+        if isinstance(item, LiteralContent):
+            if item.content:
+                pending.append(item)
+            continue
+        flush()
+        sequence.append(item)
+    flush()
+    return ir.model_copy(update={"render_sequence": sequence})
+
+def dedupe_blocks(ir: IRModel) -> IRModel:
+    """
+    Drop every ResolvedBlock that repeats an earlier one, i.e. the same block and
+    variant with the same template and defaults imported twice. This changes the
+    prompt: the repeated text appears only once.
+    """
+    seen: Set[Tuple[str, str, str, str]] = set()
+    sequence: List[RenderSequenceItem] = []
+    for item in ir.render_sequence:
+        if isinstance(item, ResolvedBlock):
+            key = (
+                item.source_block_meta.id,
+                item.source_variant_id,
+                item.template_content,
+                json.dumps(item.merged_defaults, sort_keys=True, default=str)
+            )
+            if key in seen:
+                continue
+            seen.add(key)
+        sequence.append(item)
+    return ir.model_copy(update={"render_sequence": sequence})
+
+def prune_contract_fields(ir: IRModel) -> IRModel:
+    """
+    Remove the top-level properties of the aggregated contracts that no block
+    template reads at runtime (variables with a default are filled in at compile
+    time), and drop them from `required`. The generated model and the contracts
+    used for input validation shrink accordingly; the template is unchanged.
+    """
+    used: Set[str] = set()
+    for item in ir.render_sequence:
+        if isinstance(item, ResolvedBlock):
+            try:
+                info = analyze_template(item.template_content)
+            except jinja2.TemplateSyntaxError:
+                # 无法判断哪些字段被使用, 保持原样, 由 JinjaAggregator 报告语法错误
+                return ir
+            used.update(info.missing(item.merged_defaults.keys()))
+
+    contracts: Dict[str, DataschemaModel] = {}
+    for contract_id, contract in ir.aggregated_contracts.items():
+        properties = contract.data.get("properties")
+        if not isinstance(properties, dict) or used.issuperset(properties):
+            contracts[contract_id] = contract
+            continue
+        # 复制后修改, resolver 中缓存的 DataschemaModel 被多个 recipe 共享
+        data = dict(contract.data)
+        data["properties"] = {name: value for name, value in properties.items() if name in used}
+        if isinstance(data.get("required"), list):
+            data["required"] = [name for name in data["required"] if name in used]
+        contracts[contract_id] = contract.model_copy(update={"data": data})
+    return ir.model_copy(update={"aggregated_contracts": contracts})
+
+def normalize_whitespace(ir: IRModel) -> IRModel:
+    """
+    Strip trailing spaces and tabs from every line of the literals and collapse
+    runs of blank lines into one. Only literal segments are touched, so run it
+    after fold_constants to reach the text of static blocks.
+    """
+    sequence: List[RenderSequenceItem] = []
+    for item in ir.render_sequence:
+        if isinstance(item, LiteralContent):
+            content = _BLANK_LINES.sub("\n\n", _TRAILING_SPACES.sub("", item.content))
+            if content != item.content:
+                item = LiteralContent(content=content)
+        sequence.append(item)
+    return ir.model_copy(update={"render_sequence": sequence})
+
+def optimize_ir(ir: IRModel) -> IRModel:
+    """Constant folding followed by literal coalescing; the aggregated template is unchanged."""
+    return coalesce_literals(fold_constants(ir))
+
+def _fold_block(block: ResolvedBlock) -> Optional[LiteralContent]:
+    try:
+        info = analyze_template(block.template_content)
+        if not info.deterministic or info.missing(block.merged_defaults.keys()):
+            return None
+        # 与 JinjaAggregator 使用同一个模板缓存和渲染方式, 保证输出逐字节相同
+        cache = JinjaAggregator.template_cache()
+        if info.is_static:
+            return LiteralContent(content=cache.render_static(block.template_content))
+        return LiteralContent(content=cache.get(block.template_content).render(block.merged_defaults))
+    except jinja2.TemplateError:
+        # 语法错误或访问了未定义的属性: 保留原 Block, 由 JinjaAggregator 报告错误
+        return None
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+# compiler/pass_manager.py
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+from ..models.ir import IRModel, LiteralContent, ResolvedBlock
+from .optimizer import (
+    dedupe_blocks,
+    fold_constants,
+    coalesce_literals,
+    prune_contract_fields,
+    normalize_whitespace
+)
+
+IRPass = Callable[[IRModel], IRModel]
+
+# 所有已注册的 pass, 按执行顺序排列; PassManager 只选择其中的一部分, 不改变相对顺序
+PASSES: "OrderedDict[str, IRPass]" = OrderedDict([
+    ("dedupe_blocks", dedupe_blocks),
+    ("fold_constants", fold_constants),
+    ("coalesce_literals", coalesce_literals),
+    ("prune_contract_fields", prune_contract_fields),
+    ("normalize_whitespace", normalize_whitespace),
+])
+
+# 默认启用的 pass 不改变生成的模板和模型
+DEFAULT_PASSES = ("fold_constants", "coalesce_literals")
+
+def register_pass(name: str, ir_pass: IRPass, before: Optional[str] = None) -> None:
+    """Register an IR pass, at the end of the pass order or just before the pass `before`."""
+    if name in PASSES:
+        raise ValueError(f"An IR pass named '{name}' is already registered")
+    if before is not None and before not in PASSES:
+        raise ValueError(f"Unknown IR pass '{before}'")
+    items = list(PASSES.items())
+    index = len(items) if before is None else [key for key, _ in items].index(before)
+    items.insert(index, (name, ir_pass))
+    PASSES.clear()
+    PASSES.update(items)
+
+@dataclass(frozen=True)
+class IRSize:
+    """Size of an IR: render-sequence segments, bytes of literal and block template text, contract fields."""
+    segments: int
+    bytes: int
+    contract_fields: int
+
+    @classmethod
+    def of(cls, ir: IRModel) -> "IRSize":
+        size = 0
+        for item in ir.render_sequence:
+            if isinstance(item, LiteralContent):
+                size += len(item.content.encode('utf-8'))
+            elif isinstance(item, ResolvedBlock):
+                size += len(item.template_content.encode('utf-8'))
+        fields = 0
+        for contract in ir.aggregated_contracts.values():
+            properties = contract.data.get("properties")
+            if isinstance(properties, dict):
+                fields += len(properties)
+        return cls(segments=len(ir.render_sequence), bytes=size, contract_fields=fields)
+
+@dataclass(frozen=True)
+class PassReport:
+    """What one pass did to one IR."""
+    name: str
+    elapsed: float
+    before: IRSize
+    after: IRSize
+
+@dataclass
+class OptimizationResult:
+    ir: IRModel
+    reports: List[PassReport] = field(default_factory=list)
+
+    @property
+    def elapsed(self) -> float:
+        return sum(report.elapsed for report in self.reports)
+
+class PassManager:
+    """
+    Runs a selection of the registered IR passes, always in registration order.
+
+    `PassManager()` runs DEFAULT_PASSES; `PassManager([])` runs nothing. Use
+    `with_options` to toggle passes relative to the defaults. The selection is
+    part of the artifact-cache fingerprint (see `key`), so artifacts built with
+    different passes never share a cache entry.
+    """
+    def __init__(self, passes: Optional[Iterable[str]] = None):
+        selected = set(DEFAULT_PASSES if passes is None else passes)
+        unknown = selected.difference(PASSES)
+        if unknown:
+            raise ValueError(f"Unknown IR pass(es) {', '.join(sorted(unknown))}; available: {', '.join(PASSES)}")
+        self.passes: List[str] = [name for name in PASSES if name in selected]
+
+    @classmethod
+    def with_options(cls, enable: Sequence[str] = (), disable: Sequence[str] = ()) -> "PassManager":
+        """DEFAULT_PASSES plus `enable`, minus `disable`."""
+        unknown = set(disable).difference(PASSES)
+        if unknown:
+            raise ValueError(f"Unknown IR pass(es) {', '.join(sorted(unknown))}; available: {', '.join(PASSES)}")
+        return cls(name for name in (*DEFAULT_PASSES, *enable) if name not in disable)
+
+    @property
+    def key(self) -> str:
+        return ",".join(self.passes)
+
+    def __repr__(self) -> str:
+        return f"PassManager([{self.key}])"
+
+    def run(self, ir: IRModel, report: bool = False) -> OptimizationResult:
+        """Run the selected passes over `ir`. With `report`, each pass is timed and measured."""
+        result = OptimizationResult(ir=ir)
+        for name in self.passes:
+            ir_pass = PASSES[name]
+            if not report:
+                result.ir = ir_pass(result.ir)
+                continue
+            before = IRSize.of(result.ir)
+            start = time.perf_counter()
+            result.ir = ir_pass(result.ir)
+            elapsed = time.perf_counter() - start
+            result.reports.append(PassReport(name=name, elapsed=elapsed, before=before, after=IRSize.of(result.ir)))
+        return result
+
+def summarize_reports(results: Iterable[OptimizationResult]) -> Dict[str, PassReport]:
+    """Per-pass totals over many IRs, e.g. a whole project, in pass order."""
+    totals: Dict[str, List[float]] = {}
+    for result in results:
+        for report in result.reports:
+            row = totals.setdefault(report.name, [0.0] * 7)
+            row[0] += report.elapsed
+            for index, value in enumerate((
+                report.before.segments, report.before.bytes, report.before.contract_fields,
+                report.after.segments, report.after.bytes, report.after.contract_fields
+            ), start=1):
+                row[index] += value
+    return {
+        name: PassReport(
+            name=name,
+            elapsed=row[0],
+            before=IRSize(segments=int(row[1]), bytes=int(row[2]), contract_fields=int(row[3])),
+            after=IRSize(segments=int(row[4]), bytes=int(row[5]), contract_fields=int(row[6]))
+        )
+        for name, row in totals.items()
+    }
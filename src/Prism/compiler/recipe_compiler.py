@@ -52,17 +52,19 @@ class RecipeCompiler:
         """ resolve and compile all imports defined in the Recipe into a flat map. """
         resolved_map: Dict[str, CompiledImport] = {}
 
-        for import_key, import_value in recipe.imports.model_dump(exclude_none=True).items():
+        # 直接遍历已构建好的 ImportRef, 不再经 model_dump 转成字典后重新校验
+        for import_key in type(recipe.imports).model_fields:
+            import_value = getattr(recipe.imports, import_key)
+            if import_value is None:
+                continue
             if isinstance(import_value, list): # 多例 例如 tasks, rules
-                for i, item in enumerate(import_value):
+                for i, import_ref in enumerate(import_value):
                     ref_str = f"{import_key}[{i}]"
-                    import_ref = ImportRef(**item)
                     # 编译 ImportRef 为 CompiledImport
                     resolved_map[ref_str] = self._compile_single_import(ref_str, import_ref)
             else: # 单例 例如 persona, output_spec
                 ref_str = import_key
-                import_ref = ImportRef(**import_value)
-                resolved_map[ref_str] = self._compile_single_import(ref_str, import_ref)
+                resolved_map[ref_str] = self._compile_single_import(ref_str, import_value)
         return resolved_map
 
     def _compile_single_import(self, source_ref: str, import_ref: ImportRef) -> CompiledImport:
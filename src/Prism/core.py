@@ -1,6 +1,11 @@
 # prism/core.py
 
+import asyncio
+import logging
+from concurrent.futures import Executor
 from dataclasses import dataclass
+from functools import partial
+from typing import Any, Dict, Optional
 from .models.dataschema import DataschemaModel
 from .models.block import BlockModel
 from .models.ir import IRModel
@@ -8,6 +13,7 @@ from .models.recipe import RecipeModel
 
 from .resolvers.register import ResolverRegister
 from .compiler.recipe_compiler import RecipeCompiler
+from .compiler.pass_manager import PassManager
 from .generators.jinja_aggregator import JinjaAggregator
 from .generators.pydantic_generator import PydanticGenerator
 from .entities import CompilationSources, CompilationArtifacts, CompilationTask
@@ -20,8 +26,78 @@ from .schemas.schema_validator import (
     validate_recipe_file
 )
 
-def _build_resolver_from_sources(sources: CompilationSources) -> ResolverRegister:
-    print("Validating blocks and dataschemas...")
+logger = logging.getLogger(__name__)
+
+# trusted=True: 输入已经通过校验 (例如来自 bundle 或 `prism validate`), 跳过 jsonschema
+# 与 Pydantic 的双重校验, 直接用 model_construct 构建模型; ID 检查开销很小, 始终保留
+
+def _build_dataschema_model(schema_id: str, data: Dict[str, Any], trusted: bool = False) -> DataschemaModel:
+    if trusted:
+        schema_model = DataschemaModel.from_trusted(data)
+    else:
+        validate_dataschema_file(schema_id, data)
+        schema_model = DataschemaModel(**data)
+
+    if schema_model.id != schema_id:
+        raise ModelIDMismatchError(
+            model_type="Dataschema",
+            file_id=schema_id,
+            content_id=schema_model.id
+        )
+    return schema_model
+
+def _build_block_model(block_id: str, data: Dict[str, Any], trusted: bool = False) -> BlockModel:
+    if trusted:
+        block_model = BlockModel.from_trusted(data)
+    else:
+        validate_block_file(block_id, data)
+        block_model = BlockModel(**data)
+
+    if block_model.id != block_id:
+        raise ModelIDMismatchError(
+            model_type="Block",
+            file_id=block_id,
+            content_id=block_model.id
+        )
+    return block_model
+
+def _build_lazy_resolver_from_sources(sources: CompilationSources, trusted: bool = False) -> ResolverRegister:
+    """
+    Register factories only; each asset is validated and built the first time it is resolved.
+    Only the IDs are enumerated here, so lazy mappings (see `LazyMapping`) load nothing up front.
+    """
+    resolver = ResolverRegister()
+    for template_id in sources.templates:
+        resolver.register_template_factory(template_id, partial(sources.templates.__getitem__, template_id))
+    for schema_id in sources.dataschemas:
+        resolver.register_dataschema_factory(schema_id, partial(_build_dataschema_model_from, sources, schema_id, trusted))
+    for block_id in sources.blocks:
+        resolver.register_block_factory(block_id, partial(_build_block_model_from, sources, block_id, trusted))
+    return resolver
+
+def _build_dataschema_model_from(sources: CompilationSources, schema_id: str, trusted: bool) -> DataschemaModel:
+    return _build_dataschema_model(schema_id, sources.dataschemas[schema_id], trusted)
+
+def _build_block_model_from(sources: CompilationSources, block_id: str, trusted: bool) -> BlockModel:
+    return _build_block_model(block_id, sources.blocks[block_id], trusted)
+
+def _build_trusted_resolver_from_sources(sources: CompilationSources) -> ResolverRegister:
+    resolver = ResolverRegister()
+    for template_id, content in sources.templates.items():
+        resolver.register_template(template_id, content)
+    for schema_id, data in sources.dataschemas.items():
+        resolver.register_dataschema(_build_dataschema_model(schema_id, data, trusted=True))
+    for block_id, data in sources.blocks.items():
+        resolver.register_block(_build_block_model(block_id, data, trusted=True))
+    return resolver
+
+def _build_resolver_from_sources(sources: CompilationSources, lazy: bool = False, trusted: bool = False) -> ResolverRegister:
+    if lazy:
+        return _build_lazy_resolver_from_sources(sources, trusted=trusted)
+    if trusted:
+        return _build_trusted_resolver_from_sources(sources)
+
+    logger.info("Validating blocks and dataschemas...")
     # 1. 验证输入数据
     for block_id, block_data in sources.blocks.items():
         validate_block_file(block_id,block_data)
@@ -29,7 +105,7 @@ def _build_resolver_from_sources(sources: CompilationSources) -> ResolverRegiste
         validate_dataschema_file(schema_id, schema_data)
     resolver = ResolverRegister()
 
-    print("Registering templates, dataschemas, and blocks...")
+    logger.info("Registering templates, dataschemas, and blocks...")
     # 2. 注册模板
     for template_id, content in sources.templates.items():
         resolver.register_template(template_id, content)
@@ -57,20 +133,70 @@ def _build_resolver_from_sources(sources: CompilationSources) -> ResolverRegiste
                 content_id=block_model.id
             )
         resolver.register_block(block_model)
-    print("Done.")
+    logger.info("Done.")
     return resolver
 
-def compile_recipe_to_artifacts(recipe: CompilationTask, sources: CompilationSources) -> CompilationArtifacts:
-    validate_recipe_file(recipe.recipe_name, recipe.sources)
-    resolver = _build_resolver_from_sources(sources)
-    recipe_model = RecipeModel(**recipe.sources)
+def _compile_ir_with_resolver(recipe: CompilationTask, resolver: ResolverRegister, trusted: bool = False) -> IRModel:
+    # recipe 的原始数据需要由调用方先行校验
+    recipe_model = RecipeModel.from_trusted(recipe.sources) if trusted else RecipeModel(**recipe.sources)
     compiler = RecipeCompiler(resolver)
+    return compiler.compile(recipe_model)
+
+# 未指定 passes 时使用的默认 pass 选择 (DEFAULT_PASSES), 不改变生成的产物
+_DEFAULT_PASS_MANAGER = PassManager()
 
-    ir : IRModel = compiler.compile(recipe_model)
-    
+def compile_ir_to_artifacts(ir: IRModel, passes: Optional[PassManager] = None) -> CompilationArtifacts:
+    """
+    Run only the back-end generators on an already compiled IR, e.g. one loaded from a snapshot.
+    The IR is transformed by `passes` first (DEFAULT_PASSES if None, `PassManager([])` for none).
+    """
+    ir = (passes or _DEFAULT_PASS_MANAGER).run(ir).ir
     jinja = JinjaAggregator.aggregate(ir)
     pydantic = PydanticGenerator.generate(ir)
     return CompilationArtifacts(
         template_content=jinja,
-        model_code=pydantic
+        model_code=pydantic,
+        contracts={contract_id: contract.data for contract_id, contract in ir.aggregated_contracts.items()}
     )
+
+def _compile_with_resolver(
+    recipe: CompilationTask,
+    resolver: ResolverRegister,
+    trusted: bool = False,
+    passes: Optional[PassManager] = None
+) -> CompilationArtifacts:
+    ir : IRModel = _compile_ir_with_resolver(recipe, resolver, trusted=trusted)
+    return compile_ir_to_artifacts(ir, passes=passes)
+
+def compile_recipe_to_artifacts(
+    recipe: CompilationTask,
+    sources: CompilationSources,
+    lazy: bool = False,
+    trusted: bool = False,
+    passes: Optional[PassManager] = None
+) -> CompilationArtifacts:
+    """
+    Compile one recipe. With `trusted=True` the recipe and sources are assumed to be
+    valid already and models are built without schema or Pydantic validation;
+    invalid input then fails with arbitrary errors or produces wrong output.
+    `passes` selects the IR passes run before the generators.
+    """
+    if not trusted:
+        validate_recipe_file(recipe.recipe_name, recipe.sources)
+    resolver = _build_resolver_from_sources(sources, lazy=lazy, trusted=trusted)
+    return _compile_with_resolver(recipe, resolver, trusted=trusted, passes=passes)
+
+async def compile_recipe_to_artifacts_async(
+    recipe: CompilationTask,
+    sources: CompilationSources,
+    lazy: bool = False,
+    executor: Optional[Executor] = None,
+    trusted: bool = False,
+    passes: Optional[PassManager] = None
+) -> CompilationArtifacts:
+    """
+    Awaitable variant of `compile_recipe_to_artifacts` that runs the compilation in
+    `executor` (the event loop's default executor if None) instead of blocking the loop.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, partial(compile_recipe_to_artifacts, recipe, sources, lazy=lazy, trusted=trusted, passes=passes))
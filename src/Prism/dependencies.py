@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+# prism/dependencies.py
+
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Iterator, Mapping, Optional, Tuple
+
+@dataclass(frozen=True)
+class RecipeDependencies:
+    """The assets a recipe transitively reaches through its imports."""
+    blocks: FrozenSet[str]
+    variants: FrozenSet[Tuple[str, str]]
+    templates: FrozenSet[str]
+    dataschemas: FrozenSet[str]
+
+def iter_import_refs(recipe_data: Mapping[str, Any]) -> Iterator[Tuple[str, str]]:
+    """Yield (block_id, variant_id) for every import of a raw recipe, skipping malformed entries."""
+    imports = recipe_data.get("imports") if isinstance(recipe_data, Mapping) else None
+    if not isinstance(imports, Mapping):
+        return
+    for import_value in imports.values():
+        items = import_value if isinstance(import_value, list) else [import_value]
+        for item in items:
+            if isinstance(item, Mapping) and isinstance(item.get("block_id"), str) and isinstance(item.get("variant_id"), str):
+                yield item["block_id"], item["variant_id"]
+
+def find_variant(block_data: Mapping[str, Any], variant_id: str) -> Optional[Dict[str, Any]]:
+    """Return the raw variant with the given id from a raw block, if present."""
+    variants = block_data.get("variants") if isinstance(block_data, Mapping) else None
+    if not isinstance(variants, list):
+        return None
+    for variant in variants:
+        if isinstance(variant, dict) and variant.get("id") == variant_id:
+            return variant
+    return None
+
+def collect_recipe_dependencies(recipe_data: Mapping[str, Any], blocks: Mapping[str, Mapping[str, Any]]) -> RecipeDependencies:
+    """
+    Walk a raw recipe's imports through the raw blocks to find every block, variant,
+    template and dataschema it reaches. Works on unvalidated data: references that
+    cannot be followed are recorded as far as they go and otherwise ignored, so that
+    the compiler remains the single place that reports them.
+    """
+    block_ids = set()
+    variants = set()
+    templates = set()
+    dataschemas = set()
+
+    for block_id, variant_id in iter_import_refs(recipe_data):
+        block_ids.add(block_id)
+        variants.add((block_id, variant_id))
+        block_data = blocks.get(block_id)
+        if block_data is None:
+            continue
+        variant = find_variant(block_data, variant_id)
+        if variant is None:
+            continue
+        if isinstance(variant.get("template_id"), str):
+            templates.add(variant["template_id"])
+        if isinstance(variant.get("contract_id"), str):
+            dataschemas.add(variant["contract_id"])
+
+    return RecipeDependencies(
+        blocks=frozenset(block_ids),
+        variants=frozenset(variants),
+        templates=frozenset(templates),
+        dataschemas=frozenset(dataschemas)
+    )
@@ -1,19 +1,23 @@
 # prism/entities.py
 
 from dataclasses import dataclass, field
-from typing import Dict, Any, Optional
+from typing import Dict, Any, MutableMapping, Optional
 
 @dataclass(frozen=True)
 class CompilationSources:
-    """Data container for holding raw compilation sources."""
+    """
+    Data container for holding raw compilation sources.
+    Each field may be a plain dict or any mutable mapping, such as a `LazyMapping`
+    that reads an asset only when it is first looked up.
+    """
     # Key: template_id (通常是文件名), Value: 模板文件内容
-    templates: Dict[str, str] = field(default_factory=dict)
+    templates: MutableMapping[str, str] = field(default_factory=dict)
     
     # Key: dataschema_id, Value: 从 YAML 加载的原生 dict
-    dataschemas: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    dataschemas: MutableMapping[str, Dict[str, Any]] = field(default_factory=dict)
     
     # Key: block_id, Value: 从 YAML 加载的原生 dict
-    blocks: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    blocks: MutableMapping[str, Dict[str, Any]] = field(default_factory=dict)
 
 @dataclass(frozen=True)
 class CompilationTask:
@@ -25,4 +29,32 @@ class CompilationTask:
 class CompilationArtifacts:
     """Data container for holding compilation results."""
     template_content: str
-    model_code: Optional[str] = None
\ No newline at end of file
+    model_code: Optional[str] = None
+    # Key: contract ID, Value: 该 contract 的 JSON Schema, 供运行时校验输入数据
+    contracts: Optional[Dict[str, Dict[str, Any]]] = None
+
+@dataclass(frozen=True)
+class CompilationResult:
+    """Data container for the outcome of one recipe in a batch compilation."""
+    recipe_name: str
+    artifacts: Optional[CompilationArtifacts] = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass(frozen=True)
+class SourceChanges:
+    """
+    Data container for incremental updates to a project.
+    Each mapping holds the new content of changed assets; a value of None marks the asset as removed.
+    """
+    templates: Dict[str, Optional[str]] = field(default_factory=dict)
+    dataschemas: Dict[str, Optional[Dict[str, Any]]] = field(default_factory=dict)
+    blocks: Dict[str, Optional[Dict[str, Any]]] = field(default_factory=dict)
+    recipes: Dict[str, Optional[Dict[str, Any]]] = field(default_factory=dict)
+
+    def __bool__(self) -> bool:
+        return bool(self.templates or self.dataschemas or self.blocks or self.recipes)
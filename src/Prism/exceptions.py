@@ -19,6 +19,15 @@ class PrismError(Exception):
             )
             output += f"\n[Context]:\n{context_str}"
         return output
+
+    def __reduce__(self):
+        # 子类的 __init__ 签名各不相同, 跨进程传递时绕过 __init__ 直接恢复状态
+        return (_restore_error, (self.__class__, self.message, self.context))
+
+def _restore_error(cls: type, message: str, context: Dict[str, Any]) -> "PrismError":
+    error = cls.__new__(cls)
+    PrismError.__init__(error, message, context)
+    return error
     
 class TemplatedPrismError(PrismError):
     message_template: str = "An unspecified error occurred"
@@ -53,13 +62,14 @@ class AssetValidationError(TemplatedPrismError):
         "Found {error_count} error(s):\n- {error_details}"
     )
 
-    def __init__(self, asset_file_name: str, errors: List[str]):
+    def __init__(self, asset_file_name: str, errors: List[str], identifier: Optional[str] = None):
         error_details = "\n- ".join(errors)
         super().__init__(
             asset_file_name=asset_file_name,
             errors=errors,
             error_count=len(errors),
-            error_details=error_details
+            error_details=error_details,
+            identifier=identifier
         )
 
 class ModelError(PrismError):
@@ -121,4 +131,34 @@ class RecipePropertyError(TemplatedPrismError):
 class GenerationError(PrismError):
     message_template = "Generation error: {message}"
     def __init__(self, message: str):
-        super().__init__(message=message)
\ No newline at end of file
+        super().__init__(message=message)
+
+class SnapshotError(TemplatedPrismError):
+    message_template = "Could not load snapshot '{source}'. Reason: {reason}"
+    def __init__(self, source: str, reason: str):
+        super().__init__(source=source, reason=reason)
+
+class BundleError(TemplatedPrismError):
+    message_template = "Could not read or write bundle '{bundle_path}'. Reason: {reason}"
+    def __init__(self, bundle_path: str, reason: str):
+        super().__init__(bundle_path=bundle_path, reason=reason)
+
+class TemplateValidationError(TemplatedPrismError):
+    message_template = "Syntax error in template '{template_id}' at line {line}: {reason}"
+    def __init__(self, template_id: str, line: int, reason: str):
+        super().__init__(template_id=template_id, line=line, reason=reason)
+
+class StoreError(TemplatedPrismError):
+    message_template = "Asset store '{store}' failed. Reason: {reason}"
+    def __init__(self, store: str, reason: str):
+        super().__init__(store=store, reason=reason)
+
+class RenderError(TemplatedPrismError):
+    message_template = "Could not render prompt '{prompt}'. Reason: {reason}"
+    def __init__(self, prompt: str, reason: str, errors: Optional[List[str]] = None):
+        super().__init__(prompt=prompt, reason=reason, errors=errors or [])
+
+class DatasetError(TemplatedPrismError):
+    message_template = "Invalid dataset '{source}' at line {line}. Reason: {reason}"
+    def __init__(self, source: str, line: int, reason: str):
+        super().__init__(source=source, line=line, reason=reason)
@@ -1,10 +1,11 @@
 # Prism/generators/__init__.py
 
 
-from .jinja_aggregator import JinjaAggregator
+from .jinja_aggregator import JinjaAggregator, TemplateCache
 from .pydantic_generator import PydanticGenerator
 
 __all__ = [
     "JinjaAggregator",
+    "TemplateCache",
     "PydanticGenerator"
 ]
@@ -1,49 +1,182 @@
 # -*- coding: utf-8 -*-
 # generators/jinja_aggregator.py
 
+import hashlib
+import threading
+from collections import OrderedDict
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
 import jinja2
-from jinja2 import Environment, StrictUndefined
-from typing import Set
+from jinja2 import Environment, FileSystemBytecodeCache, StrictUndefined, Template
 
+from ..analysis import analyze_template
+from ..cache import CacheStats
 from ..models.ir import IRModel, ResolvedBlock, LiteralContent
 from ..exceptions import GenerationError
 
+# 当前这次 aggregate 的运行时变量; 使用 ContextVar, 多线程或多个协程并发编译时互不干扰
+_RUNTIME_VARS: ContextVar[FrozenSet[str]] = ContextVar("prism_runtime_vars", default=frozenset())
+
+class PreserveRuntimeUndefined(StrictUndefined):
+    """ Self-defined Undefined that preserves runtime variables """
+    def __str__(self):
+        if self._undefined_name in _RUNTIME_VARS.get():
+            return f"{{{{ {self._undefined_name} }}}}"
+        # 如果不是运行时变量，StrictUndefined 的基类实现会负责抛出异常
+        return super().__str__()
+
+class TemplateCache:
+    """
+    Bounded, thread-safe LRU of compiled block templates keyed by the sha256 of their
+    source. Templates are compiled in one shared environment; runtime variables only
+    matter at render time, so a compiled template serves every recipe. With a
+    bytecode cache the generated Python code is also reused across processes.
+    """
+    def __init__(self, max_entries: int = 512, bytecode_cache: Optional[jinja2.BytecodeCache] = None):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.stats = CacheStats()
+        # 模板不经过 loader 加载, 关闭 Jinja 自带的缓存, 由这里统一管理
+        self.env = Environment(undefined=PreserveRuntimeUndefined, cache_size=0, bytecode_cache=bytecode_cache)
+        self._templates: "OrderedDict[str, Template]" = OrderedDict()
+        # 静态模板 (不读取任何变量且输出确定) 的渲染结果, 随对应模板一起淘汰
+        self._static_outputs: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._templates)
+
+    def get(self, source: str) -> Template:
+        return self._get(self._key(source), source)
+
+    def render_static(self, source: str) -> str:
+        """Render a template whose output does not depend on its context, reusing the previous output."""
+        key = self._key(source)
+        output = self._static_outputs.get(key)
+        if output is None:
+            output = self._get(key, source).render()
+            with self._lock:
+                if key in self._templates:
+                    self._static_outputs[key] = output
+        else:
+            with self._lock:
+                self.stats.hits += 1
+        return output
+
+    @staticmethod
+    def _key(source: str) -> str:
+        return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+    def _get(self, key: str, source: str) -> Template:
+        with self._lock:
+            template = self._templates.get(key)
+            if template is not None:
+                self._templates.move_to_end(key)
+                self.stats.hits += 1
+                return template
+            self.stats.misses += 1
+
+        # 解析与代码生成在锁外进行; 两个线程同时编译同一模板时结果相同, 后写入的覆盖先写入的
+        template = self._compile(key, source)
+        with self._lock:
+            self._templates[key] = template
+            self._templates.move_to_end(key)
+            while len(self._templates) > self.max_entries:
+                evicted, _ = self._templates.popitem(last=False)
+                self._static_outputs.pop(evicted, None)
+                self.stats.evictions += 1
+        return template
+
+    def clear(self) -> None:
+        with self._lock:
+            self._templates.clear()
+            self._static_outputs.clear()
+
+    def _compile(self, key: str, source: str) -> Template:
+        # 与 jinja2.BaseLoader.load 相同的流程, 以内容哈希作为字节码缓存的键
+        bcc = self.env.bytecode_cache
+        bucket = bcc.get_bucket(self.env, key, None, source) if bcc is not None else None
+        code = bucket.code if bucket is not None else None
+        if code is None:
+            code = self.env.compile(source)
+            if bucket is not None:
+                bucket.code = code
+                bcc.set_bucket(bucket)  # type: ignore[union-attr]
+        return self.env.template_class.from_code(self.env, code, self.env.make_globals(None), None)
+
+_template_cache = TemplateCache()
+
 class JinjaAggregator:
     @staticmethod
     def aggregate(ir: IRModel) -> str:
         """ Aggregate and partially render Jinja templates based on the IR's render sequence. """
         final_template_parts = []
-        
-        # 步骤 1: 收集所有已知的运行时变量名
+
+        # 步骤 1: 收集所有已知的运行时变量名, 渲染期间由 PreserveRuntimeUndefined 读取
         runtime_vars = JinjaAggregator._collect_runtime_vars(ir)
+        token = _RUNTIME_VARS.set(frozenset(runtime_vars))
+
+        # 步骤 2: 遍历渲染序列并处理每一项
+        # 未定义变量不在第一处出错时中止, 而是收集整个 recipe 中的全部问题后一起报告
+        undefined: List[Tuple[str, List[str]]] = []
+        try:
+            for item in ir.render_sequence:
+                if isinstance(item, LiteralContent):
+                    final_template_parts.append(item.content)
+
+                elif isinstance(item, ResolvedBlock):
+                    try:
+                        # 静态分析每个模板只做一次, 结果按模板内容缓存
+                        info = analyze_template(item.template_content)
+                        if info.is_static:
+                            final_template_parts.append(_template_cache.render_static(item.template_content))
+                            continue
+                        template = _template_cache.get(item.template_content)
+                        partially_rendered_content = template.render(item.merged_defaults)
+                        final_template_parts.append(partially_rendered_content)
+                    except jinja2.exceptions.UndefinedError as e:
+                        # 静态分析给出该 Block 缺少的全部变量; 只有访问属性或下标等情况才需要用异常信息
+                        missing = sorted(info.missing(item.merged_defaults.keys() | runtime_vars))
+                        undefined.append((item.source_ref, [f"'{name}' is undefined" for name in missing] or [e.message or str(e)]))
+                    except jinja2.exceptions.TemplateSyntaxError as e:
+                        error_message = (
+                            f"Syntax error in Jinja template of Block '{item.source_ref}' at line {e.lineno}: {e.message}"
+                        )
+                        raise GenerationError(error_message) from e
+        finally:
+            _RUNTIME_VARS.reset(token)
+
+        if undefined:
+            details = "; ".join(f"Block '{source_ref}': {', '.join(problems)}" for source_ref, problems in undefined)
+            error_message = (
+                f"Undefined variable found while processing {details}. "
+                f"Please ensure all non-runtime variables are defined in the block/variant 'defaults'."
+            )
+            raise GenerationError(error_message)
 
-        # 步骤 2: 创建一个特殊的 Jinja 环境，用于处理部分渲染
-        env = JinjaAggregator._create_partial_render_env(runtime_vars)
-
-        # 步骤 3: 遍历渲染序列并处理每一项
-        for item in ir.render_sequence:
-            if isinstance(item, LiteralContent):
-                final_template_parts.append(item.content)
-            
-            elif isinstance(item, ResolvedBlock):
-                try:
-                    template = env.from_string(item.template_content)
-                    partially_rendered_content = template.render(item.merged_defaults)
-                    final_template_parts.append(partially_rendered_content)
-                except jinja2.exceptions.UndefinedError as e:
-                    error_message = (
-                        f"Undefined variable found while processing Block '{item.source_ref}': {e.message}. "
-                        f"Please ensure all non-runtime variables are defined in the block/variant 'defaults'."
-                    )
-                    raise GenerationError(error_message) from e
-                except jinja2.exceptions.TemplateSyntaxError as e:
-                    error_message = (
-                        f"Syntax error in Jinja template of Block '{item.source_ref}' at line {e.lineno}: {e.message}"
-                    )
-                    raise GenerationError(error_message) from e
-        
         return "".join(final_template_parts)
 
+    @staticmethod
+    def configure(max_templates: int = 512, bytecode_cache_dir: Optional[Path] = None) -> TemplateCache:
+        """
+        Replace the process-wide template cache, e.g. to change its size or to keep
+        Jinja bytecode in `bytecode_cache_dir` across runs. Returns the new cache.
+        """
+        global _template_cache
+        bytecode_cache = None
+        if bytecode_cache_dir is not None:
+            Path(bytecode_cache_dir).mkdir(parents=True, exist_ok=True)
+            bytecode_cache = FileSystemBytecodeCache(str(bytecode_cache_dir))
+        _template_cache = TemplateCache(max_entries=max_templates, bytecode_cache=bytecode_cache)
+        return _template_cache
+
+    @staticmethod
+    def template_cache() -> TemplateCache:
+        return _template_cache
+
     @staticmethod
     def _collect_runtime_vars(ir: IRModel) -> Set[str]:
         """Collect all runtime variable names from the aggregated contracts in the IR."""
@@ -53,17 +186,3 @@ class JinjaAggregator:
             if isinstance(properties, dict):
                 runtime_vars.update(properties.keys())
         return runtime_vars
-
-    @staticmethod
-    def _create_partial_render_env(runtime_vars: Set[str]) -> Environment:
-        """Create a Jinja environment that preserves placeholders for runtime variables."""
-
-        class PreserveRuntimeUndefined(StrictUndefined):
-            """ Self-defined Undefined that preserves runtime variables """
-            def __str__(self):
-                if self._undefined_name in runtime_vars:
-                    return f"{{{{ {self._undefined_name} }}}}"
-                # 如果不是运行时变量，StrictUndefined 的基类实现会负责抛出异常
-                return super().__str__()
-
-        return Environment(undefined=PreserveRuntimeUndefined)
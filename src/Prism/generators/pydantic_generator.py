@@ -53,9 +53,10 @@ class PydanticGenerator:
                     f"Failed to generate model for contract '{contract.id}': {e}"
                 ) from e
             
-        file_header = f"""# -*- coding: utf-8 -*-
-                    # Auto-generated by Prism
-                    # Source Recipe: {ir.source_recipe_meta.id}
-                    """
+        file_header = (
+            "# -*- coding: utf-8 -*-\n"
+            "# Auto-generated by Prism\n"
+            f"# Source Recipe: {ir.source_recipe_meta.id}\n"
+        )
         full_content = file_header + "\n\n\n".join(model_definitions)
         return full_content
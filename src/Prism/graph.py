@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+# prism/graph.py
+
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+from .dependencies import iter_import_refs
+from .entities import CompilationSources
+
+# 节点: (类型, ID). 类型为 'template' / 'dataschema' / 'block' / 'variant' / 'recipe',
+# variant 的 ID 形如 'block_id:variant_id'
+Node = Tuple[str, str]
+
+NODE_KINDS = ('template', 'dataschema', 'block', 'variant', 'recipe')
+
+def variant_node(block_id: str, variant_id: str) -> Node:
+    return ('variant', f"{block_id}:{variant_id}")
+
+class DependencyGraph:
+    """
+    Project-wide dependency index over the raw sources.
+
+    Edges point from an asset to what it depends on:
+    recipe -> block, recipe -> variant, variant -> block / template / dataschema.
+    Forward queries answer "what does this recipe reach", reverse queries answer
+    "which recipes are affected if this file changes". The graph is built in one
+    linear pass over the sources and can be updated one block or recipe at a time.
+    """
+    def __init__(self) -> None:
+        self._forward: Dict[Node, Set[Node]] = {}
+        self._reverse: Dict[Node, Set[Node]] = {}
+        self._nodes: Set[Node] = set()
+
+    @classmethod
+    def build(cls, sources: CompilationSources, recipes: Mapping[str, Mapping[str, Any]]) -> "DependencyGraph":
+        """Build the graph from the sources and raw recipe data keyed by recipe name."""
+        graph = cls()
+        for template_id in sources.templates:
+            graph._nodes.add(('template', template_id))
+        for schema_id in sources.dataschemas:
+            graph._nodes.add(('dataschema', schema_id))
+        for block_id, block_data in sources.blocks.items():
+            graph.set_block(block_id, block_data)
+        for recipe_name, recipe_data in recipes.items():
+            graph.set_recipe(recipe_name, recipe_data)
+        return graph
+
+    # --- incremental updates ---
+
+    def set_block(self, block_id: str, block_data: Mapping[str, Any]) -> None:
+        """Add or replace a block and the edges of its variants."""
+        self.remove_block(block_id)
+        block = ('block', block_id)
+        self._nodes.add(block)
+        variants = block_data.get("variants") if isinstance(block_data, Mapping) else None
+        for variant in variants if isinstance(variants, list) else []:
+            if not isinstance(variant, Mapping) or not isinstance(variant.get("id"), str):
+                continue
+            node = variant_node(block_id, variant["id"])
+            self._nodes.add(node)
+            self._add_edge(node, block)
+            if isinstance(variant.get("template_id"), str):
+                self._add_edge(node, ('template', variant["template_id"]))
+            if isinstance(variant.get("contract_id"), str):
+                self._add_edge(node, ('dataschema', variant["contract_id"]))
+
+    def remove_block(self, block_id: str) -> None:
+        block = ('block', block_id)
+        for node in [n for n in self._reverse.get(block, set()) if n[0] == 'variant']:
+            self._remove_node(node)
+        # recipe -> block 的边保留, 以便重新添加该 block 时能找到受影响的 recipe
+        self._nodes.discard(block)
+
+    def set_recipe(self, recipe_name: str, recipe_data: Mapping[str, Any]) -> None:
+        """Add or replace a recipe and its import edges."""
+        self.remove_recipe(recipe_name)
+        recipe = ('recipe', recipe_name)
+        self._nodes.add(recipe)
+        for block_id, variant_id in iter_import_refs(recipe_data):
+            self._add_edge(recipe, ('block', block_id))
+            self._add_edge(recipe, variant_node(block_id, variant_id))
+
+    def remove_recipe(self, recipe_name: str) -> None:
+        self._remove_node(('recipe', recipe_name))
+
+    def add_asset(self, kind: str, asset_id: str) -> None:
+        """Register a template or dataschema node."""
+        self._nodes.add((kind, asset_id))
+
+    def remove_asset(self, kind: str, asset_id: str) -> None:
+        # 引用它的边保留, 以便重新添加时能找到受影响的 recipe
+        self._nodes.discard((kind, asset_id))
+
+    # --- queries ---
+
+    def __contains__(self, node: Node) -> bool:
+        return node in self._nodes
+
+    def nodes(self, kind: Optional[str] = None) -> List[Node]:
+        return sorted(n for n in self._nodes if kind is None or n[0] == kind)
+
+    def direct_dependencies(self, node: Node) -> Set[Node]:
+        return set(self._forward.get(node, set()))
+
+    def direct_dependents(self, node: Node) -> Set[Node]:
+        return set(self._reverse.get(node, set()))
+
+    def dependencies(self, node: Node) -> Set[Node]:
+        """Every node transitively reached from `node`."""
+        return self._walk([node], self._forward)
+
+    def dependents(self, node: Node) -> Set[Node]:
+        """Every node that transitively depends on `node`."""
+        return self._walk([node], self._reverse)
+
+    def recipe_dependencies(self, recipe_name: str, kind: Optional[str] = None) -> Set[str]:
+        """IDs of the assets a recipe reaches, optionally restricted to one node kind."""
+        return {
+            asset_id for asset_kind, asset_id in self.dependencies(('recipe', recipe_name))
+            if kind is None or asset_kind == kind
+        }
+
+    def affected_recipes(self, nodes: Iterable[Node]) -> Set[str]:
+        """Names of the recipes affected by a change to any of `nodes`, including changed recipes themselves."""
+        nodes = list(nodes)
+        affected = self._walk(nodes, self._reverse) | set(nodes)
+        return {asset_id for kind, asset_id in affected if kind == 'recipe'}
+
+    # --- persistence ---
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "nodes": [list(n) for n in sorted(self._nodes)],
+            "edges": [[list(src), list(dst)] for src in sorted(self._forward) for dst in sorted(self._forward[src])],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "DependencyGraph":
+        graph = cls()
+        for kind, asset_id in data.get("nodes", []):
+            graph._nodes.add((kind, asset_id))
+        for src, dst in data.get("edges", []):
+            graph._add_edge((src[0], src[1]), (dst[0], dst[1]))
+        return graph
+
+    # --- internals ---
+
+    def _add_edge(self, src: Node, dst: Node) -> None:
+        self._forward.setdefault(src, set()).add(dst)
+        self._reverse.setdefault(dst, set()).add(src)
+
+    def _remove_node(self, node: Node) -> None:
+        """Remove a node together with its outgoing edges."""
+        for dst in self._forward.pop(node, set()):
+            sources = self._reverse.get(dst)
+            if sources is not None:
+                sources.discard(node)
+                if not sources:
+                    del self._reverse[dst]
+        self._nodes.discard(node)
+
+    @staticmethod
+    def _walk(start: List[Node], edges: Dict[Node, Set[Node]]) -> Set[Node]:
+        seen: Set[Node] = set()
+        stack = list(start)
+        while stack:
+            for nxt in edges.get(stack.pop(), ()):
+                if nxt not in seen:
+                    seen.add(nxt)
+                    stack.append(nxt)
+        return seen
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+# prism/lazy.py
+
+from typing import Callable, Dict, Iterator, Mapping, MutableMapping, TypeVar
+
+V = TypeVar("V")
+
+class LazyMapping(MutableMapping[str, V]):
+    """
+    A mapping whose keys are known up front but whose values are produced on first
+    access, e.g. by reading and parsing one file. Values are memoized.
+
+    It can stand in for any of the dicts of `CompilationSources`: with a lazy
+    CompilationSession only the assets a recipe actually resolves are ever loaded.
+    Iterating over keys is free; iterating over values or items loads everything.
+    Errors raised by a loader propagate to the caller and the value is retried on
+    the next access.
+    """
+    def __init__(self, loaders: Mapping[str, Callable[[], V]]):
+        self._loaders: Dict[str, Callable[[], V]] = dict(loaders)
+        self._values: Dict[str, V] = {}
+
+    def __getitem__(self, key: str) -> V:
+        if key in self._values:
+            return self._values[key]
+        loader = self._loaders[key]
+        value = loader()
+        self._values[key] = value
+        return value
+
+    def __setitem__(self, key: str, value: V) -> None:
+        self._values[key] = value
+        self._loaders.pop(key, None)
+
+    def __delitem__(self, key: str) -> None:
+        if key not in self._values and key not in self._loaders:
+            raise KeyError(key)
+        self._values.pop(key, None)
+        self._loaders.pop(key, None)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._values or key in self._loaders
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._values
+        yield from (key for key in self._loaders if key not in self._values)
+
+    def __len__(self) -> int:
+        return len(self._values) + sum(1 for key in self._loaders if key not in self._values)
+
+    def is_loaded(self, key: str) -> bool:
+        return key in self._values
+
+    def loaded_count(self) -> int:
+        return len(self._values)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({len(self)} keys, {self.loaded_count()} loaded)"
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+# prism/live.py
+
+from typing import Dict, Iterable, Mapping, Optional, Set
+
+from .cache import ArtifactCache
+from .entities import CompilationSources, CompilationTask, CompilationResult, SourceChanges
+from .graph import DependencyGraph, Node
+from .session import CompilationSession
+
+class LiveProject:
+    """
+    A long-lived, incrementally updated project.
+
+    Holds its own copy of the sources, a lazy CompilationSession over them and a
+    DependencyGraph of the project. `apply` feeds file changes into the
+    session and recompiles only the recipes that depend on a changed asset.
+    """
+    def __init__(
+        self,
+        sources: CompilationSources,
+        recipes: Iterable[CompilationTask] = (),
+        cache: Optional[ArtifactCache] = None
+    ):
+        self._sources = CompilationSources(
+            templates=dict(sources.templates),
+            dataschemas=dict(sources.dataschemas),
+            blocks=dict(sources.blocks)
+        )
+        self._session = CompilationSession(self._sources, lazy=True, cache=cache)
+        self._recipes: Dict[str, CompilationTask] = {task.recipe_name: task for task in recipes}
+        self._results: Dict[str, CompilationResult] = {}
+        self._graph = DependencyGraph.build(
+            self._sources,
+            {name: task.sources for name, task in self._recipes.items()}
+        )
+
+    @property
+    def session(self) -> CompilationSession:
+        return self._session
+
+    @property
+    def graph(self) -> DependencyGraph:
+        return self._graph
+
+    @property
+    def recipes(self) -> Mapping[str, CompilationTask]:
+        return self._recipes
+
+    @property
+    def results(self) -> Mapping[str, CompilationResult]:
+        """The latest compilation result of every recipe compiled so far."""
+        return self._results
+
+    def compile_all(self) -> Dict[str, CompilationResult]:
+        return self._recompile(set(self._recipes))
+
+    def affected_recipes(self, changes: SourceChanges) -> Set[str]:
+        """Names of the recipes whose output may change with `changes`."""
+        return self._graph.affected_recipes(self._changed_nodes(changes))
+
+    def apply(self, changes: SourceChanges) -> Dict[str, CompilationResult]:
+        """Apply `changes` and recompile the affected recipes. Returns their new results."""
+        affected = self.affected_recipes(changes)
+        self._session.apply_changes(changes)
+
+        for kind, assets in (('template', changes.templates), ('dataschema', changes.dataschemas)):
+            for asset_id, content in assets.items():
+                if content is None:
+                    self._graph.remove_asset(kind, asset_id)
+                else:
+                    self._graph.add_asset(kind, asset_id)
+        for block_id, data in changes.blocks.items():
+            if data is None:
+                self._graph.remove_block(block_id)
+            else:
+                self._graph.set_block(block_id, data)
+        for recipe_name, data in changes.recipes.items():
+            if data is None:
+                self._graph.remove_recipe(recipe_name)
+                self._recipes.pop(recipe_name, None)
+                self._results.pop(recipe_name, None)
+            else:
+                self._graph.set_recipe(recipe_name, data)
+                self._recipes[recipe_name] = CompilationTask(recipe_name=recipe_name, sources=data)
+
+        return self._recompile({name for name in affected if name in self._recipes})
+
+    @staticmethod
+    def _changed_nodes(changes: SourceChanges) -> Set[Node]:
+        nodes: Set[Node] = set()
+        nodes.update(('template', asset_id) for asset_id in changes.templates)
+        nodes.update(('dataschema', asset_id) for asset_id in changes.dataschemas)
+        nodes.update(('block', asset_id) for asset_id in changes.blocks)
+        nodes.update(('recipe', asset_id) for asset_id in changes.recipes)
+        return nodes
+
+    def _recompile(self, recipe_names: Set[str]) -> Dict[str, CompilationResult]:
+        results: Dict[str, CompilationResult] = {}
+        for recipe_name in sorted(recipe_names):
+            task = self._recipes[recipe_name]
+            try:
+                result = CompilationResult(recipe_name=recipe_name, artifacts=self._session.compile(task))
+            except Exception as e:
+                result = CompilationResult(recipe_name=recipe_name, error=e)
+            results[recipe_name] = result
+        self._results.update(results)
+        return results
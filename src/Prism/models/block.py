@@ -2,7 +2,7 @@
 # models/block.py
 
 from pydantic import BaseModel, ConfigDict, Field
-from typing import Any, Dict, List, Literal, Optional
+from typing import Any, Dict, List, Literal, Optional, Mapping
 
 from .base import MetaModel, Identifiable
 from ..exceptions import VariantNotFoundError
@@ -41,3 +41,14 @@ class BlockModel(BaseModel, Identifiable, ProvidesDefaultsMixin):
             if v.id == variant_id:
                 return v
         raise VariantNotFoundError(block_id=self.id, variant_id=variant_id, available_variants=[v.id for v in self.variants])
+
+    @classmethod
+    def from_trusted(cls, data: Mapping[str, Any]) -> "BlockModel":
+        """
+        Build the model without validation, for data already checked against the block
+        file schema (e.g. loaded from a bundle or validated by `prism validate`).
+        """
+        fields = dict(data)
+        fields['meta'] = MetaModel.model_construct(**data['meta'])
+        fields['variants'] = [Variant.model_construct(**variant) for variant in data['variants']]
+        return cls.model_construct(**fields)
@@ -2,7 +2,7 @@
 # models/dataschema.py
 
 from pydantic import BaseModel, ConfigDict
-from typing import Any, Dict
+from typing import Any, Dict, Mapping
 
 from .base import MetaModel, Identifiable
 
@@ -10,4 +10,9 @@ class DataschemaModel(BaseModel, Identifiable):
     """ Data schema model representing the structure of data contracts """
     model_config = ConfigDict(extra='forbid')
     meta: MetaModel
-    data: Dict[str, Any]
\ No newline at end of file
+    data: Dict[str, Any]
+
+    @classmethod
+    def from_trusted(cls, data: Mapping[str, Any]) -> "DataschemaModel":
+        """Build the model without validation, for data already checked against the dataschema file schema."""
+        return cls.model_construct(meta=MetaModel.model_construct(**data['meta']), data=data['data'])
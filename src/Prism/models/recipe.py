@@ -2,7 +2,7 @@
 # models/recipe.py
 
 from pydantic import BaseModel, ConfigDict, Field, model_validator
-from typing import List, Optional
+from typing import Any, List, Mapping, Optional
 
 from .base import MetaModel, Identifiable
 from ..exceptions import RecipePropertyError
@@ -50,3 +50,20 @@ class RecipeModel(BaseModel, Identifiable):
     meta: MetaModel
     imports: ImportsModel
     composition: CompositionModel
+
+    @classmethod
+    def from_trusted(cls, data: Mapping[str, Any]) -> "RecipeModel":
+        """Build the model without validation, for data already checked against the recipe file schema."""
+        imports: dict = {}
+        for key, value in data['imports'].items():
+            if isinstance(value, list):
+                imports[key] = [ImportRef.model_construct(**item) for item in value]
+            elif value is not None:
+                imports[key] = ImportRef.model_construct(**value)
+        return cls.model_construct(
+            meta=MetaModel.model_construct(**data['meta']),
+            imports=ImportsModel.model_construct(**imports),
+            composition=CompositionModel.model_construct(
+                sequence=[SequenceItem.model_construct(**item) for item in data['composition']['sequence']]
+            )
+        )
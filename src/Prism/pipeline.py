@@ -0,0 +1,303 @@
+# -*- coding: utf-8 -*-
+# prism/pipeline.py
+
+import csv
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Mapping, Optional, Set, Tuple, Union
+
+from .entities import CompilationArtifacts
+from .exceptions import DatasetError, PrismError
+from .renderer import PromptRenderer
+
+# 数据集格式 -> 文件扩展名
+DATASET_FORMATS = {'jsonl': ('.jsonl', '.ndjson'), 'csv': ('.csv',)}
+
+_BOOLEANS = {'true': True, 'false': False, '1': True, '0': False}
+
+def _parse_integer(text: str) -> int:
+    return int(text)
+
+def _parse_number(text: str) -> Union[int, float]:
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+def _parse_boolean(text: str) -> bool:
+    try:
+        return _BOOLEANS[text.strip().lower()]
+    except KeyError:
+        raise ValueError(f"Not a boolean: {text!r}") from None
+
+def _parse_json(text: str) -> Any:
+    return json.loads(text)
+
+# contract 中的类型 -> CSV 单元格的解析函数; 'array' 和 'object' 的单元格写成 JSON
+_CSV_PARSERS: Dict[str, Callable[[str], Any]] = {
+    'integer': _parse_integer,
+    'number': _parse_number,
+    'boolean': _parse_boolean,
+    'array': _parse_json,
+    'object': _parse_json,
+}
+
+@dataclass(frozen=True)
+class RenderResult:
+    """The outcome of rendering one input record; `index` is the record's position in the input."""
+    index: int
+    prompt: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+@dataclass
+class RenderStats:
+    rendered: int = 0
+    failed: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def records(self) -> int:
+        return self.rendered + self.failed
+
+    @property
+    def rate(self) -> float:
+        """Records processed per second."""
+        return self.records / self.elapsed if self.elapsed > 0 else 0.0
+
+def dataset_format(path: Path) -> str:
+    suffix = Path(path).suffix.lower()
+    for name, suffixes in DATASET_FORMATS.items():
+        if suffix in suffixes:
+            return name
+    raise ValueError(f"Cannot tell the format of '{path}' from its extension; expected one of {', '.join(DATASET_FORMATS)}")
+
+def csv_column_types(contracts: Optional[Mapping[str, Mapping[str, Any]]]) -> Dict[str, List[str]]:
+    """The declared types of the top-level contract properties that CSV cells must be converted to."""
+    columns: Dict[str, List[str]] = {}
+    for schema in (contracts or {}).values():
+        properties = schema.get("properties") if isinstance(schema, Mapping) else None
+        if not isinstance(properties, Mapping):
+            continue
+        for name, prop in properties.items():
+            types = prop.get("type") if isinstance(prop, Mapping) else None
+            types = types if isinstance(types, list) else [types]
+            # 允许字符串的字段保持原样
+            if "string" not in types and any(t in _CSV_PARSERS for t in types):
+                columns[name] = [t for t in types if t in _CSV_PARSERS]
+    return columns
+
+def coerce_csv_row(row: Mapping[str, Any], column_types: Mapping[str, List[str]]) -> Dict[str, Any]:
+    """
+    Convert the cells of a CSV row to the types their contract properties declare.
+    An empty cell of a typed column counts as missing; a cell that cannot be
+    converted is kept as text, so validation reports it against the contract.
+    """
+    record: Dict[str, Any] = {}
+    for name, value in row.items():
+        types = column_types.get(name)
+        if not types or not isinstance(value, str):
+            record[name] = value
+            continue
+        if not value.strip():
+            continue
+        for type_name in types:
+            try:
+                record[name] = _CSV_PARSERS[type_name](value)
+                break
+            except ValueError:
+                continue
+        else:
+            record[name] = value
+    return record
+
+def read_records(
+    path: Path,
+    format: Optional[str] = None,
+    contracts: Optional[Mapping[str, Mapping[str, Any]]] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Stream the records of a JSONL or CSV file one at a time; the file is never
+    loaded as a whole. Blank JSONL lines are skipped. Raises DatasetError for a
+    line that is not a JSON object.
+
+    CSV cells are text; pass the prompt's `contracts` to convert them to the
+    declared integer, number, boolean, array (JSON) and object (JSON) types,
+    see `coerce_csv_row`.
+    """
+    path = Path(path)
+    format = format or dataset_format(path)
+    with open(path, encoding='utf-8', newline='') as f:
+        if format == 'csv':
+            column_types = csv_column_types(contracts)
+            if not column_types:
+                yield from csv.DictReader(f)
+                return
+            for row in csv.DictReader(f):
+                yield coerce_csv_row(row, column_types)
+            return
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                raise DatasetError(source=str(path), line=line_number, reason=str(e)) from e
+            if not isinstance(record, dict):
+                raise DatasetError(source=str(path), line=line_number, reason="Record is not a JSON object")
+            yield record
+
+def write_results(path: Path, results: Iterable[RenderResult], format: Optional[str] = None) -> int:
+    """
+    Write results as they arrive, one JSONL object or CSV row per record with
+    'index', 'prompt' and 'error' fields. Returns the number of results written.
+    """
+    path = Path(path)
+    format = format or dataset_format(path)
+    count = 0
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding='utf-8', newline='') as f:
+        if format == 'csv':
+            writer = csv.writer(f)
+            writer.writerow(("index", "prompt", "error"))
+            for result in results:
+                writer.writerow((result.index, result.prompt or "", result.error or ""))
+                count += 1
+            return count
+        for result in results:
+            row: Dict[str, Any] = {"index": result.index}
+            if result.ok:
+                row["prompt"] = result.prompt
+            else:
+                row["error"] = result.error
+            f.write(json.dumps(row, ensure_ascii=False))
+            f.write("\n")
+            count += 1
+    return count
+
+# 每个工作进程持有一个 renderer, 由 initializer 在进程启动时构建一次
+_worker_renderer: Optional[PromptRenderer] = None
+
+def _init_worker(artifacts: CompilationArtifacts, name: str, validate: str, backend: str) -> None:
+    global _worker_renderer
+    _worker_renderer = PromptRenderer.from_artifacts(artifacts, name=name, validate=validate, backend=backend)
+
+def _render_chunk(renderer: PromptRenderer, start: int, records: List[Mapping[str, Any]]) -> List[RenderResult]:
+    results = []
+    for offset, record in enumerate(records):
+        try:
+            results.append(RenderResult(index=start + offset, prompt=renderer.render(record)))
+        except PrismError as e:
+            results.append(RenderResult(index=start + offset, error=e.message))
+    return results
+
+def _render_chunk_in_worker(start: int, records: List[Mapping[str, Any]]) -> List[RenderResult]:
+    if _worker_renderer is None:
+        raise RuntimeError("Worker process was started without a renderer")
+    return _render_chunk(_worker_renderer, start, records)
+
+class RenderPipeline:
+    """
+    Renders a stream of input records with one compiled prompt.
+
+    Records are pulled from the input in chunks and rendered on a process pool;
+    at most `max_pending` chunks are in flight, so memory stays bounded however
+    large the input is and a slow consumer slows down reading. Results come back
+    in input order, or as soon as they are ready with `ordered=False`. A record
+    that fails validation or rendering yields a RenderResult carrying the error
+    and does not stop the stream. `stats` is updated as results are yielded.
+    """
+    def __init__(
+        self,
+        artifacts: CompilationArtifacts,
+        name: str = "<prompt>",
+        validate: bool = True,
+        workers: Optional[int] = None,
+        ordered: bool = True,
+        chunk_size: int = 256,
+        max_pending: Optional[int] = None,
+        backend: str = 'jsonschema'
+    ):
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        self.artifacts = artifacts
+        self.name = name
+        # 只有存在 contract 时才需要校验
+        self.validate = 'contracts' if validate and artifacts.contracts else 'none'
+        self.workers = max(1, workers if workers is not None else (os.cpu_count() or 1))
+        self.ordered = ordered
+        self.chunk_size = chunk_size
+        self.max_pending = max(1, max_pending if max_pending is not None else self.workers * 2)
+        self.backend = backend
+        self.stats = RenderStats()
+        # 在调用方进程中先构建一次, 模板或 contract 有问题时在启动进程池之前就报错
+        self._renderer = PromptRenderer.from_artifacts(artifacts, name=name, validate=self.validate, backend=backend)
+
+    def run(self, records: Iterable[Mapping[str, Any]]) -> Iterator[RenderResult]:
+        self.stats = RenderStats()
+        start = time.perf_counter()
+        chunks = self._chunks(records)
+        source = self._run_inline(chunks) if self.workers == 1 else self._run_pool(chunks)
+        for results in source:
+            for result in results:
+                if result.ok:
+                    self.stats.rendered += 1
+                else:
+                    self.stats.failed += 1
+                self.stats.elapsed = time.perf_counter() - start
+                yield result
+
+    def _chunks(self, records: Iterable[Mapping[str, Any]]) -> Iterator[Tuple[int, List[Mapping[str, Any]]]]:
+        iterator = iter(records)
+        index = 0
+        while True:
+            chunk = list(islice(iterator, self.chunk_size))
+            if not chunk:
+                return
+            yield index, chunk
+            index += len(chunk)
+
+    def _run_inline(self, chunks: Iterator[Tuple[int, List[Mapping[str, Any]]]]) -> Iterator[List[RenderResult]]:
+        for start, chunk in chunks:
+            yield _render_chunk(self._renderer, start, chunk)
+
+    def _run_pool(self, chunks: Iterator[Tuple[int, List[Mapping[str, Any]]]]) -> Iterator[List[RenderResult]]:
+        pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(self.artifacts, self.name, self.validate, self.backend)
+        )
+        try:
+            if self.ordered:
+                queue: Deque[Future] = deque()
+                for start, chunk in chunks:
+                    # 队列已满时先等待最早提交的块完成, 由此形成背压
+                    if len(queue) >= self.max_pending:
+                        yield queue.popleft().result()
+                    queue.append(pool.submit(_render_chunk_in_worker, start, chunk))
+                while queue:
+                    yield queue.popleft().result()
+            else:
+                pending: Set[Future] = set()
+                for start, chunk in chunks:
+                    if len(pending) >= self.max_pending:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            yield future.result()
+                    pending.add(pool.submit(_render_chunk_in_worker, start, chunk))
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+        finally:
+            # 调用方提前停止迭代时 (例如 --fail-fast), 取消尚未开始的块
+            pool.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+# prism/precompiled.py
+
+import json
+import os
+import py_compile
+import tempfile
+import importlib.util
+from pathlib import Path
+from typing import Any, Dict, List, Mapping
+
+import jinja2
+from jinja2 import ModuleLoader
+
+from .analysis import template_variables
+from .entities import CompilationArtifacts
+from .exceptions import RenderError
+from .renderer import PromptRenderer
+
+# 目录中除模板模块外的清单文件: 每个 prompt 的模块文件名, 运行时变量和 contract
+MANIFEST_FILENAME = "prism_modules.json"
+MODULES_FORMAT_VERSION = 1
+
+# 只用于生成代码; 生成的模块不依赖具体的环境配置, 加载时由调用方的环境决定 undefined 行为
+_CODEGEN_ENV = jinja2.Environment()
+
+def compile_template_module(template_content: str, name: str) -> str:
+    """The Python source of a Jinja module for one compiled prompt, loadable with jinja2.ModuleLoader."""
+    try:
+        return _CODEGEN_ENV.compile(template_content, name=name, raw=True, defer_init=True)
+    except jinja2.TemplateSyntaxError as e:
+        raise RenderError(prompt=name, reason=f"Syntax error at line {e.lineno}: {e.message}") from e
+
+def write_template_modules(directory: Path, artifacts: Mapping[str, CompilationArtifacts]) -> List[Path]:
+    """
+    Precompile the final template of every prompt in `artifacts` (keyed by recipe
+    name) into `directory`: one Jinja module per prompt, byte-compiled to
+    `__pycache__`, plus a manifest. Prompts already in the directory are kept.
+    Returns the paths of the modules written.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    manifest = _read_manifest(directory) if (directory / MANIFEST_FILENAME).is_file() else {}
+
+    written: List[Path] = []
+    for name, prompt_artifacts in artifacts.items():
+        module_path = directory / ModuleLoader.get_module_filename(name)
+        _atomic_write(module_path, compile_template_module(prompt_artifacts.template_content, name))
+        # 预先生成字节码, 服务进程第一次导入时也不需要编译 Python 源码
+        py_compile.compile(str(module_path), cfile=importlib.util.cache_from_source(str(module_path)), doraise=True)
+        manifest[name] = {
+            "module": module_path.name,
+            "variables": sorted(template_variables(prompt_artifacts.template_content)),
+            "contracts": prompt_artifacts.contracts,
+        }
+        written.append(module_path)
+
+    _atomic_write(
+        directory / MANIFEST_FILENAME,
+        json.dumps({"version": MODULES_FORMAT_VERSION, "prompts": manifest}, ensure_ascii=False, sort_keys=True)
+    )
+    return written
+
+class PrecompiledPrompts:
+    """
+    Prompts loaded from a directory written by `write_template_modules`. Loading a
+    prompt imports its module; no Jinja template is lexed, parsed or compiled.
+    """
+    def __init__(self, directory: Path, strict: bool = False):
+        self.directory = Path(directory)
+        self._prompts = _read_manifest(self.directory)
+        self.env = jinja2.Environment(
+            loader=ModuleLoader(str(self.directory)),
+            undefined=jinja2.StrictUndefined if strict else jinja2.Undefined
+        )
+
+    def names(self) -> List[str]:
+        return sorted(self._prompts)
+
+    def template(self, name: str) -> jinja2.Template:
+        if name not in self._prompts:
+            raise RenderError(prompt=name, reason=f"No precompiled module in '{self.directory}'")
+        return self.env.get_template(name)
+
+    def renderer(self, name: str, validate: str = 'none', backend: str = 'jsonschema') -> PromptRenderer:
+        """A PromptRenderer for one prompt; `validate='contracts'` uses the contracts stored in the manifest."""
+        entry = self._prompts.get(name, {})
+        return PromptRenderer(
+            self.template(name),
+            name=name,
+            contracts=entry.get("contracts"),
+            validate=validate,
+            backend=backend,
+            variables=frozenset(entry.get("variables", ()))
+        )
+
+def _read_manifest(directory: Path) -> Dict[str, Any]:
+    path = directory / MANIFEST_FILENAME
+    try:
+        payload = json.loads(path.read_text(encoding='utf-8'))
+    except (OSError, ValueError) as e:
+        raise RenderError(prompt=str(directory), reason=f"Could not read '{path.name}': {e}") from e
+    if not isinstance(payload, dict) or payload.get("version") != MODULES_FORMAT_VERSION:
+        raise RenderError(
+            prompt=str(directory),
+            reason=f"Module format {payload.get('version') if isinstance(payload, dict) else None!r} is not supported (expected {MODULES_FORMAT_VERSION})"
+        )
+    return payload.get("prompts", {})
+
+def _atomic_write(path: Path, text: str) -> None:
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
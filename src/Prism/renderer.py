@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+# prism/renderer.py
+
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Mapping, Optional, Type, Union
+
+import jinja2
+from pydantic import BaseModel, ValidationError
+
+from .analysis import template_variables
+from .entities import CompilationArtifacts
+from .exceptions import RenderError
+from .schemas.schema_loader import CompiledSchema
+
+# 输入校验方式: 不校验 / 按 aggregated_contracts 的 JSON Schema 校验 / 按生成的 Pydantic 模型校验
+VALIDATION_MODES = ('none', 'contracts', 'model')
+
+# 运行时渲染环境, 所有 renderer 共用; strict 为 True 时缺少变量会报错, 否则渲染为空字符串
+_ENVIRONMENTS = {
+    False: jinja2.Environment(),
+    True: jinja2.Environment(undefined=jinja2.StrictUndefined),
+}
+
+class PromptRenderer:
+    """
+    Renders a compiled prompt for many input records.
+
+    The final template is compiled once when the renderer is created; `render`
+    then only validates the record (if requested) and runs the compiled code.
+    A renderer holds no per-call state and can be shared between threads.
+    `template_content` may also be an already loaded jinja2.Template, e.g. one
+    imported from a precompiled module; its `variables` are then taken as given.
+    """
+    def __init__(
+        self,
+        template_content: Union[str, jinja2.Template],
+        name: str = "<prompt>",
+        contracts: Optional[Mapping[str, Dict[str, Any]]] = None,
+        model: Optional[Type[BaseModel]] = None,
+        validate: str = 'none',
+        strict: bool = False,
+        backend: str = 'jsonschema',
+        variables: Optional[FrozenSet[str]] = None
+    ):
+        if validate not in VALIDATION_MODES:
+            raise ValueError(f"Unknown validation mode '{validate}', expected one of {VALIDATION_MODES}")
+        self.name = name
+        self.validate = validate
+        # 模板使用的运行时变量; 直接传入 Template 且未给出 variables 时为 None
+        self.variables: Optional[FrozenSet[str]] = variables
+        if isinstance(template_content, jinja2.Template):
+            self._template = template_content
+        else:
+            try:
+                self._template = _ENVIRONMENTS[strict].from_string(template_content)
+                self.variables = template_variables(template_content)
+            except jinja2.TemplateSyntaxError as e:
+                raise RenderError(prompt=name, reason=f"Syntax error at line {e.lineno}: {e.message}") from e
+
+        self._check: Optional[Callable[[Mapping[str, Any]], None]] = None
+        if validate == 'contracts':
+            if contracts is None:
+                raise RenderError(prompt=name, reason="Contract validation was requested but no contracts are available")
+            self._schemas = [CompiledSchema(contract_id, schema, backend) for contract_id, schema in contracts.items()]
+            self._check = self._check_contracts
+        elif validate == 'model':
+            if model is None:
+                raise RenderError(prompt=name, reason="Model validation was requested but no model is available")
+            self._model = model
+            self._check = self._check_model
+
+    @classmethod
+    def from_artifacts(
+        cls,
+        artifacts: CompilationArtifacts,
+        name: str = "<prompt>",
+        validate: str = 'none',
+        strict: bool = False,
+        backend: str = 'jsonschema'
+    ) -> "PromptRenderer":
+        """
+        Build a renderer for compiled artifacts. `validate='model'` executes the
+        generated `model_code`; it is only unambiguous for prompts with a single
+        contract, use `validate='contracts'` otherwise.
+        """
+        model = None
+        if validate == 'model':
+            model = cls._load_model(artifacts, name)
+        return cls(
+            artifacts.template_content, name=name, contracts=artifacts.contracts,
+            model=model, validate=validate, strict=strict, backend=backend
+        )
+
+    def render(self, record: Mapping[str, Any]) -> str:
+        if self._check is not None:
+            self._check(record)
+        try:
+            return self._template.render(record)
+        except (jinja2.TemplateError, TypeError, ValueError) as e:
+            raise self._render_error(e) from e
+
+    def render_many(self, records: Iterable[Mapping[str, Any]]) -> List[str]:
+        """Render every record in order; the first invalid record raises RenderError."""
+        check = self._check
+        render = self._template.render
+        outputs: List[str] = []
+        append = outputs.append
+        try:
+            for record in records:
+                if check is not None:
+                    check(record)
+                append(render(record))
+        except (jinja2.TemplateError, TypeError, ValueError) as e:
+            raise self._render_error(e) from e
+        return outputs
+
+    def _render_error(self, error: Exception) -> RenderError:
+        # 模板运行时错误 (未定义变量, 对错误类型的数据做运算等) 只影响当前记录
+        if isinstance(error, jinja2.TemplateError):
+            return RenderError(prompt=self.name, reason=error.message or str(error))
+        return RenderError(prompt=self.name, reason=f"{type(error).__name__}: {error}")
+
+    # --- 输入校验 ---
+
+    def _check_contracts(self, record: Mapping[str, Any]) -> None:
+        for schema in self._schemas:
+            # 快速路径只判断是否合法, 出错时再收集详细信息
+            if not schema.is_valid(record):
+                errors = schema.error_messages(record)
+                # 详细信息由 jsonschema 给出并以它为准; 没有错误说明快速路径的判断有误
+                if not errors:
+                    continue
+                raise RenderError(
+                    prompt=self.name,
+                    reason=f"Input does not satisfy contract '{schema.name}':\n- " + "\n- ".join(errors),
+                    errors=errors
+                )
+
+    def _check_model(self, record: Mapping[str, Any]) -> None:
+        try:
+            self._model.model_validate(record)
+        except ValidationError as e:
+            errors = [f"Path '{'.'.join(map(str, detail['loc']))}': {detail['msg']}" for detail in e.errors()]
+            raise RenderError(
+                prompt=self.name,
+                reason=f"Input does not satisfy model '{self._model.__name__}':\n- " + "\n- ".join(errors),
+                errors=errors
+            ) from e
+
+    @staticmethod
+    def _load_model(artifacts: CompilationArtifacts, name: str) -> Type[BaseModel]:
+        if not artifacts.model_code:
+            raise RenderError(prompt=name, reason="The prompt has no generated model")
+        if artifacts.contracts is not None and len(artifacts.contracts) > 1:
+            raise RenderError(
+                prompt=name,
+                reason=f"The generated model code defines {len(artifacts.contracts)} contracts; use validate='contracts'"
+            )
+        # 生成的代码来自本项目自己的 dataschema, 与用户直接导入 data_model.py 等价
+        namespace: Dict[str, Any] = {"__name__": f"prism_generated_{name}"}
+        try:
+            exec(compile(artifacts.model_code, f"<{name} model>", "exec"), namespace)
+        except Exception as e:
+            raise RenderError(prompt=name, reason=f"Generated model code failed to load: {e}") from e
+        model = namespace.get("Model")
+        if not (isinstance(model, type) and issubclass(model, BaseModel)):
+            raise RenderError(prompt=name, reason="Generated model code does not define 'Model'")
+        model.model_rebuild(_types_namespace=namespace)
+        return model
@@ -1,18 +1,25 @@
 # -*- coding: utf-8 -*-
 # resolvers/register.py
 
-from typing import Dict
+from typing import Callable, Dict, TypeVar
 
 from ..models.block import BlockModel
 from ..models.dataschema import DataschemaModel
 from ..exceptions import ResolutionError
 
+T = TypeVar("T")
+
 class ResolverRegister:
     """register and resolve models by their identifiers."""
     def __init__(self):
         self._blocks: Dict[str, BlockModel] = {}
         self._dataschemas: Dict[str, DataschemaModel] = {}
         self._templates: Dict[str, str] = {}
+
+        # 惰性注册: 资源在首次被解析时才会构建, 之后缓存在上面的字典中
+        self._block_factories: Dict[str, Callable[[], BlockModel]] = {}
+        self._dataschema_factories: Dict[str, Callable[[], DataschemaModel]] = {}
+        self._template_factories: Dict[str, Callable[[], str]] = {}
     
     def register_block(self, block: BlockModel):
         self._blocks[block.id] = block
@@ -23,17 +30,50 @@ class ResolverRegister:
     def register_template(self, template_id: str, content: str):
         self._templates[template_id] = content
 
+    def register_block_factory(self, block_id: str, factory: Callable[[], BlockModel]):
+        """Register a block that is built on first resolution and memoized afterwards."""
+        self._blocks.pop(block_id, None)
+        self._block_factories[block_id] = factory
+
+    def register_dataschema_factory(self, schema_id: str, factory: Callable[[], DataschemaModel]):
+        """Register a dataschema that is built on first resolution and memoized afterwards."""
+        self._dataschemas.pop(schema_id, None)
+        self._dataschema_factories[schema_id] = factory
+
+    def register_template_factory(self, template_id: str, factory: Callable[[], str]):
+        """Register a template whose content is produced on first resolution and memoized afterwards."""
+        self._templates.pop(template_id, None)
+        self._template_factories[template_id] = factory
+
+    def unregister_block(self, block_id: str):
+        self._blocks.pop(block_id, None)
+        self._block_factories.pop(block_id, None)
+
+    def unregister_dataschema(self, schema_id: str):
+        self._dataschemas.pop(schema_id, None)
+        self._dataschema_factories.pop(schema_id, None)
+
+    def unregister_template(self, template_id: str):
+        self._templates.pop(template_id, None)
+        self._template_factories.pop(template_id, None)
+
     def resolve_block(self, block_id: str) -> BlockModel:
-        if block_id not in self._blocks:
-            raise ResolutionError(asset_type='Block', identifier=block_id)
-        return self._blocks[block_id]
+        return self._resolve(self._blocks, self._block_factories, 'Block', block_id)
 
     def resolve_dataschema(self, schema_id: str) -> DataschemaModel:
-        if schema_id not in self._dataschemas:
-            raise ResolutionError(asset_type='Dataschema', identifier=schema_id)
-        return self._dataschemas[schema_id]
+        return self._resolve(self._dataschemas, self._dataschema_factories, 'Dataschema', schema_id)
 
     def resolve_template(self, template_id: str) -> str:
-        if template_id not in self._templates:
-            raise ResolutionError(asset_type='Template', identifier=template_id)
-        return self._templates[template_id]
+        return self._resolve(self._templates, self._template_factories, 'Template', template_id)
+
+    @staticmethod
+    def _resolve(resolved: Dict[str, T], factories: Dict[str, Callable[[], T]], asset_type: str, identifier: str) -> T:
+        if identifier in resolved:
+            return resolved[identifier]
+        if identifier not in factories:
+            raise ResolutionError(asset_type=asset_type, identifier=identifier)
+        # 构建失败时异常直接向上抛出, factory 保留, 下次解析会再次尝试
+        value = factories[identifier]()
+        resolved[identifier] = value
+        factories.pop(identifier, None)
+        return value
@@ -19,9 +19,13 @@ from .exceptions import (
 )
 
 from contextlib import contextmanager
-from typing import Callable, Dict
+from typing import Callable, Dict, List, Optional
 from rich.progress import Progress, SpinnerColumn, BarColumn, TextColumn, TimeElapsedColumn
+from rich.table import Table
 from .entities import CompilationSources
+from .compiler.pass_manager import PassReport
+from .stats import RecipeStats
+from .validation import ValidationReport
 
 
 def _format_generic(error: TemplatedPrismError) -> Text:
@@ -110,15 +114,18 @@ def _format_recipe_reference_error(error: RecipeReferenceError) -> Text:
     return text
 
 
-def handle_exception(error: Exception):
+def handle_exception(error: Exception, location: Optional[str] = None):
     """
     The main entry point for pretty-printing Prism exceptions using rich.
     It acts as a dispatcher, matching the exception type to the best
-    available formatter for maximum clarity.
+    available formatter for maximum clarity. `location` names the asset
+    the error belongs to, if known, and is shown in the panel title.
     """
     console = Console(stderr=True, theme=None)
     
     title = f"[bold red]Error: {error.__class__.__name__}[/bold red]"
+    if location:
+        title += f" [yellow]in {location}[/yellow]"
     content: Any = str(error) # Default content for unexpected errors
 
     if isinstance(error, AssetValidationError):
@@ -151,3 +158,94 @@ def handle_exception(error: Exception):
             expand=False
         )
     )
+
+@contextmanager
+def compile_progress(total: int, description: str = "Compiling recipes"):
+    """
+    Display a progress bar on stderr for a batch of `total` recipes.
+    Yields a callback to be invoked once per finished recipe, e.g. as the
+    `on_result` hook of `compile_many`.
+    """
+    console = Console(stderr=True)
+    progress = Progress(
+        SpinnerColumn(),
+        TextColumn("[bold blue]{task.description}"),
+        BarColumn(),
+        TextColumn("{task.completed}/{task.total}"),
+        TimeElapsedColumn(),
+        console=console
+    )
+    with progress:
+        task_id = progress.add_task(description, total=total)
+
+        def advance(*_: Any) -> None:
+            progress.advance(task_id)
+
+        yield advance
+
+def report_validation(report: ValidationReport) -> None:
+    """Print every issue of a validation report, followed by a one-line summary."""
+    for issue in report.issues:
+        handle_exception(issue.error, location=f"{issue.kind} '{issue.asset_id}'")
+
+    console = Console(stderr=True)
+    if report.ok:
+        console.print(f"✅ [bold green]{report.checked} asset(s) checked, no problems found.[/bold green]")
+    else:
+        broken = len({(issue.kind, issue.asset_id) for issue in report.issues})
+        console.print(
+            f"❌ [bold red]{len(report.issues)} problem(s)[/bold red] in {broken} of "
+            f"{report.checked} asset(s) checked."
+        )
+
+def _change(before: int, after: int) -> str:
+    if before == after:
+        return f"{before:,}"
+    percent = f" ({(after - before) / before:+.1%})" if before else ""
+    return f"{before:,} → {after:,}{percent}"
+
+def report_passes(summary: Dict[str, PassReport], recipes: int) -> None:
+    """Print the per-pass totals of `summarize_reports` as a table."""
+    table = Table(title=f"IR passes over {recipes} recipe(s)")
+    table.add_column("Pass", style="cyan")
+    table.add_column("Time (ms)", justify="right")
+    table.add_column("Segments", justify="right")
+    table.add_column("Bytes", justify="right")
+    table.add_column("Contract fields", justify="right")
+    for report in summary.values():
+        table.add_row(
+            report.name,
+            f"{report.elapsed * 1000:.1f}",
+            _change(report.before.segments, report.after.segments),
+            _change(report.before.bytes, report.after.bytes),
+            _change(report.before.contract_fields, report.after.contract_fields)
+        )
+    Console().print(table)
+
+def report_stats(stats: List[RecipeStats], over_budget: Dict[str, List[str]], show_blocks: bool = False) -> None:
+    """Print the static size of each recipe (and of its blocks), marking the recipes over budget."""
+    table = Table(title=f"Static prompt size of {len(stats)} recipe(s)")
+    table.add_column("Recipe", style="cyan")
+    table.add_column("Chars", justify="right")
+    table.add_column("Tokens", justify="right")
+    table.add_column("Unbounded variables", style="yellow")
+    for recipe in stats:
+        reasons = over_budget.get(recipe.recipe_name)
+        table.add_row(
+            f"[bold red]{recipe.recipe_name}[/bold red]" if reasons else recipe.recipe_name,
+            f"{recipe.chars:,}",
+            f"{recipe.tokens:,}",
+            ", ".join(sorted(recipe.unbounded_variables))
+        )
+        if show_blocks:
+            for block in recipe.blocks:
+                table.add_row(
+                    f"  [dim]{block.source_ref} ({block.block_id}/{block.variant_id})[/dim]",
+                    f"[dim]{block.chars:,}[/dim]",
+                    f"[dim]{block.tokens:,}[/dim]",
+                    ""
+                )
+    console = Console()
+    console.print(table)
+    for recipe_name, reasons in over_budget.items():
+        console.print(f"❌ [bold red]{recipe_name}[/bold red] is over budget: {'; '.join(reasons)}")
@@ -4,21 +4,12 @@
 import jsonschema
 from typing import Dict, Any
 
+from .schema_loader import SchemaLoader
 from ..exceptions import (
     InternalSchemaError,
     AssetValidationError
 )
 
-def _validate_metaschema(meta_schema_name: str, meta_schema_content: Dict[str, Any]) -> None:
-    """Verify that the provided meta-schema is itself valid."""
-    try:
-        jsonschema.Draft202012Validator.check_schema(meta_schema_content)
-    except jsonschema.SchemaError as e:
-        raise InternalSchemaError(
-            internal_schema_file_name=meta_schema_name,
-            errors=[str(e)]
-        ) from e
-
 def _safe_get_identifier(data: Dict[str, Any]) -> str | None:
     try:
         return data['meta']['id']
@@ -28,18 +19,17 @@ def _safe_get_identifier(data: Dict[str, Any]) -> str | None:
 def validate_by_schema(meta_schema_name: str, meta_schema_content: Dict[str, Any], validate_file: str, raw_data: Dict[str, Any]) -> None:
     """Validate raw_data against the provided file_schema using JSON Schema."""
     try:
-        _validate_metaschema(meta_schema_name, meta_schema_content)
+        # 校验器按 meta-schema 编译并缓存; 合法数据只走 is_valid 快速路径
+        validator = SchemaLoader.get_validator(meta_schema_name, meta_schema_content)
+        if validator.is_valid(raw_data):
+            return
 
-        validator = jsonschema.Draft202012Validator(meta_schema_content)
-        validated_errors = sorted(validator.iter_errors(raw_data), key=lambda e: e.path)
-
-        if validated_errors:
-            error_messages = [
-                f"Path '{'.'.join(map(str, error.path))}': {error.message}" 
-                for error in validated_errors
-            ]
-            identifier = _safe_get_identifier(raw_data)
-            raise AssetValidationError(asset_file_name=validate_file, errors=error_messages, identifier=identifier)
+        error_messages = validator.error_messages(raw_data)
+        # jsonschema 是判定的依据: 快速路径误报时没有任何错误信息, 视为合法
+        if not error_messages:
+            return
+        identifier = _safe_get_identifier(raw_data)
+        raise AssetValidationError(asset_file_name=validate_file, errors=error_messages, identifier=identifier)
     except InternalSchemaError:
         raise
     except (jsonschema.ValidationError, jsonschema.SchemaError) as e:
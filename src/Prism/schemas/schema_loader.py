@@ -2,18 +2,92 @@
 # schema_loader.py
 
 from importlib import resources
+import jsonschema
 import yaml
-from typing import Dict, Any
+from typing import Callable, Dict, Any, List, Optional
 
-from ..exceptions import MetaSchemaFileError, PrismError
+from ..exceptions import MetaSchemaFileError, InternalSchemaError, PrismError
 
 _DATA_SCHEMA_FILE_SCHEMA_YAML = 'dataschema.file.schema.yaml'
 _BLOCK_FILE_SCHEMA_YAML = 'block.file.schema.yaml'
 _RECIPE_FILE_SCHEMA_YAML = 'recipe.file.schema.yaml'
 
+# 'jsonschema': 解释执行的 Draft 2020-12 校验器 (默认)
+# 'fastjsonschema': 把 schema 生成为 Python 代码后再校验, 需要安装可选依赖 fastjsonschema
+VALIDATOR_BACKENDS = ('jsonschema', 'fastjsonschema')
+
+# fastjsonschema 最高只支持 draft-07; 使用这些较新关键字的 schema 仍由 jsonschema 校验, 保证两种后端结果一致
+_POST_DRAFT7_KEYWORDS = frozenset({
+    'prefixItems', 'unevaluatedItems', 'unevaluatedProperties', 'dependentRequired', 'dependentSchemas',
+    'minContains', 'maxContains', '$anchor', '$dynamicRef', '$dynamicAnchor', '$recursiveRef',
+    '$recursiveAnchor', '$vocabulary'
+})
+
+class CompiledSchema:
+    """
+    A meta-schema checked and compiled once, reused for every asset validated against it.
+
+    `is_valid` is the fast path: it stops at the first error (or runs the generated
+    code of the 'fastjsonschema' backend). Detailed messages are only collected by
+    `error_messages`, which always uses jsonschema so reports look the same on every backend.
+    The 'fastjsonschema' backend only handles schemas whose meaning is the same in
+    draft-07 and 2020-12; other schemas are validated by jsonschema either way.
+    """
+    def __init__(self, name: str, schema: Dict[str, Any], backend: str = 'jsonschema'):
+        self.name = name
+        self.schema = schema
+        self.backend = backend
+        try:
+            jsonschema.Draft202012Validator.check_schema(schema)
+        except jsonschema.SchemaError as e:
+            raise InternalSchemaError(internal_schema_file_name=name, errors=[str(e)]) from e
+        self._validator = jsonschema.Draft202012Validator(schema)
+        self._is_valid: Callable[[Any], bool] = self._validator.is_valid
+        if backend == 'fastjsonschema' and not _needs_2020_12(schema):
+            self._is_valid = _compile_fastjsonschema(name, schema)
+
+    def is_valid(self, data: Any) -> bool:
+        return self._is_valid(data)
+
+    def error_messages(self, data: Any) -> List[str]:
+        errors = sorted(self._validator.iter_errors(data), key=lambda e: e.path)
+        return [f"Path '{'.'.join(map(str, error.path))}': {error.message}" for error in errors]
+
+def _compile_fastjsonschema(name: str, schema: Dict[str, Any]) -> Callable[[Any], bool]:
+    import fastjsonschema
+
+    try:
+        # jsonschema 默认不检查 format, 这里保持一致
+        validate = fastjsonschema.compile(schema, use_formats=False)
+    except fastjsonschema.JsonSchemaDefinitionException as e:
+        raise InternalSchemaError(internal_schema_file_name=name, errors=[str(e)]) from e
+
+    def is_valid(data: Any) -> bool:
+        try:
+            validate(data)
+            return True
+        except fastjsonschema.JsonSchemaValueException:
+            return False
+    return is_valid
+
+def _needs_2020_12(schema: Any) -> bool:
+    """True if draft-07 would read `schema` differently: newer keywords, or `$ref` next to other keywords."""
+    if isinstance(schema, list):
+        return any(_needs_2020_12(item) for item in schema)
+    if not isinstance(schema, dict):
+        return False
+    if _POST_DRAFT7_KEYWORDS.intersection(schema):
+        return True
+    # draft-07 忽略与 $ref 并列的关键字, 2020-12 则同时应用
+    if '$ref' in schema and len(schema) > 1:
+        return True
+    return any(_needs_2020_12(value) for value in schema.values())
+
 class SchemaLoader:
     """Loads and caches JSON schemas for validating Prism files."""
     _schemas: Dict[str, Dict[str, Any]] = {}
+    _validators: Dict[str, CompiledSchema] = {}
+    _backend: str = 'jsonschema'
     
     @classmethod
     def _load_schema(cls, filename: str) -> Dict[str, Any]:
@@ -31,6 +105,38 @@ class SchemaLoader:
         except (ImportError, AttributeError) as e:
             raise MetaSchemaFileError(filename=filename, error=f"Error accessing schema file: {str(e)}") from e
 
+    @classmethod
+    def get_validator(cls, filename: str, schema: Optional[Dict[str, Any]] = None) -> CompiledSchema:
+        """
+        The compiled validator for a schema, built on first use.
+        `schema` defaults to the built-in file schema named `filename`.
+        """
+        if schema is None:
+            schema = cls._load_schema(filename)
+        validator = cls._validators.get(filename)
+        # 同名但内容对象不同的 schema 需要重新编译
+        if validator is None or validator.schema is not schema:
+            validator = CompiledSchema(filename, schema, cls._backend)
+            cls._validators[filename] = validator
+        return validator
+
+    @classmethod
+    def set_validator_backend(cls, backend: str) -> None:
+        """Select the validator backend ('jsonschema' or 'fastjsonschema') and drop compiled validators."""
+        if backend not in VALIDATOR_BACKENDS:
+            raise PrismError(f"Unknown validator backend '{backend}'. Expected one of {VALIDATOR_BACKENDS}")
+        if backend == 'fastjsonschema':
+            try:
+                import fastjsonschema  # noqa: F401
+            except ImportError as e:
+                raise PrismError("The 'fastjsonschema' validator backend requires the fastjsonschema package") from e
+        cls._backend = backend
+        cls._validators.clear()
+
+    @classmethod
+    def get_validator_backend(cls) -> str:
+        return cls._backend
+
     @classmethod
     def get_dataschema_schema(cls) -> Dict[str, Any]:
         return cls._load_schema(_DATA_SCHEMA_FILE_SCHEMA_YAML)
@@ -41,4 +147,4 @@ class SchemaLoader:
 
     @classmethod
     def get_recipe_schema(cls) -> Dict[str, Any]:
-        return cls._load_schema(_RECIPE_FILE_SCHEMA_YAML)
\ No newline at end of file
+        return cls._load_schema(_RECIPE_FILE_SCHEMA_YAML)
@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+# prism/session.py
+
+import asyncio
+from concurrent.futures import Executor
+from functools import partial
+from typing import Dict, Optional, Tuple
+
+from .cache import ArtifactCache, AssetFingerprinter
+from .compiler.pass_manager import PassManager
+from .core import (
+    _build_resolver_from_sources,
+    _compile_with_resolver,
+    _compile_ir_with_resolver,
+    _build_block_model,
+    _build_dataschema_model
+)
+from .entities import CompilationSources, CompilationArtifacts, CompilationTask, SourceChanges
+from .models.ir import IRModel
+from .resolvers.register import ResolverRegister
+from .schemas.schema_validator import validate_recipe_file
+
+class CompilationSession:
+    """
+    Ingests a set of CompilationSources once and compiles many recipes against them.
+
+    Building the resolver (validating and registering every block, dataschema and
+    template) is paid a single time in the constructor, so each call to `compile`
+    only costs as much as the recipe it compiles.
+
+    With `lazy=True` nothing is validated up front: each block and dataschema is
+    validated and built the first time a recipe resolves it, so a compile only pays
+    for the transitive closure of the recipe's imports and broken assets that the
+    recipe never reaches do not block it. If the sources are `LazyMapping`s, the
+    files behind unreached assets are not even read.
+
+    With a `cache`, each recipe is fingerprinted from the content of everything it
+    transitively reaches, and unchanged recipes are served from the cache without
+    running validation or any generator.
+
+    With `trusted=True` the sources and recipes are assumed to be valid already (e.g.
+    loaded from a bundle or checked by `validate_project`) and models are built
+    without schema or Pydantic validation. This also holds for assets passed to
+    `apply_changes`, so validate them first if they come from an untrusted source.
+
+    `compile_async` runs fingerprinting, cache lookups and compilations in `executor`
+    (the event loop's default executor if None) and coalesces concurrent requests for the same fingerprint
+    into a single compilation.
+
+    `passes` selects the IR passes run before the generators (DEFAULT_PASSES if
+    None); the selection is part of every fingerprint.
+    """
+    def __init__(
+        self,
+        sources: CompilationSources,
+        lazy: bool = False,
+        cache: Optional[ArtifactCache] = None,
+        executor: Optional[Executor] = None,
+        trusted: bool = False,
+        passes: Optional[PassManager] = None
+    ):
+        self._sources = sources
+        self._lazy = lazy
+        self._trusted = trusted
+        self._cache = cache
+        self._executor = executor
+        # 正在进行中的异步编译: (事件循环 ID, 指纹) -> Future
+        self._inflight: Dict[Tuple[int, str], "asyncio.Future[CompilationArtifacts]"] = {}
+        self._passes = passes or PassManager()
+        self._fingerprinter = AssetFingerprinter(sources, options=self._passes.key, trusted=trusted)
+        self._resolver = _build_resolver_from_sources(sources, lazy=lazy, trusted=trusted)
+
+    @property
+    def sources(self) -> CompilationSources:
+        return self._sources
+
+    @property
+    def lazy(self) -> bool:
+        return self._lazy
+
+    @property
+    def trusted(self) -> bool:
+        return self._trusted
+
+    @property
+    def passes(self) -> PassManager:
+        return self._passes
+
+    @property
+    def resolver(self) -> ResolverRegister:
+        return self._resolver
+
+    @property
+    def cache(self) -> Optional[ArtifactCache]:
+        return self._cache
+
+    def fingerprint(self, task: CompilationTask) -> str:
+        """Content fingerprint of a recipe and everything it transitively reaches."""
+        return self._fingerprinter.fingerprint(task)
+
+    def compile(self, task: CompilationTask) -> CompilationArtifacts:
+        """Compile a single recipe against the session's shared sources."""
+        if self._cache is None:
+            return self._compile(task)
+
+        fingerprint = self.fingerprint(task)
+        artifacts = self._cache.get(fingerprint)
+        if artifacts is None:
+            artifacts = self._compile_and_store(task, fingerprint)
+        return artifacts
+
+    def compile_ir(self, task: CompilationTask) -> IRModel:
+        """Run only the front end (validation and import resolution) and return the IR."""
+        if not self._trusted:
+            validate_recipe_file(task.recipe_name, task.sources)
+        return _compile_ir_with_resolver(task, self._resolver, trusted=self._trusted)
+
+    async def compile_async(self, task: CompilationTask) -> CompilationArtifacts:
+        """
+        Compile a recipe without blocking the event loop.
+        Concurrent calls for the same fingerprint share one compilation (single-flight).
+        """
+        loop = asyncio.get_running_loop()
+        # 指纹计算和磁盘缓存读取都可能读文件或做大量哈希, 不在事件循环上执行
+        fingerprint, artifacts = await loop.run_in_executor(self._executor, self._lookup, task)
+        if artifacts is not None:
+            return artifacts
+
+        key = (id(loop), fingerprint)
+        future = self._inflight.get(key)
+        if future is None:
+            future = loop.run_in_executor(self._executor, self._compile_and_store, task, fingerprint)
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # shield: 单个调用方被取消时不影响其他等待同一结果的调用方
+        return await asyncio.shield(future)
+
+    def apply_changes(self, changes: SourceChanges) -> None:
+        """
+        Apply incremental updates to the session's sources in place.
+        Changed blocks and dataschemas are re-registered lazily, so they are built (and
+        validated, unless the session is trusted) when a recipe next resolves them. Recipe changes are ignored here; recipes are
+        passed to `compile` directly.
+        """
+        for template_id, content in changes.templates.items():
+            if content is None:
+                self._sources.templates.pop(template_id, None)
+                self._resolver.unregister_template(template_id)
+            else:
+                self._sources.templates[template_id] = content
+                self._resolver.register_template(template_id, content)
+            # 先更新内容再丢弃旧哈希, 并发计算的指纹不会记录旧内容的哈希
+            self._fingerprinter.invalidate('templates', template_id)
+
+        for schema_id, data in changes.dataschemas.items():
+            if data is None:
+                self._sources.dataschemas.pop(schema_id, None)
+                self._resolver.unregister_dataschema(schema_id)
+            else:
+                self._sources.dataschemas[schema_id] = data
+                self._resolver.register_dataschema_factory(schema_id, partial(_build_dataschema_model, schema_id, data, self._trusted))
+            self._fingerprinter.invalidate('dataschemas', schema_id)
+
+        for block_id, data in changes.blocks.items():
+            if data is None:
+                self._sources.blocks.pop(block_id, None)
+                self._resolver.unregister_block(block_id)
+            else:
+                self._sources.blocks[block_id] = data
+                self._resolver.register_block_factory(block_id, partial(_build_block_model, block_id, data, self._trusted))
+            self._fingerprinter.invalidate('blocks', block_id)
+
+    def _lookup(self, task: CompilationTask) -> Tuple[str, Optional[CompilationArtifacts]]:
+        fingerprint = self.fingerprint(task)
+        return fingerprint, self._cache.get(fingerprint) if self._cache is not None else None
+
+    def _compile_and_store(self, task: CompilationTask, fingerprint: str) -> CompilationArtifacts:
+        artifacts = self._compile(task)
+        if self._cache is not None:
+            self._cache.put(fingerprint, artifacts)
+        return artifacts
+
+    def _compile(self, task: CompilationTask) -> CompilationArtifacts:
+        if not self._trusted:
+            validate_recipe_file(task.recipe_name, task.sources)
+        return _compile_with_resolver(task, self._resolver, trusted=self._trusted, passes=self._passes)
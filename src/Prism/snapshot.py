@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+# prism/snapshot.py
+
+import io
+import json
+import pickle
+from typing import Any, Dict, Union
+
+from pydantic import ValidationError
+
+from .models.ir import IRModel
+from .exceptions import SnapshotError
+
+# IR 结构或编码发生不兼容的变化时递增; 加载时拒绝其他版本的快照
+# 版本 2: 二进制编码固定使用 pickle 协议 5 (Python 3.8+ 均可读取), 不随写入快照的解释器变化
+IR_SNAPSHOT_VERSION = 2
+_PICKLE_PROTOCOL = 5
+
+_SNAPSHOT_FORMAT = "prism-ir"
+_BINARY_MAGIC = b"PRISMIR\x00"
+
+class _PlainDataUnpickler(pickle.Unpickler):
+    """Only allows builtin containers and scalars, so loading a snapshot can never execute code."""
+    def find_class(self, module: str, name: str) -> Any:
+        raise pickle.UnpicklingError(f"Global '{module}.{name}' is not allowed in an IR snapshot")
+
+def _envelope(ir: IRModel) -> Dict[str, Any]:
+    return {"format": _SNAPSHOT_FORMAT, "version": IR_SNAPSHOT_VERSION, "ir": ir.model_dump(mode="json")}
+
+def dump_ir(ir: IRModel) -> str:
+    """Serialize an IR to compact, versioned JSON."""
+    return json.dumps(_envelope(ir), ensure_ascii=False, separators=(",", ":"))
+
+def dump_ir_binary(ir: IRModel) -> bytes:
+    """Serialize an IR to the versioned binary encoding, which loads faster than JSON."""
+    return _BINARY_MAGIC + pickle.dumps(_envelope(ir), protocol=_PICKLE_PROTOCOL)
+
+def load_ir(data: Union[str, bytes], source: str = "<memory>") -> IRModel:
+    """
+    Load an IR written by `dump_ir` or `dump_ir_binary`; the encoding is detected
+    automatically. No YAML parsing, schema validation or import resolution happens.
+    """
+    try:
+        if isinstance(data, bytes) and data.startswith(_BINARY_MAGIC):
+            payload = _PlainDataUnpickler(io.BytesIO(data[len(_BINARY_MAGIC):])).load()
+        else:
+            payload = json.loads(data)
+    except (ValueError, pickle.UnpicklingError, EOFError) as e:
+        raise SnapshotError(source=source, reason=f"Unreadable snapshot: {e}") from e
+
+    if not isinstance(payload, dict) or payload.get("format") != _SNAPSHOT_FORMAT:
+        raise SnapshotError(source=source, reason="Not a Prism IR snapshot")
+    if payload.get("version") != IR_SNAPSHOT_VERSION:
+        raise SnapshotError(
+            source=source,
+            reason=f"Snapshot version {payload.get('version')!r} is not supported (expected {IR_SNAPSHOT_VERSION})"
+        )
+    try:
+        return IRModel.model_validate(payload["ir"])
+    except (KeyError, ValidationError) as e:
+        raise SnapshotError(source=source, reason=f"Invalid IR content: {e}") from e
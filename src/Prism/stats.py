@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+# prism/stats.py
+
+import math
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Dict, FrozenSet, List, Mapping, Optional, Tuple, Union
+
+import jinja2
+
+from .analysis import analyze_template, template_variables
+from .generators.jinja_aggregator import JinjaAggregator
+from .models.ir import IRModel, ResolvedBlock
+
+Tokenizer = Callable[[str], int]
+
+# 'approx': 离线近似估计, 不依赖任何模型文件 (默认)
+# 'tiktoken': OpenAI 的 BPE 分词, 需要安装可选依赖 tiktoken, 首次使用可能需要下载词表
+TOKENIZERS = ('approx', 'tiktoken')
+
+# 近似分词: 字母单词按长度切分, 数字每 3 位一个 token, 标点和 CJK 字符各算一个 token
+_CJK = "\u3040-\u30ff\u3400-\u9fff\uac00-\ud7af\uf900-\ufaff"
+_TOKEN_PIECES = re.compile(rf"[{_CJK}]|[^\W\d_{_CJK}]+|\d{{1,3}}|[^\w\s]")
+_WORD_CHARS_PER_TOKEN = 8
+
+# 渲染静态部分时, 运行时变量 (及其属性和下标) 都视为空;
+# 保留片段末尾的换行, 它们在完整的 prompt 中位于中间, 不会被去掉
+_STATIC_ENV = jinja2.Environment(undefined=jinja2.ChainableUndefined, keep_trailing_newline=True)
+
+def approximate_tokens(text: str) -> int:
+    """
+    Offline estimate of the number of BPE tokens in `text`: one token per short
+    word, number group or punctuation mark, more for long words, one per CJK
+    character. Good enough for budgets and trends; use a real tokenizer for billing.
+    """
+    count = 0
+    for piece in _TOKEN_PIECES.findall(text):
+        count += math.ceil(len(piece) / _WORD_CHARS_PER_TOKEN) if piece.isalpha() else 1
+    return count
+
+def make_tokenizer(name: str = 'approx', encoding: str = 'cl100k_base') -> Tokenizer:
+    """A token counter by name, see TOKENIZERS. `encoding` selects the tiktoken encoding."""
+    if name == 'approx':
+        return approximate_tokens
+    if name == 'tiktoken':
+        import tiktoken
+
+        encoder = tiktoken.get_encoding(encoding)
+        return lambda text: len(encoder.encode(text, disallowed_special=()))
+    raise ValueError(f"Unknown tokenizer '{name}', expected one of {TOKENIZERS}")
+
+def static_text(template_source: str) -> str:
+    """
+    The text of an aggregated template that does not depend on runtime data:
+    variables render as empty and loops over runtime data run zero times.
+    A template that cannot be rendered on its own is returned unchanged.
+    """
+    text = _render_static(template_source)
+    return template_source if text is None else text
+
+@lru_cache(maxsize=8192)
+def _render_static(template_source: str) -> Optional[str]:
+    try:
+        return _STATIC_ENV.from_string(template_source).render()
+    except jinja2.TemplateError:
+        return None
+
+def is_bounded(schema: Any) -> bool:
+    """True if a contract property limits the size of its values (enum, maxLength, maxItems, ...)."""
+    if not isinstance(schema, dict):
+        return False
+    if "enum" in schema or "const" in schema:
+        return True
+    types = schema.get("type")
+    types = set(types) if isinstance(types, list) else {types}
+    if types and types.issubset({"boolean", "integer", "number", "null"}):
+        return True
+    if types == {"string"}:
+        return "maxLength" in schema
+    if types == {"array"}:
+        return "maxItems" in schema and is_bounded(schema.get("items"))
+    if types == {"object"}:
+        properties = schema.get("properties")
+        return (
+            schema.get("additionalProperties") is False
+            and isinstance(properties, dict)
+            and all(is_bounded(value) for value in properties.values())
+        )
+    return False
+
+@dataclass(frozen=True)
+class BlockStats:
+    source_ref: str
+    block_id: str
+    variant_id: str
+    chars: int
+    tokens: int
+    runtime_variables: FrozenSet[str]
+
+@dataclass(frozen=True)
+class RecipeStats:
+    """Static size of one compiled prompt: what every request pays before any runtime data is added."""
+    recipe_name: str
+    chars: int
+    tokens: int
+    blocks: Tuple[BlockStats, ...]
+    runtime_variables: FrozenSet[str]
+    # 合约中没有长度限制, 或根本没有出现在合约中的运行时变量
+    unbounded_variables: FrozenSet[str]
+
+    def over_budget(self, max_chars: Optional[int] = None, max_tokens: Optional[int] = None) -> List[str]:
+        """Why the static portion exceeds the budget; empty if it does not."""
+        reasons = []
+        if max_chars is not None and self.chars > max_chars:
+            reasons.append(f"{self.chars:,} static chars > {max_chars:,}")
+        if max_tokens is not None and self.tokens > max_tokens:
+            reasons.append(f"{self.tokens:,} static tokens > {max_tokens:,}")
+        return reasons
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "recipe": self.recipe_name,
+            "chars": self.chars,
+            "tokens": self.tokens,
+            "runtime_variables": sorted(self.runtime_variables),
+            "unbounded_variables": sorted(self.unbounded_variables),
+            "blocks": [
+                {
+                    "source_ref": block.source_ref,
+                    "block_id": block.block_id,
+                    "variant_id": block.variant_id,
+                    "chars": block.chars,
+                    "tokens": block.tokens,
+                    "runtime_variables": sorted(block.runtime_variables),
+                }
+                for block in self.blocks
+            ],
+        }
+
+class PromptAnalyzer:
+    """
+    Measures the static portion of compiled prompts from their IR, per recipe and
+    per ResolvedBlock, without rendering any runtime data. Text shared between
+    recipes (blocks, literals) is rendered and tokenized once.
+    """
+    def __init__(self, tokenizer: Union[str, Tokenizer] = 'approx'):
+        counter = make_tokenizer(tokenizer) if isinstance(tokenizer, str) else tokenizer
+        self._count_tokens = lru_cache(maxsize=16384)(counter)
+
+    def analyze(self, ir: IRModel, recipe_name: Optional[str] = None) -> RecipeStats:
+        """Raises GenerationError, like compilation, if the IR cannot be aggregated."""
+        # 每个片段 (字面量或单独聚合的 Block) 的模板文本; 拼接起来就是 JinjaAggregator 的完整输出
+        fragments: List[str] = []
+        blocks: List[BlockStats] = []
+        for item in ir.render_sequence:
+            if not isinstance(item, ResolvedBlock):
+                fragments.append(item.content)
+                continue
+            fragment = JinjaAggregator.aggregate(IRModel.model_construct(
+                source_recipe_meta=ir.source_recipe_meta,
+                render_sequence=[item],
+                aggregated_contracts=ir.aggregated_contracts
+            ))
+            fragments.append(fragment)
+            text = static_text(fragment)
+            blocks.append(BlockStats(
+                source_ref=item.source_ref,
+                block_id=item.source_block_meta.id,
+                variant_id=item.source_variant_id,
+                chars=len(text),
+                tokens=self._count_tokens(text),
+                runtime_variables=frozenset(analyze_template(item.template_content).missing(item.merged_defaults.keys()))
+            ))
+
+        # 片段通常各自是完整的模板, 结果按片段缓存, 在 recipe 之间共享;
+        # 只有某个片段无法单独渲染 (例如 if 跨越多个片段) 时才处理完整模板
+        statics = [_render_static(fragment) for fragment in fragments]
+        if all(text is not None for text in statics):
+            text = "".join(statics)  # type: ignore[arg-type]
+            runtime_variables = frozenset().union(*(template_variables(fragment) for fragment in fragments))
+        else:
+            template = "".join(fragments)
+            text = static_text(template)
+            runtime_variables = template_variables(template)
+        # 与运行时渲染环境一致, 完整模板末尾的一个换行不会出现在 prompt 中
+        if fragments and fragments[-1].endswith("\n") and text.endswith("\n"):
+            text = text[:-1]
+
+        properties = _contract_properties(ir)
+        return RecipeStats(
+            recipe_name=recipe_name or ir.source_recipe_meta.id,
+            chars=len(text),
+            tokens=self._count_tokens(text),
+            blocks=tuple(blocks),
+            runtime_variables=runtime_variables,
+            unbounded_variables=frozenset(name for name in runtime_variables if not is_bounded(properties.get(name)))
+        )
+
+def _contract_properties(ir: IRModel) -> Mapping[str, Any]:
+    properties: Dict[str, Any] = {}
+    for contract in ir.aggregated_contracts.values():
+        contract_properties = contract.data.get("properties")
+        if isinstance(contract_properties, dict):
+            properties.update(contract_properties)
+    return properties
@@ -0,0 +1,16 @@
+# Prism/stores/__init__.py
+
+from .base import AssetStore, ASSET_KINDS
+from .memory import MemoryAssetStore
+from .filesystem import FileSystemAssetStore
+from .zip import ZipAssetStore
+from .sqlite import SQLiteAssetStore
+
+__all__ = [
+    "AssetStore",
+    "ASSET_KINDS",
+    "MemoryAssetStore",
+    "FileSystemAssetStore",
+    "ZipAssetStore",
+    "SQLiteAssetStore"
+]
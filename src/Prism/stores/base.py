@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+# stores/base.py
+
+import fnmatch
+from abc import ABC, abstractmethod
+from functools import partial
+from typing import Any, Iterable, List, Optional, Set
+
+from ..entities import CompilationSources, CompilationTask
+from ..exceptions import ResolutionError
+from ..graph import DependencyGraph, Node
+from ..lazy import LazyMapping
+
+# 资源类型, 与 CompilationSources / SourceChanges 的字段名一致
+ASSET_KINDS = ('templates', 'dataschemas', 'blocks', 'recipes')
+
+# 资源类型 -> DependencyGraph 的节点类型
+GRAPH_NODE_KINDS = {'templates': 'template', 'dataschemas': 'dataschema', 'blocks': 'block', 'recipes': 'recipe'}
+
+class AssetStore(ABC):
+    """
+    Storage backend for the raw assets of a project: template text, and the parsed
+    data of dataschemas, blocks and recipes, addressed by kind and ID.
+
+    Backends implement `ids`, `get`, `put` and `delete`; building CompilationSources,
+    recipes and affected-recipe queries on top of them is shared. Backends with an
+    index of their own (see `SQLiteAssetStore`) override the queries.
+    """
+    # 在错误信息中标识该存储, 例如目录或数据库文件路径
+    location: str = "<store>"
+
+    @abstractmethod
+    def ids(self, kind: str) -> List[str]:
+        """Sorted IDs of every asset of the given kind."""
+
+    @abstractmethod
+    def get(self, kind: str, asset_id: str) -> Any:
+        """The content of one asset. Raises ResolutionError if it does not exist."""
+
+    @abstractmethod
+    def put(self, kind: str, asset_id: str, content: Any) -> None:
+        """Create or replace an asset."""
+
+    @abstractmethod
+    def delete(self, kind: str, asset_id: str) -> None:
+        """Remove an asset; removing a missing asset is not an error."""
+
+    def contains(self, kind: str, asset_id: str) -> bool:
+        return asset_id in self.ids(kind)
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> "AssetStore":
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
+
+    # --- 组合查询 ---
+
+    def load_sources(self, lazy: bool = False) -> CompilationSources:
+        """
+        The templates, dataschemas and blocks as CompilationSources. With `lazy=True`
+        each field is a LazyMapping and an asset is fetched when first looked up.
+        """
+        fields = {}
+        for kind in ('templates', 'dataschemas', 'blocks'):
+            ids = self.ids(kind)
+            if lazy:
+                fields[kind] = LazyMapping({asset_id: partial(self.get, kind, asset_id) for asset_id in ids})
+            else:
+                fields[kind] = {asset_id: self.get(kind, asset_id) for asset_id in ids}
+        return CompilationSources(**fields)
+
+    def recipe_names(self, pattern: str = "*") -> List[str]:
+        return [name for name in self.ids('recipes') if fnmatch.fnmatchcase(name, pattern)]
+
+    def load_recipe(self, recipe_name: str) -> CompilationTask:
+        return CompilationTask(recipe_name=recipe_name, sources=self.get('recipes', recipe_name))
+
+    def load_recipes(self, recipe_names: Optional[Iterable[str]] = None) -> List[CompilationTask]:
+        names = self.recipe_names() if recipe_names is None else list(recipe_names)
+        return [self.load_recipe(name) for name in names]
+
+    def dependency_graph(self) -> DependencyGraph:
+        sources = self.load_sources(lazy=True)
+        return DependencyGraph.build(sources, {name: self.get('recipes', name) for name in self.ids('recipes')})
+
+    def affected_recipes(self, nodes: Iterable[Node]) -> Set[str]:
+        """
+        Names of the recipes affected by changes to `nodes` (DependencyGraph nodes such
+        as ('block', 'persona')). The default builds the whole graph; indexed
+        backends answer from their index.
+        """
+        return self.dependency_graph().affected_recipes(nodes)
+
+    def _not_found(self, kind: str, asset_id: str) -> ResolutionError:
+        return ResolutionError(asset_type=GRAPH_NODE_KINDS.get(kind, kind), identifier=asset_id, source_context=self.location)
+
+    @staticmethod
+    def _check_kind(kind: str) -> None:
+        if kind not in ASSET_KINDS:
+            raise ValueError(f"Unknown asset kind '{kind}', expected one of {ASSET_KINDS}")
@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+# stores/filesystem.py
+
+import fnmatch
+import glob
+import json
+import os
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+import yaml
+
+from ..exceptions import StoreError
+from .base import AssetStore, ASSET_KINDS
+
+# 有 LibYAML 时使用 C 实现的解析器, 结果与纯 Python 的 SafeLoader 相同
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+# 读取钩子: (文件路径, 文本解析函数) -> 解析结果, 例如带缓存的读取
+FileReader = Callable[[Path, Callable[[str], Any]], Any]
+
+def parse_yaml(text: str) -> Any:
+    return yaml.load(text, Loader=_YAML_LOADER)
+
+class FileSystemAssetStore(AssetStore):
+    """
+    One directory per asset kind, one file per asset, the asset ID being the part of
+    the file name before the first dot (e.g. `blocks/persona.block.yaml`).
+
+    Templates are `.jinja` text; dataschemas, blocks and recipes may be YAML or
+    JSON. `reader` replaces the plain read-and-parse of data files, which lets a
+    caller put a parse cache in front of the disk.
+    """
+    # 资源类型 -> 文件名模式, 通配符只出现在开头 (即资源 ID), 按 ID 查找时只需检查几个确定的文件名
+    # 除模板外, 每种资源都可以写成 YAML (便于手工编辑) 或 JSON (解析更快, 适合机器生成)
+    ASSET_PATTERNS: Dict[str, Tuple[str, ...]] = {
+        'templates': ("*.jinja",),
+        'dataschemas': ("*.dataschema.yaml", "*.dataschema.yml", "*.dataschema.json"),
+        'blocks': ("*.block.yaml", "*.block.yml", "*.block.json"),
+        'recipes': ("*.recipe.yaml", "*.recipe.json"),
+    }
+
+    def __init__(self, directories: Mapping[str, Path], reader: Optional[FileReader] = None):
+        missing = [kind for kind in ASSET_KINDS if kind not in directories]
+        if missing:
+            raise ValueError(f"No directory given for asset kind(s): {', '.join(missing)}")
+        self.directories: Dict[str, Path] = {kind: Path(directories[kind]) for kind in ASSET_KINDS}
+        self.reader = reader
+        self.location = str(os.path.commonpath([str(d) for d in self.directories.values()]))
+
+    @classmethod
+    def for_project(cls, project_path: Path, reader: Optional[FileReader] = None) -> "FileSystemAssetStore":
+        """The standard project layout: `templates/`, `dataschemas/`, `blocks/` and `recipes/`."""
+        project_path = Path(project_path)
+        return cls({kind: project_path / kind for kind in ASSET_KINDS}, reader=reader)
+
+    # --- 文件层面 ---
+
+    def files(self, kind: str) -> List[Path]:
+        """Sorted paths of every file of the given kind, in any supported format."""
+        self._check_kind(kind)
+        dir_path = self.directories[kind]
+        patterns = self.ASSET_PATTERNS[kind]
+        try:
+            # 一次 scandir 即可拿到文件名和类型, 在网络文件系统上比 glob 逐个模式遍历少很多往返
+            with os.scandir(dir_path) as entries:
+                names = [
+                    entry.name for entry in entries
+                    if any(fnmatch.fnmatch(entry.name, p) for p in patterns) and entry.is_file()
+                ]
+        except (FileNotFoundError, NotADirectoryError):
+            return []
+        return [dir_path / name for name in sorted(names)]
+
+    def paths(self, kind: str, asset_id: str) -> List[Path]:
+        """The existing files that define `asset_id`, found without listing the directory when possible."""
+        self._check_kind(kind)
+        dir_path = self.directories[kind]
+        found = set()
+        for pattern in self.ASSET_PATTERNS[kind]:
+            name = glob.escape(asset_id) + pattern[1:]
+            if glob.has_magic(pattern[1:]):
+                found.update(p for p in dir_path.glob(name) if p.is_file())
+            else:
+                candidate = dir_path / (asset_id + pattern[1:])
+                if candidate.is_file():
+                    found.add(candidate)
+        return sorted(found)
+
+    def classify(self, file_path: Path) -> Optional[Tuple[str, str]]:
+        """Return (kind, asset_id) for a file inside the store, or None if it is not an asset."""
+        for kind, dir_path in self.directories.items():
+            if file_path.parent == dir_path and any(fnmatch.fnmatch(file_path.name, p) for p in self.ASSET_PATTERNS[kind]):
+                return kind, self.asset_id(file_path)
+        return None
+
+    @staticmethod
+    def asset_id(file_path: Path) -> str:
+        # ID 是文件名中第一个点之前的部分
+        return file_path.name.split('.')[0]
+
+    def read_file(self, kind: str, file_path: Path) -> Any:
+        """Read and parse one asset file; templates are returned as text."""
+        if kind == 'templates':
+            return file_path.read_text(encoding='utf-8')
+        parser = json.loads if file_path.suffix == '.json' else parse_yaml
+        if self.reader is not None:
+            return self.reader(file_path, parser)
+        return parser(file_path.read_text(encoding='utf-8'))
+
+    # --- AssetStore ---
+
+    def ids(self, kind: str) -> List[str]:
+        return sorted({self.asset_id(path) for path in self.files(kind)})
+
+    def contains(self, kind: str, asset_id: str) -> bool:
+        return bool(self.paths(kind, asset_id))
+
+    def get(self, kind: str, asset_id: str) -> Any:
+        paths = self.paths(kind, asset_id)
+        if not paths:
+            raise self._not_found(kind, asset_id)
+        if len(paths) > 1:
+            raise StoreError(self.location, f"{kind} ID '{asset_id}' is defined in more than one file: {', '.join(p.name for p in paths)}")
+        try:
+            return self.read_file(kind, paths[0])
+        except Exception as e:
+            raise StoreError(self.location, f"Failed to read '{paths[0]}': {e}") from e
+
+    def put(self, kind: str, asset_id: str, content: Any) -> None:
+        """Write an asset, keeping the format of its existing file; new data files are written as YAML."""
+        paths = self.paths(kind, asset_id)
+        if len(paths) > 1:
+            raise StoreError(self.location, f"{kind} ID '{asset_id}' is defined in more than one file: {', '.join(p.name for p in paths)}")
+        if paths:
+            file_path = paths[0]
+        elif kind == 'templates':
+            file_path = self.directories[kind] / f"{asset_id}.jinja"
+        else:
+            file_path = self.directories[kind] / f"{asset_id}.{kind[:-1]}.yaml"
+
+        try:
+            if kind == 'templates':
+                text = content
+            elif file_path.suffix == '.json':
+                text = json.dumps(content, ensure_ascii=False, indent=2) + "\n"
+            else:
+                text = yaml.safe_dump(content, allow_unicode=True, sort_keys=False)
+        except (TypeError, ValueError, yaml.YAMLError) as e:
+            raise StoreError(self.location, f"Cannot store {kind} '{asset_id}' in '{file_path.name}': {e}") from e
+        try:
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            file_path.write_text(text, encoding='utf-8')
+        except OSError as e:
+            raise StoreError(self.location, f"Failed to write '{file_path}': {e}") from e
+
+    def delete(self, kind: str, asset_id: str) -> None:
+        for file_path in self.paths(kind, asset_id):
+            try:
+                file_path.unlink()
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                raise StoreError(self.location, f"Failed to delete '{file_path}': {e}") from e
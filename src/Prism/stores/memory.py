@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+# stores/memory.py
+
+from typing import Any, Dict, Iterable, List, Optional
+
+from ..entities import CompilationSources, CompilationTask
+from .base import AssetStore, ASSET_KINDS
+
+class MemoryAssetStore(AssetStore):
+    """Dict-backed store, e.g. for tests or assets generated in-process."""
+    location = "<memory>"
+
+    def __init__(self, sources: Optional[CompilationSources] = None, recipes: Iterable[CompilationTask] = ()):
+        self._assets: Dict[str, Dict[str, Any]] = {kind: {} for kind in ASSET_KINDS}
+        if sources is not None:
+            self._assets['templates'].update(sources.templates)
+            self._assets['dataschemas'].update(sources.dataschemas)
+            self._assets['blocks'].update(sources.blocks)
+        for task in recipes:
+            self._assets['recipes'][task.recipe_name] = task.sources
+
+    def ids(self, kind: str) -> List[str]:
+        self._check_kind(kind)
+        return sorted(self._assets[kind])
+
+    def get(self, kind: str, asset_id: str) -> Any:
+        self._check_kind(kind)
+        try:
+            return self._assets[kind][asset_id]
+        except KeyError:
+            raise self._not_found(kind, asset_id) from None
+
+    def put(self, kind: str, asset_id: str, content: Any) -> None:
+        self._check_kind(kind)
+        self._assets[kind][asset_id] = content
+
+    def delete(self, kind: str, asset_id: str) -> None:
+        self._check_kind(kind)
+        self._assets[kind].pop(asset_id, None)
+
+    def contains(self, kind: str, asset_id: str) -> bool:
+        self._check_kind(kind)
+        return asset_id in self._assets[kind]
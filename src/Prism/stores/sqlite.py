@@ -0,0 +1,238 @@
+# -*- coding: utf-8 -*-
+# stores/sqlite.py
+
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Iterable, Iterator, List, Set, Tuple, Union
+
+from ..exceptions import StoreError
+from ..graph import DependencyGraph, Node
+from .base import AssetStore, ASSET_KINDS
+
+# 数据库结构版本, 存在 PRAGMA user_version 中; 结构变化时递增
+SQLITE_STORE_VERSION = 1
+
+# edges 中的每条边都记录产生它的资源 (owner), 资源被替换或删除时按 owner 整体删除,
+# 边的语义与 DependencyGraph 完全一致: recipe -> block, recipe -> variant, variant -> block / template / dataschema
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS assets (
+    kind TEXT NOT NULL,
+    id TEXT NOT NULL,
+    content TEXT NOT NULL,
+    PRIMARY KEY (kind, id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS variants (
+    block_id TEXT NOT NULL,
+    variant_id TEXT NOT NULL,
+    template_id TEXT,
+    contract_id TEXT,
+    PRIMARY KEY (block_id, variant_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS edges (
+    owner_kind TEXT NOT NULL,
+    owner_id TEXT NOT NULL,
+    src_kind TEXT NOT NULL,
+    src_id TEXT NOT NULL,
+    dst_kind TEXT NOT NULL,
+    dst_id TEXT NOT NULL,
+    PRIMARY KEY (owner_kind, owner_id, src_kind, src_id, dst_kind, dst_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS edges_by_dst ON edges (dst_kind, dst_id, src_kind, src_id);
+CREATE INDEX IF NOT EXISTS edges_by_src ON edges (src_kind, src_id, dst_kind, dst_id);
+"""
+
+# 沿反向边找出所有依赖给定节点的 recipe; UNION 去重, 有环也会终止
+_AFFECTED_SQL = """
+WITH RECURSIVE reached(kind, id) AS (
+    SELECT kind, id FROM changed
+    UNION
+    SELECT e.src_kind, e.src_id FROM edges e JOIN reached r ON e.dst_kind = r.kind AND e.dst_id = r.id
+)
+SELECT DISTINCT id FROM reached WHERE kind = 'recipe' ORDER BY id
+"""
+
+_DEPENDENCIES_SQL = """
+WITH RECURSIVE reached(kind, id) AS (
+    SELECT 'recipe', ?
+    UNION
+    SELECT e.dst_kind, e.dst_id FROM edges e JOIN reached r ON e.src_kind = r.kind AND e.src_id = r.id
+)
+SELECT kind, id FROM reached WHERE NOT (kind = 'recipe' AND id = ?)
+"""
+
+class SQLiteAssetStore(AssetStore):
+    """
+    Assets in a single SQLite database, together with an index of block variants
+    and of the dependency edges between assets.
+
+    Every lookup goes through a B-tree primary key, and `affected_recipes` walks
+    the edge index with a recursive query, so neither has to read the rest of the
+    project. The index is maintained by `put` and `delete`. A store can be shared
+    between threads; writes are serialized.
+    """
+    def __init__(self, path: Union[str, Path] = ":memory:"):
+        self.location = str(path)
+        try:
+            self._conn = sqlite3.connect(self.location, check_same_thread=False)
+            version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+            has_tables = self._conn.execute("SELECT count(*) FROM sqlite_master WHERE type = 'table'").fetchone()[0]
+            if has_tables and version != SQLITE_STORE_VERSION:
+                self._conn.close()
+                raise StoreError(self.location, f"Store version {version} is not supported (expected {SQLITE_STORE_VERSION})")
+            self._conn.execute("PRAGMA journal_mode = WAL")
+            self._conn.executescript(_SCHEMA)
+            self._conn.execute(f"PRAGMA user_version = {SQLITE_STORE_VERSION}")
+            self._conn.commit()
+        except sqlite3.Error as e:
+            raise StoreError(self.location, str(e)) from e
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_store(cls, path: Union[str, Path], store: AssetStore) -> "SQLiteAssetStore":
+        """Create (or refresh) a database holding every asset of `store`."""
+        sqlite_store = cls(path)
+        sqlite_store.import_from(store)
+        return sqlite_store
+
+    def close(self) -> None:
+        self._conn.close()
+
+    # --- AssetStore ---
+
+    def ids(self, kind: str) -> List[str]:
+        self._check_kind(kind)
+        rows = self._query("SELECT id FROM assets WHERE kind = ? ORDER BY id", (kind,))
+        return [row[0] for row in rows]
+
+    def contains(self, kind: str, asset_id: str) -> bool:
+        self._check_kind(kind)
+        return bool(self._query("SELECT 1 FROM assets WHERE kind = ? AND id = ?", (kind, asset_id)))
+
+    def get(self, kind: str, asset_id: str) -> Any:
+        self._check_kind(kind)
+        rows = self._query("SELECT content FROM assets WHERE kind = ? AND id = ?", (kind, asset_id))
+        if not rows:
+            raise self._not_found(kind, asset_id)
+        return json.loads(rows[0][0])
+
+    def put(self, kind: str, asset_id: str, content: Any) -> None:
+        self._check_kind(kind)
+        self._write(self._put_rows([(kind, asset_id, content)]))
+
+    def delete(self, kind: str, asset_id: str) -> None:
+        self._check_kind(kind)
+        self._write([
+            ("DELETE FROM assets WHERE kind = ? AND id = ?", [(kind, asset_id)]),
+            ("DELETE FROM edges WHERE owner_kind = ? AND owner_id = ?", [(kind, asset_id)]),
+        ] + ([("DELETE FROM variants WHERE block_id = ?", [(asset_id,)])] if kind == 'blocks' else []))
+
+    def import_from(self, store: AssetStore) -> int:
+        """Copy every asset of `store` in a single transaction; returns the number of assets written."""
+        items = [(kind, asset_id, store.get(kind, asset_id)) for kind in ASSET_KINDS for asset_id in store.ids(kind)]
+        self._write(self._put_rows(items))
+        return len(items)
+
+    # --- 索引查询 ---
+
+    def variant_ids(self, block_id: str) -> List[str]:
+        rows = self._query("SELECT variant_id FROM variants WHERE block_id = ? ORDER BY variant_id", (block_id,))
+        return [row[0] for row in rows]
+
+    def blocks_using(self, kind: str, asset_id: str) -> List[Tuple[str, str]]:
+        """(block_id, variant_id) of the variants that use a template or dataschema."""
+        column = {'templates': 'template_id', 'dataschemas': 'contract_id'}.get(kind)
+        if column is None:
+            raise ValueError(f"Only templates and dataschemas are used by variants, got '{kind}'")
+        rows = self._query(f"SELECT block_id, variant_id FROM variants WHERE {column} = ? ORDER BY block_id, variant_id", (asset_id,))
+        return [(row[0], row[1]) for row in rows]
+
+    def affected_recipes(self, nodes: Iterable[Node]) -> Set[str]:
+        nodes = list(nodes)
+        if not nodes:
+            return set()
+        with self._lock:
+            try:
+                self._conn.execute("CREATE TEMP TABLE IF NOT EXISTS changed (kind TEXT, id TEXT)")
+                self._conn.execute("DELETE FROM changed")
+                self._conn.executemany("INSERT INTO changed VALUES (?, ?)", nodes)
+                rows = self._conn.execute(_AFFECTED_SQL).fetchall()
+                self._conn.execute("DELETE FROM changed")
+                self._conn.commit()
+            except sqlite3.Error as e:
+                self._conn.rollback()
+                raise StoreError(self.location, str(e)) from e
+        return {row[0] for row in rows}
+
+    def recipe_dependencies(self, recipe_name: str) -> Set[Node]:
+        """Every node a recipe transitively reaches, as DependencyGraph.dependencies would report it."""
+        return {(row[0], row[1]) for row in self._query(_DEPENDENCIES_SQL, (recipe_name, recipe_name))}
+
+    # --- internals ---
+
+    def _put_rows(self, items: Iterable[Tuple[str, str, Any]]) -> List[Tuple[str, List[tuple]]]:
+        assets, owners, blocks, variants, edges = [], [], [], [], []
+        for kind, asset_id, content in items:
+            try:
+                text = json.dumps(content, ensure_ascii=False, separators=(",", ":"))
+            except (TypeError, ValueError) as e:
+                raise StoreError(self.location, f"Cannot store {kind} '{asset_id}' as JSON: {e}") from e
+            assets.append((kind, asset_id, text))
+            owners.append((kind, asset_id))
+            if kind == 'blocks':
+                blocks.append((asset_id,))
+                variants.extend(self._variant_rows(asset_id, content))
+            edges.extend(
+                (kind, asset_id, src_kind, src_id, dst_kind, dst_id)
+                for (src_kind, src_id), (dst_kind, dst_id) in self._edges_of(kind, asset_id, content)
+            )
+        return [
+            ("DELETE FROM edges WHERE owner_kind = ? AND owner_id = ?", owners),
+            ("DELETE FROM variants WHERE block_id = ?", blocks),
+            ("INSERT OR REPLACE INTO assets VALUES (?, ?, ?)", assets),
+            ("INSERT OR IGNORE INTO variants VALUES (?, ?, ?, ?)", variants),
+            ("INSERT OR IGNORE INTO edges VALUES (?, ?, ?, ?, ?, ?)", edges),
+        ]
+
+    @staticmethod
+    def _variant_rows(block_id: str, block_data: Any) -> Iterator[tuple]:
+        variants = block_data.get("variants") if isinstance(block_data, dict) else None
+        for variant in variants if isinstance(variants, list) else []:
+            if isinstance(variant, dict) and isinstance(variant.get("id"), str):
+                template_id = variant.get("template_id")
+                contract_id = variant.get("contract_id")
+                yield (
+                    block_id, variant["id"],
+                    template_id if isinstance(template_id, str) else None,
+                    contract_id if isinstance(contract_id, str) else None,
+                )
+
+    @staticmethod
+    def _edges_of(kind: str, asset_id: str, content: Any) -> List[Tuple[Node, Node]]:
+        # 由 DependencyGraph 计算单个资源的边, 保证与内存中的依赖图语义一致
+        graph = DependencyGraph()
+        if kind == 'blocks':
+            graph.set_block(asset_id, content)
+        elif kind == 'recipes':
+            graph.set_recipe(asset_id, content)
+        else:
+            return []
+        return [((src[0], src[1]), (dst[0], dst[1])) for src, dst in graph.to_dict()["edges"]]
+
+    def _query(self, sql: str, params: tuple = ()) -> List[tuple]:
+        with self._lock:
+            try:
+                return self._conn.execute(sql, params).fetchall()
+            except sqlite3.Error as e:
+                raise StoreError(self.location, str(e)) from e
+
+    def _write(self, statements: List[Tuple[str, List[tuple]]]) -> None:
+        with self._lock:
+            try:
+                with self._conn:
+                    for sql, rows in statements:
+                        if rows:
+                            self._conn.executemany(sql, rows)
+            except sqlite3.Error as e:
+                raise StoreError(self.location, str(e)) from e
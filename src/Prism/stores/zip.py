@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+# stores/zip.py
+
+import json
+import os
+import tempfile
+import threading
+import zipfile
+from pathlib import Path
+from typing import Any, Dict, List
+
+from ..exceptions import StoreError
+from .base import AssetStore, ASSET_KINDS
+from .filesystem import FileSystemAssetStore, parse_yaml
+
+class ZipAssetStore(AssetStore):
+    """
+    Read-only store over a zip archive laid out like a project directory
+    (`templates/x.jinja`, `blocks/x.block.json`, ...), e.g. a project shipped as one
+    file. The member index is built when the archive is opened; members are
+    decompressed on demand.
+    """
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.location = str(self.path)
+        try:
+            self._zip = zipfile.ZipFile(self.path)
+        except (OSError, zipfile.BadZipFile) as e:
+            raise StoreError(self.location, str(e)) from e
+        # ZipFile 共享同一个文件句柄, 多线程读取时需要串行化
+        self._lock = threading.Lock()
+        self._members: Dict[str, Dict[str, str]] = {kind: {} for kind in ASSET_KINDS}
+
+        # 复用文件系统存储的识别规则, 保证与项目目录一一对应
+        layout = FileSystemAssetStore.for_project(Path("/"))
+        for name in self._zip.namelist():
+            classified = layout.classify(Path("/") / name)
+            if classified is None:
+                continue
+            kind, asset_id = classified
+            if asset_id in self._members[kind]:
+                self.close()
+                raise StoreError(self.location, f"{kind} ID '{asset_id}' is defined in more than one member")
+            self._members[kind][asset_id] = name
+
+    @classmethod
+    def write(cls, path: Path, store: AssetStore) -> Path:
+        """Pack every asset of `store` into a zip archive; data files are written as JSON."""
+        path = Path(path)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        except OSError as e:
+            raise StoreError(str(path), str(e)) from e
+        try:
+            with os.fdopen(fd, "wb") as f, zipfile.ZipFile(f, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+                for kind in ASSET_KINDS:
+                    for asset_id in store.ids(kind):
+                        content = store.get(kind, asset_id)
+                        if kind == 'templates':
+                            archive.writestr(f"{kind}/{asset_id}.jinja", content)
+                        else:
+                            archive.writestr(
+                                f"{kind}/{asset_id}.{kind[:-1]}.json",
+                                json.dumps(content, ensure_ascii=False, separators=(",", ":"))
+                            )
+            os.replace(tmp_name, path)
+        except BaseException as e:
+            Path(tmp_name).unlink(missing_ok=True)
+            # TypeError / ValueError: 内容无法写成 JSON
+            if isinstance(e, (OSError, TypeError, ValueError)):
+                raise StoreError(str(path), str(e)) from e
+            raise
+        return path
+
+    def close(self) -> None:
+        self._zip.close()
+
+    def ids(self, kind: str) -> List[str]:
+        self._check_kind(kind)
+        return sorted(self._members[kind])
+
+    def contains(self, kind: str, asset_id: str) -> bool:
+        self._check_kind(kind)
+        return asset_id in self._members[kind]
+
+    def get(self, kind: str, asset_id: str) -> Any:
+        self._check_kind(kind)
+        name = self._members[kind].get(asset_id)
+        if name is None:
+            raise self._not_found(kind, asset_id)
+        try:
+            with self._lock:
+                text = self._zip.read(name).decode('utf-8')
+            if kind == 'templates':
+                return text
+            return json.loads(text) if name.endswith('.json') else parse_yaml(text)
+        except Exception as e:
+            raise StoreError(self.location, f"Failed to read member '{name}': {e}") from e
+
+    def put(self, kind: str, asset_id: str, content: Any) -> None:
+        raise StoreError(self.location, "Zip stores are read-only; use ZipAssetStore.write to create a new archive")
+
+    def delete(self, kind: str, asset_id: str) -> None:
+        raise StoreError(self.location, "Zip stores are read-only; use ZipAssetStore.write to create a new archive")
@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+# prism/validation.py
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import jinja2
+from pydantic import ValidationError
+
+from .core import _build_block_model, _build_dataschema_model
+from .entities import CompilationSources, CompilationTask
+from .exceptions import (
+    PrismError,
+    AssetValidationError,
+    ResolutionError,
+    VariantNotFoundError,
+    RecipeReferenceError,
+    TemplateValidationError
+)
+from .models.recipe import RecipeModel
+from .schemas.schema_validator import validate_recipe_file
+
+# 报告中资源类型的排列顺序, 与 DependencyGraph 的节点类型一致
+ASSET_KINDS = ('template', 'dataschema', 'block', 'recipe')
+
+# 单个待检查的资源: (类型, ID, 原始内容)
+_Asset = Tuple[str, str, Any]
+
+@dataclass(frozen=True)
+class ValidationIssue:
+    """One problem found in one asset."""
+    kind: str
+    asset_id: str
+    error: PrismError
+
+@dataclass(frozen=True)
+class ValidationReport:
+    checked: int
+    issues: List[ValidationIssue] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.issues
+
+@dataclass(frozen=True)
+class _ProjectIndex:
+    """The IDs every cross-reference check needs, shipped once to each worker."""
+    templates: Set[str]
+    dataschemas: Set[str]
+    # block ID -> 变体 ID 列表; 结构不合法的 block 记为 None, 不再对其变体做引用检查
+    variants: Dict[str, Optional[List[str]]]
+
+    @classmethod
+    def build(cls, sources: CompilationSources) -> "_ProjectIndex":
+        variants: Dict[str, Optional[List[str]]] = {}
+        for block_id, data in sources.blocks.items():
+            raw_variants = data.get("variants") if isinstance(data, dict) else None
+            if isinstance(raw_variants, list):
+                variants[block_id] = [v["id"] for v in raw_variants if isinstance(v, dict) and isinstance(v.get("id"), str)]
+            else:
+                variants[block_id] = None
+        return cls(set(sources.templates), set(sources.dataschemas), variants)
+
+# 只做语法解析, 不渲染, 所有模板共用一个环境
+_SYNTAX_ENV = jinja2.Environment()
+
+_worker_index: Optional[_ProjectIndex] = None
+
+def _init_worker(index: _ProjectIndex) -> None:
+    global _worker_index
+    _worker_index = index
+
+def _check_in_worker(asset: _Asset) -> List[ValidationIssue]:
+    if _worker_index is None:
+        raise RuntimeError("Worker process was started without a project index")
+    return _check_asset(_worker_index, asset)
+
+def validate_project(
+    sources: CompilationSources,
+    recipes: Iterable[CompilationTask] = (),
+    workers: Optional[int] = None
+) -> ValidationReport:
+    """
+    Check every template, dataschema, block and recipe of a project and collect all
+    problems instead of stopping at the first one: schema conformance, filename/ID
+    match, Jinja syntax, and references to unknown templates, dataschemas, blocks,
+    variants or composition entries.
+
+    Assets are checked in parallel across `workers` processes (the CPU count if None).
+    Issues are reported in a stable order: by asset kind, then by ID.
+    """
+    assets: List[_Asset] = []
+    assets.extend(('template', asset_id, content) for asset_id, content in sources.templates.items())
+    assets.extend(('dataschema', asset_id, data) for asset_id, data in sources.dataschemas.items())
+    assets.extend(('block', asset_id, data) for asset_id, data in sources.blocks.items())
+    assets.extend(('recipe', task.recipe_name, task.sources) for task in recipes)
+    index = _ProjectIndex.build(sources)
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(assets)))
+
+    issues: List[ValidationIssue] = []
+    if workers == 1:
+        for asset in assets:
+            issues.extend(_check_asset(index, asset))
+    else:
+        # 每个资源的检查都很轻, 按块派发以摊薄进程间通信的开销
+        chunksize = max(1, len(assets) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(index,)) as pool:
+            for asset_issues in pool.map(_check_in_worker, assets, chunksize=chunksize):
+                issues.extend(asset_issues)
+
+    issues.sort(key=lambda issue: (ASSET_KINDS.index(issue.kind), issue.asset_id))
+    return ValidationReport(checked=len(assets), issues=issues)
+
+def _check_asset(index: _ProjectIndex, asset: _Asset) -> List[ValidationIssue]:
+    kind, asset_id, data = asset
+    try:
+        errors = _CHECKS[kind](index, asset_id, data)
+    except PrismError as e:
+        errors = [e]
+    except ValidationError as e:
+        errors = [_from_pydantic(asset_id, e)]
+    return [ValidationIssue(kind=kind, asset_id=asset_id, error=error) for error in errors]
+
+def _from_pydantic(asset_id: str, error: ValidationError) -> AssetValidationError:
+    messages = [
+        f"Path '{'.'.join(map(str, detail['loc']))}': {detail['msg']}"
+        for detail in error.errors()
+    ]
+    return AssetValidationError(asset_file_name=asset_id, errors=messages, identifier=asset_id)
+
+def _check_template(index: _ProjectIndex, template_id: str, content: Any) -> List[PrismError]:
+    try:
+        _SYNTAX_ENV.parse(content)
+    except jinja2.TemplateSyntaxError as e:
+        return [TemplateValidationError(template_id=template_id, line=e.lineno, reason=e.message or str(e))]
+    return []
+
+def _check_dataschema(index: _ProjectIndex, schema_id: str, data: Any) -> List[PrismError]:
+    _build_dataschema_model(schema_id, data)
+    return []
+
+def _check_block(index: _ProjectIndex, block_id: str, data: Any) -> List[PrismError]:
+    block = _build_block_model(block_id, data)
+    errors: List[PrismError] = []
+    for variant in block.variants:
+        source_context = f"variant '{variant.id}' of block '{block_id}'"
+        if variant.template_id not in index.templates:
+            errors.append(ResolutionError(asset_type="template", identifier=variant.template_id, source_context=source_context))
+        if variant.contract_id and variant.contract_id not in index.dataschemas:
+            errors.append(ResolutionError(asset_type="dataschema", identifier=variant.contract_id, source_context=source_context))
+    return errors
+
+def _check_recipe(index: _ProjectIndex, recipe_name: str, data: Any) -> List[PrismError]:
+    validate_recipe_file(recipe_name, data)
+    recipe = RecipeModel(**data)
+    errors: List[PrismError] = []
+    # recipe 按文件名加载, meta.id 与文件名不同不是错误, 与编译器保持一致
+
+    # 与 RecipeCompiler 相同的引用键: 单例为 'persona', 多例为 'tasks[0]'
+    import_keys: List[str] = []
+    for import_key in type(recipe.imports).model_fields:
+        value = getattr(recipe.imports, import_key)
+        refs = [(import_key, value)] if not isinstance(value, list) else [(f"{import_key}[{i}]", v) for i, v in enumerate(value)]
+        for ref_key, ref in refs:
+            if ref is None:
+                continue
+            import_keys.append(ref_key)
+            if ref.block_id not in index.variants:
+                errors.append(ResolutionError(
+                    asset_type="block", identifier=ref.block_id,
+                    source_context=f"import '{ref_key}' of recipe '{recipe_name}'"
+                ))
+                continue
+            variant_ids = index.variants[ref.block_id]
+            if variant_ids is not None and ref.variant_id not in variant_ids:
+                errors.append(VariantNotFoundError(block_id=ref.block_id, variant_id=ref.variant_id, available_variants=variant_ids))
+
+    for item in recipe.composition.sequence:
+        ref = item.block_ref
+        if ref is not None and ref not in import_keys and not any(key.startswith(f"{ref}[") for key in import_keys):
+            errors.append(RecipeReferenceError(reference=ref))
+    return errors
+
+_CHECKS = {
+    'template': _check_template,
+    'dataschema': _check_dataschema,
+    'block': _check_block,
+    'recipe': _check_recipe,
+}
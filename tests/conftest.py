@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+# tests/conftest.py
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# 与 benchmarks 相同, 直接从 src/ 导入 Prism 和 CLI
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from Prism.entities import CompilationSources, CompilationTask
+from Prism.stores import FileSystemAssetStore
+
+# 仓库自带的示例项目, 两个 recipe 覆盖了 block, variant, dataschema 和字面量
+EXAMPLE_PROJECT = Path(__file__).resolve().parent.parent / "api-example" / "archive"
+
+@pytest.fixture
+def example_project() -> Path:
+    return EXAMPLE_PROJECT
+
+@pytest.fixture
+def example_store(example_project: Path) -> FileSystemAssetStore:
+    return FileSystemAssetStore.for_project(example_project)
+
+@pytest.fixture
+def hello_sources() -> CompilationSources:
+    """A one-block project: the 'persona' block renders 'Hello {{ name }}.' with name defaulting to 'Ada'."""
+    return CompilationSources(
+        templates={"greeting": "Hello {{ name }}.\n"},
+        dataschemas={},
+        blocks={"persona": {
+            "meta": {"id": "persona", "name": "Persona"},
+            "block_type": "Persona",
+            "defaults": {"name": "Ada"},
+            "variants": [{"id": "default", "template_id": "greeting"}],
+        }},
+    )
+
+@pytest.fixture
+def hello_task() -> CompilationTask:
+    """The 'hello' recipe, which imports the 'persona' block of `hello_sources`."""
+    return CompilationTask(recipe_name="hello", sources={
+        "meta": {"id": "hello", "name": "Hello"},
+        "imports": {"persona": {"block_id": "persona", "variant_id": "default"}},
+        "composition": {"sequence": [{"block_ref": "persona"}]},
+    })
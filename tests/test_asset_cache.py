@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+# tests/test_asset_cache.py
+
+import json
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from CLI.actions.asset_cache import CACHE_FILENAME, ParsedAssetCache, _CACHE_FORMAT_VERSION
+
+# 远早于写入缓存的时间, 条目不落在 racy 窗口内
+_PAST_NS = time.time_ns() - 60 * 10**9
+
+class _CountingParser:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, text: str):
+        self.calls += 1
+        return {"text": text}
+
+def _write(path: Path, text: str, mtime_ns: int = _PAST_NS) -> Path:
+    path.write_text(text, encoding="utf-8")
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+    return path
+
+@pytest.fixture
+def asset(tmp_path: Path) -> Path:
+    return _write(tmp_path / "block.yaml", "id: one\n")
+
+@pytest.fixture
+def cache_dir(tmp_path: Path) -> Path:
+    return tmp_path / ".prism_cache"
+
+def _warm(cache_dir: Path, asset: Path) -> None:
+    cache = ParsedAssetCache.in_directory(cache_dir)
+    cache.load(asset, _CountingParser())
+    cache.flush()
+
+def test_warm_hit_does_not_parse(cache_dir, asset):
+    _warm(cache_dir, asset)
+    parser = _CountingParser()
+    cache = ParsedAssetCache.in_directory(cache_dir)
+    assert cache.load(asset, parser) == {"text": "id: one\n"}
+    assert parser.calls == 0
+    assert cache.stats.hits == 1
+
+def test_changed_mtime_with_same_content_is_rehashed(cache_dir, asset):
+    _warm(cache_dir, asset)
+    os.utime(asset, ns=(_PAST_NS + 10**9, _PAST_NS + 10**9))
+    parser = _CountingParser()
+    cache = ParsedAssetCache.in_directory(cache_dir)
+    assert cache.load(asset, parser) == {"text": "id: one\n"}
+    assert parser.calls == 0
+    assert cache.stats.rehashed == 1
+
+def test_changed_size_is_parsed_again(cache_dir, asset):
+    _warm(cache_dir, asset)
+    _write(asset, "id: one-longer\n")
+    parser = _CountingParser()
+    cache = ParsedAssetCache.in_directory(cache_dir)
+    assert cache.load(asset, parser) == {"text": "id: one-longer\n"}
+    assert parser.calls == 1
+    assert cache.stats.misses == 1
+
+def test_changed_content_with_same_size_and_mtime_is_parsed_again(cache_dir, tmp_path):
+    # 刚写入的文件: mtime 落在 racy 窗口内, 只凭 stat 无法区分同一时间片内的两次修改
+    asset = _write(tmp_path / "block.yaml", "id: one\n", mtime_ns=time.time_ns())
+    stat = os.stat(asset)
+    _warm(cache_dir, asset)
+    asset.write_text("id: two\n", encoding="utf-8")
+    os.utime(asset, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    parser = _CountingParser()
+    cache = ParsedAssetCache.in_directory(cache_dir)
+    assert cache.load(asset, parser) == {"text": "id: two\n"}
+    assert parser.calls == 1
+
+def test_deleted_file_is_dropped_on_flush(cache_dir, asset):
+    _warm(cache_dir, asset)
+    other = _write(asset.parent / "other.yaml", "id: other\n")
+    cache = ParsedAssetCache.in_directory(cache_dir)
+    cache.load(other, _CountingParser())
+    asset.unlink()
+    cache.flush()
+
+    entries = json.loads((cache_dir / CACHE_FILENAME).read_text(encoding="utf-8"))["entries"]
+    assert list(entries) == [str(other.resolve())]
+
+@pytest.mark.parametrize("content", [b"", b'{"version": 2, "entries": {"/x": [1, 2', b"\x80\x04\x95not json", b'{"version": 2, "entries": {"/x": [1]}}'])
+def test_corrupt_or_truncated_cache_file_is_ignored(cache_dir, asset, content):
+    cache_dir.mkdir()
+    (cache_dir / CACHE_FILENAME).write_bytes(content)
+    parser = _CountingParser()
+    cache = ParsedAssetCache.in_directory(cache_dir)
+    assert cache.load(asset, parser) == {"text": "id: one\n"}
+    assert parser.calls == 1
+
+    # 下一次写入会替换掉损坏的文件
+    cache.flush()
+    assert ParsedAssetCache.in_directory(cache_dir).load(asset, parser) == {"text": "id: one\n"}
+    assert parser.calls == 1
+
+def test_cache_from_another_format_version_is_ignored(cache_dir, asset):
+    _warm(cache_dir, asset)
+    cache_file = cache_dir / CACHE_FILENAME
+    payload = json.loads(cache_file.read_text(encoding="utf-8"))
+    payload["version"] = _CACHE_FORMAT_VERSION + 1
+    cache_file.write_text(json.dumps(payload), encoding="utf-8")
+
+    parser = _CountingParser()
+    ParsedAssetCache.in_directory(cache_dir).load(asset, parser)
+    assert parser.calls == 1
+
+def test_cache_file_is_never_unpickled(cache_dir, asset):
+    # 项目中可能带有旧版本写入的 pickle 文件; 它不会被读取
+    cache_dir.mkdir()
+    (cache_dir / "parsed_assets.pickle").write_bytes(b"\x80\x04garbage")
+    parser = _CountingParser()
+    ParsedAssetCache.in_directory(cache_dir).load(asset, parser)
+    assert parser.calls == 1
+    assert ParsedAssetCache.in_directory(cache_dir).cache_file.name == CACHE_FILENAME
+
+def test_results_json_cannot_represent_are_not_persisted(cache_dir, asset):
+    cache = ParsedAssetCache.in_directory(cache_dir)
+    cache.load(asset, lambda text: {1: {"a", "b"}})
+    cache.flush()
+
+    parser = _CountingParser()
+    assert ParsedAssetCache.in_directory(cache_dir).load(asset, parser) == {"text": "id: one\n"}
+    assert parser.calls == 1
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+# tests/test_batch.py
+
+import pytest
+
+from Prism import batch
+from Prism.batch import compile_many
+from Prism.cache import ArtifactCache
+from Prism.entities import CompilationTask
+from Prism.exceptions import PrismError
+from Prism.session import CompilationSession
+
+_RECIPES = ["summarize-ticket", "email-follow-up"]
+
+def _tasks(example_store):
+    # 中间的 recipe 导入不存在的 block, 只有它失败
+    missing = CompilationTask(recipe_name="missing-block", sources={
+        "meta": {"id": "missing-block", "name": "Missing block"},
+        "imports": {"persona": {"block_id": "no-such-block", "variant_id": "default"}},
+        "composition": {"sequence": [{"block_ref": "persona"}]},
+    })
+    first, second = (example_store.load_recipe(name) for name in _RECIPES)
+    return [first, missing, second]
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_compile_many_returns_results_in_task_order(example_store, workers):
+    sources = example_store.load_sources()
+    tasks = _tasks(example_store)
+    completed = []
+    results = compile_many(tasks, sources, workers=workers, on_result=completed.append)
+
+    assert [result.recipe_name for result in results] == [_RECIPES[0], "missing-block", _RECIPES[1]]
+    assert sorted(result.recipe_name for result in completed) == sorted(task.recipe_name for task in tasks)
+    assert not results[1].ok and results[1].artifacts is None
+    assert isinstance(results[1].error, PrismError)
+
+    session = CompilationSession(sources)
+    for index in (0, 2):
+        assert results[index].ok
+        assert results[index].artifacts == session.compile(tasks[index])
+
+def test_compile_many_serves_cache_hits_in_the_calling_process(example_store, monkeypatch):
+    sources = example_store.load_sources()
+    tasks = _tasks(example_store)
+    cache = ArtifactCache()
+    first = compile_many(tasks, sources, workers=2, cache=cache)
+    # 失败的 recipe 不写入缓存
+    assert len(cache.memory) == 2
+
+    compiled = []
+    real_compile = batch._compile_with_session
+    def record(session, task):
+        compiled.append(task.recipe_name)
+        return real_compile(session, task)
+    monkeypatch.setattr(batch, "_compile_with_session", record)
+    # 第二次只有未命中的 recipe 需要编译; 只剩一个, 不启动进程池
+    monkeypatch.setattr(batch, "ProcessPoolExecutor", None)
+
+    second = compile_many(tasks, sources, workers=2, cache=cache)
+    assert compiled == ["missing-block"]
+    assert cache.stats.hits == 2
+    assert [result.recipe_name for result in second] == [result.recipe_name for result in first]
+    assert [result.artifacts for result in second] == [result.artifacts for result in first]
+    assert not second[1].ok
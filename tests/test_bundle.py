@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+# tests/test_bundle.py
+
+from pathlib import Path
+
+import pytest
+
+from Prism.bundle import ProjectBundle, write_bundle
+from Prism.exceptions import BundleError
+
+_HEADER_SIZE = 20
+
+@pytest.fixture
+def bundle_path(tmp_path: Path, hello_sources, hello_task) -> Path:
+    return write_bundle(tmp_path / "project.bundle", hello_sources, [hello_task])
+
+def _index_length(data: bytes) -> int:
+    return int.from_bytes(data[12:_HEADER_SIZE], "little")
+
+def test_round_trip(bundle_path, hello_sources):
+    with ProjectBundle.open(bundle_path) as bundle:
+        assert bundle.load("template", "greeting") == hello_sources.templates["greeting"]
+
+@pytest.mark.parametrize("index", [b"{not json", b'{"other": {}}', b"[1, 2]"])
+def test_corrupt_index_raises_bundle_error(bundle_path, index):
+    data = bundle_path.read_bytes()
+    length = _index_length(data)
+    # 保持长度不变, 只破坏索引内容
+    bundle_path.write_bytes(data[:_HEADER_SIZE] + index.ljust(length) + data[_HEADER_SIZE + length:])
+    with pytest.raises(BundleError, match="Corrupt bundle index"):
+        ProjectBundle(bundle_path)
+
+def test_corrupt_segment_raises_bundle_error(bundle_path):
+    data = bundle_path.read_bytes()
+    start = _HEADER_SIZE + _index_length(data)
+    bundle_path.write_bytes(data[:start] + b"}" * (len(data) - start))
+    with ProjectBundle.open(bundle_path) as bundle:
+        with pytest.raises(BundleError, match="Corrupt entry"):
+            bundle.load("template", "greeting")
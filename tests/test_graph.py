@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+# tests/test_graph.py
+
+import shutil
+
+import pytest
+from typer.testing import CliRunner
+
+from CLI.main import app
+from Prism.entities import CompilationSources
+from Prism.graph import DependencyGraph, variant_node
+
+def _block(block_id, variants):
+    return {
+        "meta": {"id": block_id, "name": block_id},
+        "block_type": "Task",
+        "variants": [
+            {"id": variant_id, "template_id": template_id, **({"contract_id": contract_id} if contract_id else {})}
+            for variant_id, template_id, contract_id in variants
+        ],
+    }
+
+def _recipe(*imports):
+    return {
+        "meta": {"id": "r", "name": "r"},
+        "imports": {"tasks": [{"block_id": block_id, "variant_id": variant_id} for block_id, variant_id in imports]},
+        "composition": {"sequence": [{"block_ref": "tasks"}]},
+    }
+
+@pytest.fixture
+def graph() -> DependencyGraph:
+    # 'shared' 模板被两个 block 的 variant 使用; 'writer' 的 'long' variant 没有 recipe 导入
+    sources = CompilationSources(
+        templates={"shared": "", "short": "", "long": "", "unused": ""},
+        dataschemas={"ticket": {}, "orphan": {}},
+        blocks={
+            "writer": _block("writer", [("short", "short", None), ("long", "long", "ticket")]),
+            "reviewer": _block("reviewer", [("default", "shared", "ticket")]),
+            "editor": _block("editor", [("default", "shared", None)]),
+        },
+    )
+    recipes = {
+        "draft": _recipe(("writer", "short")),
+        "review": _recipe(("writer", "short"), ("reviewer", "default")),
+        "edit": _recipe(("editor", "default")),
+    }
+    return DependencyGraph.build(sources, recipes)
+
+@pytest.mark.parametrize("node, expected", [
+    (('template', 'short'), {"draft", "review"}),
+    (('template', 'shared'), {"review", "edit"}),
+    # 只有未被导入的 variant 使用的模板和 dataschema 不影响任何 recipe
+    (('template', 'long'), set()),
+    (('template', 'unused'), set()),
+    (('dataschema', 'ticket'), {"review"}),
+    (('dataschema', 'orphan'), set()),
+    (('block', 'writer'), {"draft", "review"}),
+    (('block', 'editor'), {"edit"}),
+    (variant_node('writer', 'long'), set()),
+    (('recipe', 'draft'), {"draft"}),
+])
+def test_affected_recipes(graph, node, expected):
+    assert graph.affected_recipes([node]) == expected
+
+def test_affected_recipes_of_several_changes(graph):
+    assert graph.affected_recipes([('template', 'long'), ('dataschema', 'ticket'), ('block', 'editor')]) == {"review", "edit"}
+
+def test_transitive_dependencies(graph):
+    # template -> variant -> recipe: 依赖关系经过 variant 传递
+    assert graph.dependents(('template', 'shared')) == {
+        variant_node('reviewer', 'default'), variant_node('editor', 'default'), ('recipe', 'review'), ('recipe', 'edit')
+    }
+    assert graph.recipe_dependencies("review", 'template') == {"short", "shared"}
+    assert graph.recipe_dependencies("review", 'dataschema') == {"ticket"}
+
+def test_updated_block_moves_its_dependents(graph):
+    graph.set_block("editor", _block("editor", [("default", "unused", None)]))
+    assert graph.affected_recipes([('template', 'shared')]) == {"review"}
+    assert graph.affected_recipes([('template', 'unused')]) == {"edit"}
+
+def test_removed_and_readded_block_keeps_its_recipes(graph):
+    graph.remove_block("writer")
+    assert graph.affected_recipes([('block', 'writer')]) == {"draft", "review"}
+    graph.set_block("writer", _block("writer", [("short", "long", None)]))
+    assert graph.affected_recipes([('template', 'long')]) == {"draft", "review"}
+
+def test_graph_round_trips_through_dict(graph):
+    restored = DependencyGraph.from_dict(graph.to_dict())
+    for node in graph.nodes():
+        assert restored.affected_recipes([node]) == graph.affected_recipes([node])
+
+def test_cli_affected_maps_changed_files_to_recipes(example_project, tmp_path, monkeypatch):
+    project = tmp_path / "project"
+    shutil.copytree(example_project, project)
+    monkeypatch.chdir(project)
+    changed = [
+        "templates/task-summarize-ticket.jinja",
+        "dataschemas/support-ticket.dataschema.yaml",
+        "README.md",
+    ]
+    result = CliRunner().invoke(app, ["affected", *changed])
+    assert result.exit_code == 0, result.output
+    assert result.stdout.split() == ["summarize-ticket"]
+
+    result = CliRunner().invoke(app, ["affected", "blocks/persona.block.yaml", "templates/output-json-summary.jinja"])
+    assert result.stdout.split() == ["email-follow-up", "summarize-ticket"]
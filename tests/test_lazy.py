@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+# tests/test_lazy.py
+
+import pytest
+
+from Prism.entities import CompilationSources, CompilationTask
+from Prism.exceptions import PrismError
+from Prism.lazy import LazyMapping
+from Prism.session import CompilationSession
+
+# 没有任何 recipe 导入的损坏资源
+_BROKEN_BLOCK = {"meta": {"id": "broken"}, "variants": "not a list"}
+_BROKEN_SCHEMA = {"data": {"type": "no-such-type"}}
+
+def _with_broken_assets(sources: CompilationSources) -> CompilationSources:
+    return CompilationSources(
+        templates={**sources.templates, "broken": "{% if %}"},
+        dataschemas={**sources.dataschemas, "broken": _BROKEN_SCHEMA},
+        blocks={**sources.blocks, "broken": _BROKEN_BLOCK},
+    )
+
+def _must_not_load(kind, asset_id):
+    def load():
+        raise AssertionError(f"{kind} '{asset_id}' was loaded but no recipe reaches it")
+    return load
+
+def test_eager_session_fails_on_unreached_broken_asset(hello_sources):
+    with pytest.raises(PrismError):
+        CompilationSession(_with_broken_assets(hello_sources))
+
+def test_lazy_session_ignores_unreached_broken_assets(hello_sources, hello_task):
+    expected = CompilationSession(hello_sources).compile(hello_task)
+    session = CompilationSession(_with_broken_assets(hello_sources), lazy=True)
+    assert session.compile(hello_task) == expected
+
+def test_lazy_session_does_not_read_unreached_assets(hello_sources, hello_task):
+    loaded = []
+
+    def loader(kind, asset_id, value):
+        def load():
+            loaded.append((kind, asset_id))
+            return value
+        return load
+
+    sources = CompilationSources(**{
+        kind: LazyMapping({
+            **{asset_id: loader(kind, asset_id, value) for asset_id, value in getattr(hello_sources, kind).items()},
+            "broken": _must_not_load(kind, "broken"),
+        })
+        for kind in ("templates", "dataschemas", "blocks")
+    })
+    artifacts = CompilationSession(sources, lazy=True).compile(hello_task)
+    assert artifacts.template_content.startswith("Hello Ada.")
+    assert sorted(loaded) == [("blocks", "persona"), ("templates", "greeting")]
+
+def test_lazy_session_reports_reached_broken_asset(hello_sources):
+    task = CompilationTask(recipe_name="uses-broken", sources={
+        "meta": {"id": "uses-broken", "name": "Uses broken"},
+        "imports": {"persona": {"block_id": "broken", "variant_id": "default"}},
+        "composition": {"sequence": [{"block_ref": "persona"}]},
+    })
+    with pytest.raises(PrismError):
+        CompilationSession(_with_broken_assets(hello_sources), lazy=True).compile(task)
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+# tests/test_optimizer.py
+
+import random
+
+import pytest
+
+from Prism.compiler import PassManager
+from Prism.core import compile_recipe_to_artifacts
+from Prism.entities import CompilationSources, CompilationTask
+from Prism.exceptions import GenerationError
+from Prism.models.ir import LiteralContent, ResolvedBlock
+from Prism.session import CompilationSession
+
+# 每个 block 只有一个 variant, 模板和 defaults 覆盖常量折叠的边界情况;
+# 'partial' 中没有默认值的 name 是运行时变量, 由 contract 声明
+_EDGE_CASES = {
+    "static": ("No variables here.\n", {}),
+    "partial": ("{{ greeting }}, {{ name }}!\n", {"greeting": "Hi"}),
+    "all-defaults": ("{{ greeting }}, {{ name }}!\n", {"greeting": "Hi", "name": "Ada"}),
+    "random": ("Pick {{ [1, 2, 3] | random }}.\n", {}),
+    "lipsum": ("{{ lipsum(1) }}\n", {}),
+    "empty-dict": ("User: {{ user.name }}.\n", {"user": {}}),
+}
+
+def _edge_case_project(block_ids=tuple(_EDGE_CASES)) -> tuple:
+    templates, blocks = {}, {}
+    for block_id in block_ids:
+        template, defaults = _EDGE_CASES[block_id]
+        templates[f"tpl-{block_id}"] = template
+        variant = {"id": "default", "template_id": f"tpl-{block_id}"}
+        if block_id == "partial":
+            variant["contract_id"] = "person"
+        blocks[block_id] = {
+            "meta": {"id": block_id, "name": block_id},
+            "block_type": "Task",
+            "defaults": defaults,
+            "variants": [variant],
+        }
+    dataschemas = {"person": {
+        "meta": {"id": "person", "name": "Person"},
+        "data": {"type": "object", "properties": {"name": {"type": "string"}}, "required": ["name"]},
+    }}
+    task = CompilationTask(recipe_name="edge-cases", sources={
+        "meta": {"id": "edge-cases", "name": "Edge cases"},
+        "imports": {"tasks": [{"block_id": block_id, "variant_id": "default"} for block_id in block_ids]},
+        "composition": {"sequence": [{"literal": "### TASKS\n"}, {"block_ref": "tasks"}, {"literal": "\n"}]},
+    })
+    return CompilationSources(templates=templates, dataschemas=dataschemas, blocks=blocks), task
+
+def _assert_default_passes_keep_output(sources, task):
+    # random 和 lipsum 在编译时渲染, 两次编译使用相同的种子
+    random.seed(0)
+    optimized = compile_recipe_to_artifacts(task, sources, passes=PassManager())
+    random.seed(0)
+    plain = compile_recipe_to_artifacts(task, sources, passes=PassManager([]))
+    assert optimized.template_content == plain.template_content
+    assert optimized.model_code == plain.model_code
+
+@pytest.mark.parametrize("recipe_name", ["summarize-ticket", "email-follow-up"])
+def test_default_passes_keep_example_output(example_store, recipe_name):
+    _assert_default_passes_keep_output(example_store.load_sources(), example_store.load_recipe(recipe_name))
+
+def test_default_passes_keep_edge_case_output():
+    _assert_default_passes_keep_output(*_edge_case_project(["static", "partial", "all-defaults", "random", "lipsum"]))
+
+def test_default_passes_keep_undefined_attribute_error():
+    # 默认值中的空 dict 没有 name 属性: 不折叠, 与不运行 pass 时报告同样的错误
+    sources, task = _edge_case_project(["static", "empty-dict"])
+    messages = []
+    for passes in (PassManager(), PassManager([])):
+        with pytest.raises(GenerationError) as error:
+            compile_recipe_to_artifacts(task, sources, passes=passes)
+        messages.append(error.value.message)
+    assert messages[0] == messages[1]
+    assert "has no attribute 'name'" in messages[0]
+
+def test_only_deterministic_fully_defaulted_blocks_are_folded():
+    sources, task = _edge_case_project()
+    ir = PassManager(["fold_constants"]).run(CompilationSession(sources).compile_ir(task)).ir
+    remaining = {item.source_block_meta.id for item in ir.render_sequence if isinstance(item, ResolvedBlock)}
+    assert remaining == {"partial", "random", "lipsum", "empty-dict"}
+    literals = [item.content for item in ir.render_sequence if isinstance(item, LiteralContent)]
+    # 与 JinjaAggregator 相同, 模板末尾的换行不保留
+    assert "No variables here." in literals and "Hi, Ada!" in literals
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+# tests/test_pipeline.py
+
+from pathlib import Path
+
+import pytest
+
+from Prism.entities import CompilationArtifacts
+from Prism.exceptions import RenderError
+from Prism.pipeline import RenderPipeline, read_records
+from Prism.renderer import PromptRenderer
+
+_CONTRACTS = {
+    "order": {
+        "type": "object",
+        "properties": {
+            "name": {"type": "string"},
+            "count": {"type": "integer"},
+            "price": {"type": "number"},
+            "urgent": {"type": "boolean"},
+            "tags": {"type": "array", "items": {"type": "string"}},
+            "note": {"type": ["integer", "null"]},
+        },
+        "required": ["name", "count"],
+    }
+}
+
+def _csv(tmp_path: Path, text: str) -> Path:
+    path = tmp_path / "records.csv"
+    path.write_text(text, encoding="utf-8")
+    return path
+
+def test_csv_cells_follow_contract_types(tmp_path):
+    path = _csv(tmp_path, 'name,count,price,urgent,tags,note\nwidget,3,2.5,true,"[""a"", ""b""]",\n')
+    (record,) = read_records(path, contracts=_CONTRACTS)
+    assert record == {"name": "widget", "count": 3, "price": 2.5, "urgent": True, "tags": ["a", "b"]}
+
+def test_csv_without_contracts_stays_text(tmp_path):
+    path = _csv(tmp_path, "name,count\nwidget,3\n")
+    assert list(read_records(path)) == [{"name": "widget", "count": "3"}]
+
+def test_csv_records_pass_contract_validation(tmp_path):
+    path = _csv(tmp_path, "name,count,price,urgent\nwidget,3,2,0\ngadget,many,1.5,yes\nbolt,,1,1\n")
+    artifacts = CompilationArtifacts(template_content="{{ name }} x{{ count }}", contracts=_CONTRACTS)
+    pipeline = RenderPipeline(artifacts, workers=1)
+    results = list(pipeline.run(read_records(path, contracts=_CONTRACTS)))
+    assert results[0].prompt == "widget x3"
+    # 无法转换的单元格保留为文本, 由校验报告; 空单元格视为缺失
+    assert "'many' is not of type 'integer'" in results[1].error
+    assert "'count' is a required property" in results[2].error
+
+def test_runtime_errors_fail_only_their_record():
+    # TypeError (str + int) 和 TemplateRuntimeError (给非 namespace 对象赋属性) 都只影响当前记录
+    template = "{% if target %}{% set target.x = 1 %}{% endif %}{{ count + 1 }}"
+    artifacts = CompilationArtifacts(template_content=template)
+    pipeline = RenderPipeline(artifacts, workers=1)
+    type_error, ok, runtime_error = pipeline.run([{"count": "x"}, {"count": 1}, {"count": 1, "target": "t"}])
+    assert ok.prompt == "2"
+    assert "TypeError" in type_error.error
+    assert "namespace" in runtime_error.error
+    assert pipeline.stats.failed == 2
+
+def test_render_many_raises_render_error():
+    renderer = PromptRenderer("{{ count + 1 }}")
+    with pytest.raises(RenderError):
+        renderer.render_many([{"count": 1}, {"count": "x"}])
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+# tests/test_schema_backends.py
+
+import pytest
+
+from Prism.exceptions import RenderError
+from Prism.renderer import PromptRenderer
+from Prism.schemas.schema_loader import CompiledSchema, VALIDATOR_BACKENDS
+
+_EMAIL = {"type": "object", "properties": {"email": {"type": "string", "format": "email"}}}
+_PAIR = {"type": "object", "properties": {"pair": {"type": "array", "prefixItems": [{"type": "integer"}]}}}
+_REF_SIBLING = {
+    "$defs": {"name": {"type": "string"}},
+    "type": "object",
+    "properties": {"name": {"$ref": "#/$defs/name", "maxLength": 3}},
+}
+
+def _accepts(backend: str, contract: dict, record: dict) -> bool:
+    renderer = PromptRenderer("{{ record }}", contracts={"c": contract}, validate="contracts", backend=backend)
+    try:
+        renderer.render(record)
+    except RenderError:
+        return False
+    return True
+
+@pytest.mark.parametrize("backend", VALIDATOR_BACKENDS)
+@pytest.mark.parametrize("contract, record, expected", [
+    (_EMAIL, {"email": "nope"}, True),
+    (_PAIR, {"pair": ["x"]}, False),
+    (_PAIR, {"pair": [1, "x"]}, True),
+    (_REF_SIBLING, {"name": "long"}, False),
+])
+def test_backends_agree(backend, contract, record, expected):
+    assert _accepts(backend, contract, record) is expected
+
+@pytest.mark.parametrize("backend", VALIDATOR_BACKENDS)
+def test_invalid_record_reports_errors(backend):
+    schema = CompiledSchema("c", _PAIR, backend=backend)
+    assert not schema.is_valid({"pair": ["x"]})
+    assert schema.error_messages({"pair": ["x"]})
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+# tests/test_session.py
+
+import asyncio
+import threading
+
+from Prism.cache import ArtifactCache
+from Prism.entities import SourceChanges
+from Prism.session import CompilationSession
+
+class _RecordingCache(ArtifactCache):
+    def __init__(self):
+        super().__init__()
+        self.get_threads = []
+        self.puts = 0
+
+    def get(self, fingerprint):
+        self.get_threads.append(threading.get_ident())
+        return super().get(fingerprint)
+
+    def put(self, fingerprint, artifacts):
+        self.puts += 1
+        super().put(fingerprint, artifacts)
+
+def test_compile_async_looks_up_the_cache_off_the_loop(hello_sources, hello_task):
+    cache = _RecordingCache()
+    session = CompilationSession(hello_sources, cache=cache)
+
+    async def main():
+        return await session.compile_async(hello_task), await session.compile_async(hello_task)
+
+    compiled, cached = asyncio.run(main())
+    assert compiled.template_content == cached.template_content
+    assert cache.puts == 1
+    assert len(cache.get_threads) == 2
+    assert threading.get_ident() not in cache.get_threads
+
+def test_fingerprints_survive_concurrent_invalidation(hello_sources, hello_task):
+    session = CompilationSession(hello_sources)
+    fingerprinter = session._fingerprinter
+    errors = []
+    stop = threading.Event()
+
+    def fingerprint_forever():
+        try:
+            while not stop.is_set():
+                session.fingerprint(hello_task)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=fingerprint_forever) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    try:
+        for _ in range(20000):
+            fingerprinter.invalidate('blocks', 'persona')
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+    assert errors == []
+
+def test_apply_changes_changes_the_fingerprint(hello_sources, hello_task):
+    session = CompilationSession(hello_sources)
+    before = session.fingerprint(hello_task)
+    session.apply_changes(SourceChanges(templates={"greeting": "Goodbye {{ name }}.\n"}))
+    assert session.fingerprint(hello_task) != before
+    assert session.compile(hello_task).template_content.startswith("Goodbye Ada.")
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+# tests/test_snapshot.py
+
+import json
+import pickle
+
+import pytest
+
+from Prism.core import compile_ir_to_artifacts
+from Prism.exceptions import SnapshotError
+from Prism.session import CompilationSession
+from Prism.snapshot import IR_SNAPSHOT_VERSION, _BINARY_MAGIC, dump_ir, dump_ir_binary, load_ir
+
+@pytest.fixture
+def ir(example_store):
+    session = CompilationSession(example_store.load_sources())
+    return session.compile_ir(example_store.load_recipe("summarize-ticket"))
+
+def _binary(payload) -> bytes:
+    return _BINARY_MAGIC + pickle.dumps(payload, protocol=5)
+
+@pytest.mark.parametrize("dump", [dump_ir, dump_ir_binary])
+def test_round_trip(ir, dump):
+    loaded = load_ir(dump(ir))
+    assert loaded == ir
+    assert compile_ir_to_artifacts(loaded) == compile_ir_to_artifacts(ir)
+
+def test_binary_encoding_pins_the_pickle_protocol(ir):
+    data = dump_ir_binary(ir)
+    # PROTO 操作码后跟协议号
+    assert data[len(_BINARY_MAGIC):len(_BINARY_MAGIC) + 2] == b"\x80\x05"
+
+@pytest.mark.parametrize("encode", [
+    lambda payload: json.dumps(payload),
+    _binary,
+])
+@pytest.mark.parametrize("version", [IR_SNAPSHOT_VERSION - 1, IR_SNAPSHOT_VERSION + 1, None])
+def test_other_versions_are_rejected(ir, encode, version):
+    payload = {"format": "prism-ir", "version": version, "ir": ir.model_dump(mode="json")}
+    with pytest.raises(SnapshotError, match="not supported"):
+        load_ir(encode(payload))
+
+@pytest.mark.parametrize("data", [b"{not json", _BINARY_MAGIC + b"\x80\x05truncated", '{"format": "other"}'])
+def test_unreadable_snapshots_are_rejected(data):
+    with pytest.raises(SnapshotError):
+        load_ir(data)
+
+def test_binary_snapshot_cannot_load_globals():
+    with pytest.raises(SnapshotError, match="not allowed"):
+        load_ir(_binary({"format": "prism-ir", "version": IR_SNAPSHOT_VERSION, "ir": print}))
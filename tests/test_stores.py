@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+# tests/test_stores.py
+
+from pathlib import Path
+
+import pytest
+
+from Prism.exceptions import StoreError
+from Prism.stores import ASSET_KINDS, AssetStore, FileSystemAssetStore, MemoryAssetStore, SQLiteAssetStore, ZipAssetStore
+
+def _contents(store: AssetStore) -> dict:
+    return {kind: {asset_id: store.get(kind, asset_id) for asset_id in store.ids(kind)} for kind in ASSET_KINDS}
+
+def _copy_to_directory(store: AssetStore, root: Path) -> FileSystemAssetStore:
+    copy = FileSystemAssetStore.for_project(root)
+    for kind in ASSET_KINDS:
+        for asset_id in store.ids(kind):
+            copy.put(kind, asset_id, store.get(kind, asset_id))
+    return copy
+
+@pytest.fixture(params=["filesystem", "zip", "sqlite"])
+def copied_store(request, example_store, tmp_path):
+    if request.param == "filesystem":
+        store = _copy_to_directory(example_store, tmp_path / "project")
+    elif request.param == "zip":
+        store = ZipAssetStore(ZipAssetStore.write(tmp_path / "project.zip", example_store))
+    else:
+        store = SQLiteAssetStore.from_store(tmp_path / "project.db", example_store)
+    yield store
+    store.close()
+
+def test_round_trip(example_store, copied_store):
+    assert _contents(copied_store) == _contents(example_store)
+    assert copied_store.load_recipes() == example_store.load_recipes()
+
+def test_sqlite_store_persists(example_store, tmp_path):
+    SQLiteAssetStore.from_store(tmp_path / "project.db", example_store).close()
+    with SQLiteAssetStore(tmp_path / "project.db") as store:
+        assert _contents(store) == _contents(example_store)
+
+def test_sqlite_affected_recipes_match_dependency_graph(example_store):
+    graph = example_store.dependency_graph()
+    with SQLiteAssetStore.from_store(":memory:", example_store) as store:
+        for node in graph.nodes():
+            assert store.affected_recipes([node]) == graph.affected_recipes([node]), node
+        assert store.affected_recipes(graph.nodes('template')) == graph.affected_recipes(graph.nodes('template'))
+        for recipe_name in example_store.recipe_names():
+            assert store.recipe_dependencies(recipe_name) == graph.dependencies(('recipe', recipe_name))
+
+def test_sqlite_index_follows_updates(example_store):
+    with SQLiteAssetStore.from_store(":memory:", example_store) as store:
+        recipe = store.get('recipes', 'summarize-ticket')
+        template_id = sorted(example_store.dependency_graph().recipe_dependencies('summarize-ticket', 'template'))[0]
+        assert 'summarize-ticket' in store.affected_recipes([('template', template_id)])
+        store.delete('recipes', 'summarize-ticket')
+        assert 'summarize-ticket' not in store.affected_recipes([('template', template_id)])
+        store.put('recipes', 'summarize-ticket', recipe)
+        assert 'summarize-ticket' in store.affected_recipes([('template', template_id)])
+
+@pytest.mark.parametrize("make_store", [
+    lambda tmp_path: SQLiteAssetStore(),
+    lambda tmp_path: FileSystemAssetStore.for_project(tmp_path),
+])
+def test_put_unserializable_content_raises_store_error(tmp_path, make_store):
+    store = make_store(tmp_path)
+    with pytest.raises(StoreError):
+        store.put('dataschemas', 'broken', {"data": object()})
+    assert not store.contains('dataschemas', 'broken')
+
+def test_zip_write_unserializable_content_raises_store_error(tmp_path):
+    source = MemoryAssetStore()
+    source.put('blocks', 'broken', {"data": object()})
+    with pytest.raises(StoreError):
+        ZipAssetStore.write(tmp_path / "project.zip", source)
+    assert not (tmp_path / "project.zip").exists()
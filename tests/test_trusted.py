@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+# tests/test_trusted.py
+
+import pytest
+
+from Prism import core
+from Prism.cache import ArtifactCache
+from Prism.entities import CompilationTask, SourceChanges
+from Prism.exceptions import AssetValidationError
+from Prism.session import CompilationSession
+
+def test_trusted_artifacts_are_not_served_to_untrusted_sessions(example_store):
+    sources = example_store.load_sources()
+    recipe = example_store.get('recipes', 'summarize-ticket')
+    task = CompilationTask(recipe_name='summarize-ticket', sources={**recipe, "unknown_key": True})
+    with pytest.raises(AssetValidationError):
+        CompilationSession(sources).compile(task)
+
+    cache = ArtifactCache()
+    CompilationSession(sources, trusted=True, cache=cache).compile(task)
+    with pytest.raises(AssetValidationError):
+        CompilationSession(sources, cache=cache).compile(task)
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_trusted_and_untrusted_artifacts_are_identical(example_store, lazy):
+    sources = example_store.load_sources()
+    trusted = CompilationSession(sources, lazy=lazy, trusted=True)
+    untrusted = CompilationSession(sources, lazy=lazy)
+    for task in example_store.load_recipes():
+        assert trusted.compile(task) == untrusted.compile(task)
+
+def test_trusted_session_stays_trusted_after_changes(example_store, monkeypatch):
+    task = example_store.load_recipe('summarize-ticket')
+    expected = CompilationSession(example_store.load_sources()).compile(task)
+    session = CompilationSession(example_store.load_sources(), trusted=True)
+    block = example_store.get('blocks', 'task-summarize')
+    schema = example_store.get('dataschemas', 'support-ticket')
+    session.apply_changes(SourceChanges(blocks={'task-summarize': block}, dataschemas={'support-ticket': schema}))
+
+    # 可信 session 重新构建资源时不调用 jsonschema 校验
+    def fail(*args, **kwargs):
+        raise AssertionError("trusted session validated an asset")
+    monkeypatch.setattr(core, "validate_block_file", fail)
+    monkeypatch.setattr(core, "validate_dataschema_file", fail)
+    assert session.compile(task) == expected